@@ -46,6 +46,9 @@ class User(AbstractUser):
 
     @property
     def location(self):
+        if hasattr(self, "_location"):
+            # Set in bulk by prefetch_user_locations().
+            return self._location
         if self.role == "DONOR" and hasattr(self, "donor_profile"):
             return self.donor_profile.location
         elif self.role == "RECEIVER" and hasattr(self, "receiver_profile"):
@@ -54,16 +57,45 @@ class User(AbstractUser):
             return self.hospital_profile.location
         elif self.role == "ADMIN" and hasattr(self, "admin_profile"):
             return self.admin_profile.location
-        elif self.role == "BLOOD_BANK":
-            BloodBank = apps.get_model('bloodbanks', 'BloodBank')
-            try:
-                blood_bank = BloodBank.objects.get(managed_by=self)
-                return blood_bank.location
-            except BloodBank.DoesNotExist:
-                return None
+        elif self.role == "BLOOD_BANK" and hasattr(self, "managed_blood_banks"):
+            return self.managed_blood_banks.location
         return None
 
 
+# Where User.location comes from for each role: (app label, model, user field).
+USER_LOCATION_SOURCES = {
+    'DONOR': ('donors', 'DonorProfile', 'user'),
+    'RECEIVER': ('accounts', 'ReceiverProfile', 'user'),
+    'HOSPITAL': ('accounts', 'HospitalProfile', 'user'),
+    'ADMIN': ('accounts', 'AdminProfile', 'user'),
+    'BLOOD_BANK': ('bloodbanks', 'BloodBank', 'managed_by'),
+}
+
+
+def prefetch_user_locations(users):
+    """Resolve User.location for many users with at most one query per role.
+
+    The result is cached on each instance (the same user may appear as
+    several objects, e.g. requester and approver), so serializing them
+    afterwards costs no further queries.
+    """
+    by_role = {}
+    for user in users:
+        if user is not None and not hasattr(user, '_location'):
+            by_role.setdefault(user.role, {}).setdefault(user.pk, []).append(user)
+
+    for role, users_by_id in by_role.items():
+        locations = {}
+        if role in USER_LOCATION_SOURCES:
+            app_label, model_name, user_field = USER_LOCATION_SOURCES[role]
+            model = apps.get_model(app_label, model_name)
+            owners = model.objects.filter(**{f'{user_field}_id__in': users_by_id}).select_related('location')
+            locations = {getattr(owner, f'{user_field}_id'): owner.location for owner in owners}
+        for user_id, instances in users_by_id.items():
+            for user in instances:
+                user._location = locations.get(user_id)
+
+
 class AdminProfile(models.Model):
     user = models.OneToOneField(
         User, on_delete=models.CASCADE, related_name='admin_profile'
@@ -135,6 +167,12 @@ class ReceiverProfile(models.Model):
         return f"{self.user.first_name} {self.user.last_name}"
 
 
+class HospitalProfileQuerySet(models.QuerySet):
+    def with_details(self):
+        """Load every relation HospitalProfileSerializer renders in the same query."""
+        return self.select_related('user__created_by', 'location', 'verified_by__created_by')
+
+
 class HospitalProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='hospital_profile')
     hospital_name = models.CharField(max_length=255, blank=True)
@@ -159,7 +197,9 @@ class HospitalProfile(models.Model):
     license_document = models.FileField(upload_to='hospital_licenses/', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    objects = HospitalProfileQuerySet.as_manager()
+
     class Meta:
         db_table = 'hospital_profiles'
     
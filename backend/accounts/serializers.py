@@ -2,12 +2,13 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from .models import ReceiverProfile, HospitalProfile, AdminProfile
+from django.db import models
+from .models import ReceiverProfile, HospitalProfile, AdminProfile, prefetch_user_locations
 from donors.models import DonorProfile
 from bloodbanks.models import BloodBank
 from locations.models import Location
 from locations.serializers import LocationSerializer
-from analytics.models import ActivityLog
+from analytics.services.activity_log_service import log_activity
 from django.utils import timezone
 import os
 
@@ -44,7 +45,7 @@ class UserRegisterSerializer(serializers.ModelSerializer):
             ip = self.get_client_ip(request)
             user_agent = request.META.get('HTTP_USER_AGENT', '')
 
-        ActivityLog.objects.create(
+        log_activity(
             user=user,
             action='USER_REGISTERED',
             description=f"New user '{user.username}' registered with role '{user.role}'.",
@@ -153,6 +154,28 @@ class CreatedBySerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'role']
 
+class UserLocationListSerializer(serializers.ListSerializer):
+    """Resolves `location` of every user rendered with UserSerializer up front.
+
+    `user_paths` are the attribute paths from an item to those users (the
+    empty path is the item itself). Their locations are loaded with one
+    query per role instead of one per user; see prefetch_user_locations().
+    """
+    user_paths = ((),)
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        users = []
+        for item in items:
+            for path in self.user_paths:
+                obj = item
+                for attr in path:
+                    obj = getattr(obj, attr) if obj is not None else None
+                users.append(obj)
+        prefetch_user_locations(users)
+        return super().to_representation(items)
+
+
 class UserSerializer(serializers.ModelSerializer):
     created_by = CreatedBySerializer(read_only=True)
     location = LocationSerializer(read_only=True)
@@ -165,6 +188,7 @@ class UserSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'created_by', 'location'
         ]
         read_only_fields = ['created_by', 'location']
+        list_serializer_class = UserLocationListSerializer
 
 # -----------------------------
 # Admin Profile Serializer
@@ -191,7 +215,7 @@ class AdminProfileSerializer(serializers.ModelSerializer):
         location_data = validated_data.pop('location', None)
         location = None
         if location_data:
-            location = Location.objects.create(**location_data)
+            location = Location.objects.get_or_create_for_address(**location_data)
 
         profile, created = AdminProfile.objects.update_or_create(
             user=user,
@@ -203,12 +227,7 @@ class AdminProfileSerializer(serializers.ModelSerializer):
         location_data = validated_data.pop('location', None)
 
         if location_data:
-            if instance.location:
-                for attr, value in location_data.items():
-                    setattr(instance.location, attr, value)
-                instance.location.save()
-            else:
-                instance.location = Location.objects.create(**location_data)
+            instance.location = Location.objects.replace_address(instance.location, location_data)
 
         request = self.context.get('request')
         user_data = request.data.get('user') if request else None
@@ -246,7 +265,7 @@ class ReceiverProfileSerializer(serializers.ModelSerializer):
         location_data = validated_data.pop('location', None)
         location = None
         if location_data:
-            location = Location.objects.create(**location_data)
+            location = Location.objects.get_or_create_for_address(**location_data)
 
         profile, created = ReceiverProfile.objects.update_or_create(
             user=user,
@@ -258,12 +277,7 @@ class ReceiverProfileSerializer(serializers.ModelSerializer):
         location_data = validated_data.pop('location', None)
 
         if location_data:
-            if instance.location:
-                for attr, value in location_data.items():
-                    setattr(instance.location, attr, value)
-                instance.location.save()
-            else:
-                instance.location = Location.objects.create(**location_data)
+            instance.location = Location.objects.replace_address(instance.location, location_data)
 
         request = self.context.get('request')
         user_data = request.data.get('user') if request else None
@@ -284,6 +298,10 @@ class ReceiverProfileSerializer(serializers.ModelSerializer):
 # -----------------------------
 # Hospital Profile Serializer
 # -----------------------------
+class HospitalProfileListSerializer(UserLocationListSerializer):
+    user_paths = (('user',), ('verified_by',))
+
+
 class HospitalProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     location = LocationSerializer(required=False, allow_null=True)
@@ -292,6 +310,7 @@ class HospitalProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = HospitalProfile
         fields = '__all__'
+        list_serializer_class = HospitalProfileListSerializer
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -303,7 +322,7 @@ class HospitalProfileSerializer(serializers.ModelSerializer):
         location_data = validated_data.pop('location', None)
         location = None
         if location_data:
-            location = Location.objects.create(**location_data)
+            location = Location.objects.get_or_create_for_address(**location_data)
 
         profile, created = HospitalProfile.objects.update_or_create(
             user=user,
@@ -321,12 +340,7 @@ class HospitalProfileSerializer(serializers.ModelSerializer):
                 os.remove(old_path)
 
         if location_data:
-            if instance.location:
-                for attr, value in location_data.items():
-                    setattr(instance.location, attr, value)
-                instance.location.save()
-            else:
-                instance.location = Location.objects.create(**location_data)
+            instance.location = Location.objects.replace_address(instance.location, location_data)
 
         request = self.context.get('request')
         user_data = request.data.get('user') if request else None
@@ -341,10 +355,15 @@ class HospitalProfileSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
+class HospitalUserListSerializer(UserLocationListSerializer):
+    user_paths = (('user',),)
+
+
 class AllHospitalListSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     location = LocationSerializer(read_only=True)
 
     class Meta:
         model = HospitalProfile
-        fields = ['id', 'hospital_name', 'location', 'user']
\ No newline at end of file
+        fields = ['id', 'hospital_name', 'location', 'user']
+        list_serializer_class = HospitalUserListSerializer
\ No newline at end of file
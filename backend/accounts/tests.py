@@ -1,3 +1,56 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import HospitalProfile, ReceiverProfile, User
+from locations.models import Location
+
+
+class UserListQueryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password=None, role='ADMIN')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def add_users(self, count):
+        start = User.objects.count()
+        for i in range(start, start + count):
+            location = Location.objects.get_or_create_for_address(
+                address_line1=f'House {i}', police_station='Dhanmondi', city='Dhaka', state='Dhaka',
+                postal_code='1205', latitude=23.75, longitude=90.37,
+            )
+            receiver = User.objects.create_user(
+                username=f'receiver{i}', email=f'receiver{i}@example.com', password=None, role='RECEIVER',
+                created_by=self.admin,
+            )
+            ReceiverProfile.objects.create(user=receiver, age=30, location=location)
+            hospital = User.objects.create_user(
+                username=f'hospital{i}', email=f'hospital{i}@example.com', password=None, role='HOSPITAL',
+                created_by=self.admin,
+            )
+            HospitalProfile.objects.create(
+                user=hospital, hospital_name=f'Hospital {i}', registration_number=f'H-{i}', location=location,
+                is_verified=True, verified_by=self.admin,
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_hospital_lists_are_newest_first(self):
+        self.add_users(3)
+        newest_first = list(HospitalProfile.objects.order_by('-created_at', 'pk').values_list('id', flat=True))
+        for url in ('/api/hospitals/', '/api/hospitals/all/'):
+            response = self.client.get(url)
+            self.assertEqual([row['id'] for row in response.json()['results']], newest_first, url)
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        urls = ('/api/users/', '/api/hospitals/', '/api/hospitals/all/')
+        self.add_users(2)
+        few = [self.count_queries(url) for url in urls]
+        self.add_users(6)
+        many = [self.count_queries(url) for url in urls]
+        self.assertEqual(many, few)
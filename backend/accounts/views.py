@@ -8,7 +8,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth import get_user_model, authenticate
 from .models import HospitalProfile, ReceiverProfile, AdminProfile
 from donors.models import DonorProfile
-from analytics.models import ActivityLog 
+from analytics.services.activity_log_service import log_activity
 from django.utils import timezone
 from rest_framework.exceptions import NotFound, PermissionDenied
 from django.db import transaction
@@ -24,7 +24,9 @@ from accounts.serializers import (
     AllHospitalListSerializer
 )
 from donors.serializers import DonorProfileSerializer
-from common.utils.distance import calculate_distance
+from common.views import NearbySearchMixin
+from common.pagination import EstimatedCountPagination
+from locations.models import within_radius
 
 User = get_user_model()
 
@@ -51,7 +53,7 @@ class UserLoginView(TokenObtainPairView):
             if response.status_code == 200:
                 user = self.get_user(request)
                 if user:
-                    ActivityLog.objects.create(
+                    log_activity(
                         user=user,
                         action="USER_LOGIN",
                         description=f"User '{user.username}' logged in successfully.",
@@ -94,7 +96,7 @@ class UserLogoutView(APIView):
             token = RefreshToken(refresh_token)
             token.blacklist()
 
-            ActivityLog.objects.create(
+            log_activity(
                 user=user,
                 action="USER_LOGOUT",
                 description=f"User '{user.username}' logged out successfully.",
@@ -145,11 +147,12 @@ class UserListCreateView(generics.ListCreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = EstimatedCountPagination
 
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser or user.role == 'ADMIN':
-            return User.objects.all()
+            return User.objects.select_related('created_by').order_by('id')
         return User.objects.filter(id=user.id)
 
     def perform_create(self, serializer):
@@ -169,7 +172,7 @@ class UserListCreateView(generics.ListCreateAPIView):
                     instance.set_unusable_password()
                 instance.save()
 
-            ActivityLog.objects.create(
+            log_activity(
                 user=user,
                 action="USER_CREATE",
                 description=f"User '{instance.username}' created successfully.",
@@ -180,7 +183,7 @@ class UserListCreateView(generics.ListCreateAPIView):
                 }
             )
         except PermissionDenied as e:
-            ActivityLog.objects.create(
+            log_activity(
                 user=user,
                 action="USER_CREATE_FAILED",
                 description=str(e),
@@ -352,8 +355,8 @@ class HospitalProfileListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser or user.role == 'ADMIN':
-            return HospitalProfile.objects.all()
-        return HospitalProfile.objects.filter(user=user, user__role='HOSPITAL')
+            return HospitalProfile.objects.with_details().order_by('-created_at', 'pk')
+        return HospitalProfile.objects.filter(user=user, user__role='HOSPITAL').order_by('-created_at', 'pk')
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -388,7 +391,7 @@ class HospitalProfileDetailView(generics.RetrieveUpdateDestroyAPIView):
         )
         hospital = serializer.instance
         hospital_user = hospital.user
-        ActivityLog.objects.create(
+        log_activity(
             user=user,
             action='HOSPITAL_VERIFIED' if is_verified else 'HOSPITAL_UNVERIFIED',
             description=f"Admin '{user.username}' has {'verified' if is_verified else 'unverified'} hospital '{hospital_user.username}'.",
@@ -430,7 +433,7 @@ class CurrentHospitalProfileView(generics.RetrieveUpdateAPIView):
 
 
 class AllHospitalList(generics.ListAPIView):
-    queryset = HospitalProfile.objects.all()
+    queryset = HospitalProfile.objects.with_details().order_by('-created_at', 'pk')
     serializer_class = AllHospitalListSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -438,7 +441,7 @@ class AllHospitalList(generics.ListAPIView):
 # -----------------------------
 # Nearby Donors
 # -----------------------------
-class NearbyDonorsView(generics.GenericAPIView):
+class NearbyDonorsView(NearbySearchMixin, generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
@@ -448,23 +451,25 @@ class NearbyDonorsView(generics.GenericAPIView):
             return Response({"error": "Only receivers can find nearby donors."}, status=400)
 
         receiver_location = user.receiver_profile.location
-        donors = DonorProfile.objects.select_related('user', 'location')
-
-        data = []
-        for donor in donors:
-            dist = calculate_distance(
-                receiver_location.latitude,
-                receiver_location.longitude,
-                donor.location.latitude,
-                donor.location.longitude
-            )
-            data.append({
+        if not receiver_location or receiver_location.latitude is None or receiver_location.longitude is None:
+            return Response({"error": "Your location has no coordinates yet."}, status=400)
+
+        radius_km = self.get_radius_km()
+        donors = within_radius(
+            DonorProfile.objects.select_related('user', 'location'),
+            receiver_location.latitude,
+            receiver_location.longitude,
+            radius_km,
+            prefix='location__',
+        )
+
+        data = [
+            {
                 "donor_id": donor.id,
                 "name": donor.user.get_full_name(),
                 "blood_group": donor.blood_group,
-                "distance_km": dist,
-            })
-
-        # Sort donors by nearest distance
-        data = sorted(data, key=lambda x: x['distance_km'])
-        return Response(data)
\ No newline at end of file
+                "distance_km": donor.distance_km,
+            }
+            for donor in donors
+        ]
+        return Response(data)
@@ -1,9 +1,29 @@
 from django.contrib import admin
-from .models import DonationStatistics, ActivityLog, BloodRequestView, RequestViewStatistics,DistanceRecord
+from common.pagination import EstimatedCountPaginator
+from .models import DonationStatistics, ActivityLog, ActivityLogDailyCount, BloodRequestView, RequestViewStatistics,DistanceRecord
 
 # Register your models here.
 admin.site.register(DonationStatistics)
-admin.site.register(ActivityLog)
 admin.site.register(BloodRequestView)
 admin.site.register(RequestViewStatistics)
 admin.site.register(DistanceRecord)
+
+
+@admin.register(ActivityLog)
+class ActivityLogAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'action', 'user', 'ip_address')
+    list_filter = ('action',)
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    # Pages follow the (created_at, id) index; the unfiltered total would
+    # need a count over every retained month on each page load.
+    ordering = ('-created_at', '-id')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+
+@admin.register(ActivityLogDailyCount)
+class ActivityLogDailyCountAdmin(admin.ModelAdmin):
+    list_display = ('date', 'action', 'count')
+    list_filter = ('action',)
+    date_hierarchy = 'date'
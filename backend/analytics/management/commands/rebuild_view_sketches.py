@@ -0,0 +1,29 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from analytics.services.request_view_service import rebuild_view_sketches
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the daily unique-viewer sketches from the raw blood request views, "
+        "e.g. after views were imported or deleted outside the application."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="Only rebuild this many most recent days.")
+        parser.add_argument('--since', type=date.fromisoformat, help="Only rebuild from this day (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        since = options['since']
+        if since is None and options['days']:
+            since = timezone.localdate() - timedelta(days=options['days'] - 1)
+
+        with transaction.atomic():
+            days = rebuild_view_sketches(since=since)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Rebuilt view sketches for {days} days{f' since {since}' if since else ''}."
+        ))
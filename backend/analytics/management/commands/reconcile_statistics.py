@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.forms.models import model_to_dict
+from django.utils import timezone
+
+from analytics.models import DonationStatistics
+from analytics.services.statistics_service import generate_daily_statistics
+
+COMPARED_FIELDS = [
+    'total_donations', 'total_requests', 'fulfilled_requests', 'new_donors',
+    'donations_by_group', 'requests_by_group',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount DonationStatistics from the underlying records and fix any drift "
+        "in the incrementally maintained counters (e.g. after bulk imports or "
+        "queryset.update() calls, which bypass the signals)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help="Reconcile this many days up to --until.")
+        parser.add_argument('--since', type=date.fromisoformat, help="First day (YYYY-MM-DD); overrides --days.")
+        parser.add_argument('--until', type=date.fromisoformat, help="Last day (YYYY-MM-DD), default today.")
+
+    def handle(self, *args, **options):
+        until = options['until'] or timezone.localdate()
+        since = options['since'] or until - timedelta(days=options['days'] - 1)
+        if since > until:
+            raise CommandError("--since must not be after --until.")
+
+        existing = {
+            stats.date: model_to_dict(stats, fields=COMPARED_FIELDS)
+            for stats in DonationStatistics.objects.filter(date__range=(since, until))
+        }
+        fixed = 0
+        day = since
+        while day <= until:
+            before = existing.get(day)
+            after = model_to_dict(generate_daily_statistics(day), fields=COMPARED_FIELDS)
+            if before is not None and before != after:
+                fixed += 1
+                changes = ', '.join(
+                    f"{field} {before[field]} -> {after[field]}" for field in COMPARED_FIELDS if before[field] != after[field]
+                )
+                self.stdout.write(self.style.WARNING(f"{day}: {changes}"))
+            day += timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Reconciled {(until - since).days + 1} days from {since} to {until}; {fixed} had drifted."
+        ))
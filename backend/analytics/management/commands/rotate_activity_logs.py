@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from analytics import partitioning
+from analytics.services.activity_log_retention import expired_months, month_logs, rotate_month
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly activity log partitions, then roll up, archive and "
+        "drop every month older than the retention window. Meant to run daily or monthly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-months', type=int, default=settings.ACTIVITY_LOG_RETENTION_MONTHS,
+            help="Months of raw logs to keep, the current one included.",
+        )
+        parser.add_argument('--archive-dir', default=settings.ACTIVITY_LOG_ARCHIVE_DIR)
+        parser.add_argument(
+            '--months-ahead', type=int, default=settings.ACTIVITY_LOG_PARTITIONS_AHEAD,
+            help="Create partitions up to this many months ahead (PostgreSQL only).",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Only list what would be rotated.")
+
+    def handle(self, *args, **options):
+        if options['keep_months'] < 1:
+            raise CommandError("--keep-months must be at least 1.")
+        dry_run = options['dry_run']
+
+        if partitioning.is_partitioned(connection) and not dry_run:
+            for name in partitioning.ensure_partitions(connection, months_ahead=options['months_ahead']):
+                self.stdout.write(f"Created partition {name}")
+
+        months = expired_months(options['keep_months'])
+        if not months:
+            self.stdout.write(self.style.SUCCESS("✅ No activity logs older than the retention window."))
+            return
+
+        for month in months:
+            label = f"{month:%Y-%m}"
+            if dry_run:
+                self.stdout.write(f"{label}: would rotate {month_logs(month).count()} entries")
+                continue
+            rotated = rotate_month(month, options['archive_dir'])
+            if rotated is None:
+                # Rows were added to the month while archiving; keep them
+                # and let the next run try again.
+                self.stdout.write(self.style.WARNING(f"{label}: entries changed while archiving, not dropping"))
+                continue
+            path, entries = rotated
+            if entries:
+                self.stdout.write(f"{label}: rolled up and archived {entries} entries to {path}")
+            else:
+                self.stdout.write(f"{label}: dropped empty month")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {'Checked' if dry_run else 'Rotated'} {len(months)} month(s) of activity logs."
+        ))
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:44
+
+import hashlib
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+# Frozen copies of the sketch format of common.utils.hyperloglog (precision
+# 12) and of the rebuild in analytics.services.request_view_service as of
+# this migration.
+PRECISION = 12
+
+
+def new_sketch():
+    return bytearray(1 << PRECISION)
+
+
+def add_to_sketch(registers, value):
+    hashed = int.from_bytes(hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest(), 'big')
+    index = hashed >> (64 - PRECISION)
+    rest = (hashed << PRECISION) & 0xFFFFFFFFFFFFFFFF
+    rank = 64 - rest.bit_length() + 1 if rest else 64 - PRECISION + 1
+    if rank > registers[index]:
+        registers[index] = rank
+
+
+def build_view_sketches(apps, schema_editor):
+    BloodRequestView = apps.get_model('analytics', 'BloodRequestView')
+    RequestViewSketch = apps.get_model('analytics', 'RequestViewSketch')
+
+    def save(day, sketches):
+        RequestViewSketch.objects.bulk_create(
+            [
+                RequestViewSketch(
+                    blood_request_id=target, date=day, total_views=total_views,
+                    sketch=bytes([PRECISION]) + zlib.compress(bytes(registers)),
+                )
+                for target, (total_views, registers) in sketches.items()
+            ],
+            batch_size=500,
+        )
+
+    day, sketches = None, {}
+    rows = BloodRequestView.objects.order_by('viewed_at').values_list(
+        'blood_request_id', 'viewer_id', 'session_key', 'viewed_at',
+    )
+    for request_id, viewer_id, session_key, viewed_at in rows.iterator(chunk_size=2000):
+        view_day = timezone.localdate(viewed_at) if timezone.is_aware(viewed_at) else viewed_at.date()
+        if view_day != day:
+            save(day, sketches)
+            day, sketches = view_day, {}
+        key = f"user:{viewer_id}" if viewer_id else f"session:{session_key}"
+        for target in (request_id, None):
+            sketch = sketches.setdefault(target, [0, new_sketch()])
+            sketch[0] += 1
+            add_to_sketch(sketch[1], key)
+    save(day, sketches)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_alter_activitylog_action'),
+        ('bloodrequests', '0002_bloodrequest_cancelled_by_bloodrequest_fulfilled_by_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestViewSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_views', models.PositiveIntegerField(default=0)),
+                ('sketch', models.BinaryField(default=bytes, help_text='Serialized HyperLogLog of viewer ids / session keys')),
+                ('blood_request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='view_sketches', to='bloodrequests.bloodrequest')),
+            ],
+            options={
+                'db_table': 'request_view_sketches',
+                'constraints': [models.UniqueConstraint(fields=('blood_request', 'date'), name='unique_request_view_sketch'), models.UniqueConstraint(condition=models.Q(('blood_request__isnull', True)), fields=('date',), name='unique_daily_view_sketch')],
+            },
+        ),
+        migrations.RunPython(build_view_sketches, migrations.RunPython.noop),
+    ]
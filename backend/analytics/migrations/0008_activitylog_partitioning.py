@@ -0,0 +1,113 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:50
+
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+# A frozen copy of the conversion in analytics.partitioning as of this
+# migration, so later changes to that module cannot alter it.
+TABLE = 'activity_logs'
+MONTHS_AHEAD = 3
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bounds(month):
+    start = timezone.make_aware(datetime.combine(month, time.min))
+    end = timezone.make_aware(datetime.combine(add_months(month, 1), time.min))
+    return start, end
+
+
+def partition_activity_logs(apps, schema_editor):
+    """Turn the plain activity_logs table into one partitioned by month of created_at.
+
+    PostgreSQL only; other databases keep the plain table.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLE])
+        if cursor.fetchone()[0] == 'p':
+            return
+
+    ActivityLog = apps.get_model('analytics', 'ActivityLog')
+    qn = connection.ops.quote_name
+    execute = schema_editor.execute
+    legacy = f'{TABLE}_unpartitioned'
+    sequence = f'{TABLE}_id_seq'
+    user_table = ActivityLog._meta.get_field('user').related_model._meta.db_table
+
+    execute(f"ALTER TABLE {qn(TABLE)} RENAME TO {qn(legacy)}")
+    # LIKE copies columns (in order) and NOT NULL, but not the identity,
+    # keys or indexes; those are recreated below to fit the partitioning.
+    execute(f"CREATE TABLE {qn(TABLE)} (LIKE {qn(legacy)}) PARTITION BY RANGE (created_at)")
+    execute(f"CREATE TABLE {qn(TABLE + '_default')} PARTITION OF {qn(TABLE)} DEFAULT")
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT min(created_at), max(id) FROM {qn(legacy)}")
+        oldest, max_id = cursor.fetchone()
+    today = timezone.localdate()
+    month = (timezone.localdate(oldest) if oldest else today).replace(day=1)
+    last = add_months(today.replace(day=1), MONTHS_AHEAD)
+    while month <= last:
+        start, end = month_bounds(month)
+        execute(
+            f"CREATE TABLE {qn(f'{TABLE}_{month:%Y_%m}')} PARTITION OF {qn(TABLE)} FOR VALUES FROM (%s) TO (%s)",
+            [start, end],
+        )
+        month = add_months(month, 1)
+
+    execute(f"INSERT INTO {qn(TABLE)} SELECT * FROM {qn(legacy)}")
+    execute(f"DROP TABLE {qn(legacy)}")
+
+    execute(f"CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(TABLE)}.id")
+    if max_id is not None:
+        execute("SELECT setval(%s, %s)", [sequence, max_id])
+    execute(f"ALTER TABLE {qn(TABLE)} ALTER COLUMN id SET DEFAULT nextval(%s::regclass)", [sequence])
+    execute(f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(TABLE + '_pkey')} PRIMARY KEY (id, created_at)")
+    execute(
+        f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(TABLE + '_user_id_fk')} FOREIGN KEY (user_id) "
+        f"REFERENCES {qn(user_table)} (id) DEFERRABLE INITIALLY DEFERRED"
+    )
+    execute(f"CREATE INDEX {qn(TABLE + '_user_id_idx')} ON {qn(TABLE)} (user_id)")
+    for index in ActivityLog._meta.indexes:
+        schema_editor.add_index(ActivityLog, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_activitylog_created_at_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityLogDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('action', models.CharField(choices=[('USER_REGISTERED', 'User Registered'), ('USER_LOGIN', 'User Login'), ('USER_LOGOUT', 'User Logout'), ('USER_LOGIN_FAILED', 'User Login Failed'), ('USER_CREATED', 'User Created'), ('USER_CREATE_FAILED', 'User Create Failed'), ('DONOR_VERIFIED', 'Donor Verified'), ('DONOR_UNVERIFIED', 'Donor Unverified'), ('BLOOD_BANK_VERIFIED', 'Blood Bank Verified'), ('BLOOD_BANK_UNVERIFIED', 'Blood Bank Unverified'), ('HOSPITAL_VERIFIED', 'Hospital Verified'), ('HOSPITAL_UNVERIFIED', 'Hospital Unverified'), ('REQUEST_CREATED', 'Request Created'), ('REQUEST_UPDATED', 'Request Updated'), ('REQUEST_APPROVED', 'Request Approved'), ('REQUEST_CANCELLED', 'Request Cancelled'), ('REQUEST_REJECTED', 'Request Rejected'), ('DONATION_COMPLETED', 'Donation Completed'), ('REQUEST_RESET', 'Request Reset'), ('INVENTORY_UPDATED', 'Inventory Updated'), ('CAMPAIGN_CREATED', 'Campaign Created')], max_length=50)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'activity_log_daily_counts',
+                'ordering': ['-date', 'action'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['created_at', 'id'], name='activity_logs_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='activitylogdailycount',
+            constraint=models.UniqueConstraint(fields=('date', 'action'), name='unique_activity_log_daily_count'),
+        ),
+        migrations.RunPython(partition_activity_logs, migrations.RunPython.noop),
+    ]
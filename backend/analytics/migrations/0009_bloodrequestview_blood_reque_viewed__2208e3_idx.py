@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0008_activitylog_partitioning'),
+        ('bloodrequests', '0002_bloodrequest_cancelled_by_bloodrequest_fulfilled_by_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bloodrequestview',
+            index=models.Index(fields=['viewed_at', 'id'], name='blood_reque_viewed__2208e3_idx'),
+        ),
+    ]
@@ -4,6 +4,7 @@ from bloodrequests.models import BloodRequest
 from bloodbanks.models import BloodBank
 from django.utils import timezone
 from django.db.models import Count
+from common.utils.hyperloglog import HyperLogLog
 
 class DonationStatistics(models.Model):
     date = models.DateField(unique=True)
@@ -23,6 +24,12 @@ class DonationStatistics(models.Model):
         return f"Statistics for {self.date}"
 
 
+class ActivityLogQuerySet(models.QuerySet):
+    def with_details(self):
+        """Load the user ActivityLogSerializer renders in the same query."""
+        return self.select_related('user__created_by')
+
+
 class ActivityLog(models.Model):
     ACTION_CHOICES = (
         ('USER_REGISTERED', 'User Registered'),
@@ -54,19 +61,44 @@ class ActivityLog(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.CharField(max_length=255, null=True, blank=True)
     metadata = models.JSONField(default=dict, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    
+    # Not auto_now_add: entries are written in batches (see log_activity),
+    # and this must be when the event happened.
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    objects = ActivityLogQuerySet.as_manager()
+
     class Meta:
         db_table = 'activity_logs'
         ordering = ['-created_at']
+        # On PostgreSQL the table is partitioned by month of created_at
+        # (see analytics.partitioning); old months are rolled up into
+        # ActivityLogDailyCount by the rotate_activity_logs command.
         indexes = [
             models.Index(fields=['user', 'created_at']),
             models.Index(fields=['action', 'created_at']),
+            models.Index(fields=['created_at', 'id'], name='activity_logs_created_idx'),
         ]
     
     def __str__(self):
         return f"{self.action} by {self.user.username if self.user else 'System'}"
 
+
+class ActivityLogDailyCount(models.Model):
+    """Number of activity log entries per action and day, kept after the raw rows are archived."""
+    date = models.DateField()
+    action = models.CharField(max_length=50, choices=ActivityLog.ACTION_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'activity_log_daily_counts'
+        ordering = ['-date', 'action']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'action'], name='unique_activity_log_daily_count'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} x{self.count} on {self.date}"
+
 class BloodRequestView(models.Model):
     blood_request = models.ForeignKey('bloodrequests.BloodRequest', on_delete=models.CASCADE, related_name='views')
     viewer = models.ForeignKey('accounts.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='viewed_requests')
@@ -82,6 +114,7 @@ class BloodRequestView(models.Model):
         indexes = [
             models.Index(fields=['blood_request', 'viewed_at']),
             models.Index(fields=['viewer']),
+            models.Index(fields=['viewed_at', 'id']),
         ]
 
     def __str__(self):
@@ -104,8 +137,8 @@ class RequestViewStatistics(models.Model):
         return f"View Stats ({self.date})"
 
     @classmethod
-    def generate_daily_stats(cls):
-        today = timezone.now().date()
+    def generate_daily_stats(cls, day=None):
+        today = day or timezone.now().date()
         start = timezone.make_aware(
             timezone.datetime.combine(today, timezone.datetime.min.time())
         )
@@ -148,6 +181,32 @@ class RequestViewStatistics(models.Model):
 
 
 
+class RequestViewSketch(models.Model):
+    """Views and a HyperLogLog sketch of distinct viewers for one day.
+
+    There is a row per blood request and day, plus a row per day with no
+    blood request that covers all of them. Sketches of several days merge,
+    so unique viewers over any date range cost one row per day.
+    """
+    blood_request = models.ForeignKey('bloodrequests.BloodRequest', on_delete=models.CASCADE, null=True, blank=True, related_name='view_sketches')
+    date = models.DateField()
+    total_views = models.PositiveIntegerField(default=0)
+    sketch = models.BinaryField(default=bytes, help_text="Serialized HyperLogLog of viewer ids / session keys")
+
+    class Meta:
+        db_table = 'request_view_sketches'
+        constraints = [
+            models.UniqueConstraint(fields=['blood_request', 'date'], name='unique_request_view_sketch'),
+            models.UniqueConstraint(fields=['date'], condition=models.Q(blood_request__isnull=True), name='unique_daily_view_sketch'),
+        ]
+
+    def __str__(self):
+        return f"View sketch of {self.blood_request or 'all requests'} on {self.date}"
+
+    def get_sketch(self):
+        return HyperLogLog.from_bytes(self.sketch)
+
+
 class DistanceRecord(models.Model):
     blood_request = models.ForeignKey('bloodrequests.BloodRequest', on_delete=models.CASCADE, null=True, blank=True)
     receiver = models.ForeignKey(User, related_name='distance_as_receiver', on_delete=models.CASCADE, null=True, blank=True)
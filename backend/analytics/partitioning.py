@@ -0,0 +1,132 @@
+"""Monthly range partitions of activity_logs on PostgreSQL.
+
+activity_logs is partitioned by created_at into one table per month
+(activity_logs_2026_01, ...) plus a default partition that catches rows
+outside every monthly range, so inserts never fail for lack of a
+partition. Migration 0008 converts the table. The primary key becomes
+(id, created_at) because PostgreSQL requires the partition key in unique
+constraints; ids still come from a single sequence.
+
+Other databases (sqlite in development) keep a plain table, and the
+retention code deletes rows instead of dropping partitions.
+"""
+import re
+from datetime import date, datetime, time
+
+from django.db import transaction
+from django.utils import timezone
+
+TABLE = 'activity_logs'
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_NAME = re.compile(rf'^{TABLE}_(\d{{4}})_(\d{{2}})$')
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_bounds(month):
+    """[start, end) of a month as aware datetimes in the current time zone."""
+    start = timezone.make_aware(datetime.combine(month, time.min))
+    end = timezone.make_aware(datetime.combine(add_months(month, 1), time.min))
+    return start, end
+
+
+def partition_name(month):
+    return f'{TABLE}_{month:%Y_%m}'
+
+
+def supports_partitioning(connection):
+    return connection.vendor == 'postgresql'
+
+
+def is_partitioned(connection):
+    if not supports_partitioning(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLE])
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def monthly_partitions(connection):
+    """{first day of month: partition name} for the attached monthly partitions."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.oid = to_regclass(%s)
+            """,
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def create_partition(connection, month):
+    """Attach the partition for one month, moving its rows out of the default partition."""
+    qn = connection.ops.quote_name
+    name = partition_name(month)
+    start, end = month_bounds(month)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        # CREATE ... PARTITION OF would fail if the default partition already
+        # holds rows of this month, so build the table, fill it and attach it.
+        cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(TABLE)} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s RETURNING *) "
+            f"INSERT INTO {qn(name)} SELECT * FROM moved",
+            [start, end],
+        )
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)", [start, end])
+    return name
+
+
+def ensure_partitions(connection, months_ahead=3, since=None):
+    """Create the missing monthly partitions from `since` (default: this month) to months_ahead out."""
+    existing = monthly_partitions(connection)
+    month = month_start(since or timezone.localdate())
+    last = add_months(month_start(timezone.localdate()), months_ahead)
+    created = []
+    while month <= last:
+        if month not in existing:
+            created.append(create_partition(connection, month))
+        month = add_months(month, 1)
+    return created
+
+
+def lock_month(connection, month):
+    """Block writes to a month's partition until the transaction ends.
+
+    Rows of the month that sit in the default partition are not covered;
+    new entries are created now, so only backdated inserts land there.
+    """
+    name = monthly_partitions(connection).get(month)
+    if name:
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {connection.ops.quote_name(name)} IN EXCLUSIVE MODE")
+
+
+def drop_partition(connection, month):
+    """Drop a month's partition (if any) and its rows left in the default partition."""
+    qn = connection.ops.quote_name
+    start, end = month_bounds(month)
+    name = monthly_partitions(connection).get(month)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        if name:
+            cursor.execute(f"DROP TABLE {qn(name)}")
+        cursor.execute(
+            f"DELETE FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s", [start, end],
+        )
+
@@ -3,7 +3,7 @@ from analytics.models import (
     DonationStatistics, ActivityLog,
     BloodRequestView, RequestViewStatistics
 )
-from accounts.serializers import UserSerializer
+from accounts.serializers import UserLocationListSerializer, UserSerializer
 
 
 class DonationStatisticsSerializer(serializers.ModelSerializer):
@@ -12,12 +12,17 @@ class DonationStatisticsSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class ActivityLogListSerializer(UserLocationListSerializer):
+    user_paths = (('user',),)
+
+
 class ActivityLogSerializer(serializers.ModelSerializer):
     user = UserSerializer()
 
     class Meta:
         model = ActivityLog
         fields = '__all__'
+        list_serializer_class = ActivityLogListSerializer
 
 
 class BloodRequestViewSerializer(serializers.ModelSerializer):
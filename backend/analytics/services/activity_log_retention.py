@@ -0,0 +1,135 @@
+"""Retention of activity logs: archive a month, roll it up, then drop it.
+
+Each month older than the retention window is
+1. written to <archive dir>/activity_logs-YYYY-MM.ndjson.gz, one JSON
+   object per row,
+2. added, per day and action, to ActivityLogDailyCount, and
+3. removed: its partition is dropped on PostgreSQL, its rows are deleted
+   elsewhere.
+Steps 2 and 3 run in one transaction and only when the month still holds
+exactly the archived rows, so every entry is counted once. Reruns never
+overwrite an archive: entries that reach an already rotated month later
+go to activity_logs-YYYY-MM.2.ndjson.gz, .3, and so on. A run that fails
+after its archive was written can leave entries in two files; their ids
+tell the copies apart.
+"""
+import gzip
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from analytics import partitioning
+from analytics.models import ActivityLog, ActivityLogDailyCount
+
+ARCHIVE_FIELDS = ('id', 'user_id', 'action', 'description', 'ip_address', 'user_agent', 'metadata', 'created_at')
+
+
+def month_logs(month):
+    start, end = partitioning.month_bounds(month)
+    return ActivityLog.objects.filter(created_at__gte=start, created_at__lt=end)
+
+
+def expired_months(keep_months, today=None):
+    """First days of the months before the last keep_months months (the
+    current one included) that still have entries or a partition."""
+    cutoff = partitioning.add_months(partitioning.month_start(today or timezone.localdate()), -keep_months)
+    months = set()
+    if partitioning.is_partitioned(connection):
+        months.update(month for month in partitioning.monthly_partitions(connection) if month < cutoff)
+    oldest = ActivityLog.objects.order_by('created_at').values_list('created_at', flat=True).first()
+    if oldest is not None:
+        month = partitioning.month_start(timezone.localtime(oldest))
+        while month < cutoff:
+            months.add(month)
+            month = partitioning.add_months(month, 1)
+    return sorted(months)
+
+
+def archive_path(archive_dir, month, sequence):
+    suffix = '' if sequence == 1 else f'.{sequence}'
+    return Path(archive_dir) / f"activity_logs-{month:%Y-%m}{suffix}.ndjson.gz"
+
+
+def archive_month(month, archive_dir, batch_size=5000):
+    """Write a month's entries to a new gzipped NDJSON file.
+
+    Returns (path, counts), counts being a Counter of (day, action); path
+    is None when the month holds no entries. Existing archives of the
+    month are left alone and the file gets the next free sequence number.
+    """
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    first = archive_path(archive_dir, month, 1)
+    partial = first.with_name(first.name + '.part')
+    counts = Counter()
+    rows = month_logs(month).order_by('created_at', 'id').values(*ARCHIVE_FIELDS)
+    with gzip.open(partial, 'wt', encoding='utf-8') as archive:
+        for row in rows.iterator(chunk_size=batch_size):
+            archive.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+            archive.write('\n')
+            counts[timezone.localdate(row['created_at']), row['action']] += 1
+    if not counts:
+        partial.unlink()
+        return None, counts
+
+    # Only a complete file ever gets a final name, and link() refuses to
+    # replace an existing one.
+    sequence = 1
+    while True:
+        path = archive_path(archive_dir, month, sequence)
+        try:
+            os.link(partial, path)
+        except FileExistsError:
+            sequence += 1
+            continue
+        partial.unlink()
+        return path, counts
+
+
+def add_daily_counts(counts):
+    """Add a Counter of (day, action) to the stored daily counts."""
+    ActivityLogDailyCount.objects.bulk_create(
+        [ActivityLogDailyCount(date=day, action=action) for day, action in counts],
+        ignore_conflicts=True,
+    )
+    for (day, action), count in counts.items():
+        ActivityLogDailyCount.objects.filter(date=day, action=action).update(count=F('count') + count)
+
+
+def rotate_month(month, archive_dir):
+    """Archive, roll up and drop one month.
+
+    Returns (path, entries rotated), or None when entries were added to
+    the month while it was archived; the month is then kept as it was and
+    the new archive removed, for the next run to try again.
+    """
+    path, counts = archive_month(month, archive_dir)
+    entries = sum(counts.values())
+    with transaction.atomic():
+        if partitioning.is_partitioned(connection):
+            partitioning.lock_month(connection, month)
+        if month_logs(month).count() != entries:
+            if path is not None:
+                path.unlink()
+            return None
+        add_daily_counts(counts)
+        drop_month(month)
+    return path, entries
+
+
+def drop_month(month, batch_size=5000):
+    if partitioning.is_partitioned(connection):
+        partitioning.drop_partition(connection, month)
+        return
+    logs = month_logs(month)
+    while True:
+        ids = list(logs.order_by().values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return
+        ActivityLog.objects.filter(id__in=ids).delete()
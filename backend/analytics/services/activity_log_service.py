@@ -0,0 +1,50 @@
+import logging
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from analytics.models import ActivityLog
+from common.utils.buffered_writer import BufferedWriter
+
+logger = logging.getLogger(__name__)
+
+
+def write_activity_logs(entries):
+    try:
+        with transaction.atomic():
+            ActivityLog.objects.bulk_create(entries, batch_size=settings.BUFFERED_WRITES_BATCH_SIZE)
+    except IntegrityError:
+        # E.g. a user deleted while their entry was queued; write the rest
+        # one by one instead of losing the whole batch.
+        for entry in entries:
+            try:
+                with transaction.atomic():
+                    entry.save()
+            except IntegrityError:
+                logger.warning("Dropping activity log entry %r: %s", entry.action, entry.description)
+
+
+activity_log_writer = BufferedWriter(
+    'activity-log-writer',
+    write_activity_logs,
+    max_batch_size=settings.BUFFERED_WRITES_BATCH_SIZE,
+    flush_interval=settings.BUFFERED_WRITES_FLUSH_SECONDS,
+    enabled=settings.BUFFERED_WRITES_ENABLED,
+)
+
+
+def log_activity(*, action, description, user=None, ip_address=None, user_agent=None, metadata=None):
+    """Queue an ActivityLog entry; it is written with the next batch.
+
+    Takes the same fields as ActivityLog. created_at is the time of this
+    call, not of the write. Inside a transaction the entry is only queued
+    once it commits, so rolled-back actions are never logged.
+    """
+    entry = ActivityLog(
+        user=user,
+        action=action,
+        description=description,
+        ip_address=ip_address,
+        # Truncated here rather than failing the whole batch on write.
+        user_agent=user_agent[:255] if user_agent else user_agent,
+        metadata=metadata if metadata is not None else {},
+    )
+    transaction.on_commit(lambda: activity_log_writer.put(entry))
@@ -0,0 +1,57 @@
+import threading
+import time
+from django.conf import settings
+from analytics.models import DistanceRecord
+from common.utils.buffered_writer import BufferedWriter
+
+_recent_receivers = {}
+_recent_lock = threading.Lock()
+
+
+def write_distance_records(records):
+    DistanceRecord.objects.bulk_create(records, batch_size=settings.BUFFERED_WRITES_BATCH_SIZE)
+
+
+distance_record_writer = BufferedWriter(
+    'distance-record-writer',
+    write_distance_records,
+    max_batch_size=settings.BUFFERED_WRITES_BATCH_SIZE,
+    flush_interval=settings.BUFFERED_WRITES_FLUSH_SECONDS,
+    enabled=settings.BUFFERED_WRITES_ENABLED,
+)
+
+
+def should_record(receiver_id):
+    """True at most once per DISTANCE_RECORD_DEDUP_SECONDS for the same receiver."""
+    window = settings.DISTANCE_RECORD_DEDUP_SECONDS
+    now = time.monotonic()
+    with _recent_lock:
+        last = _recent_receivers.get(receiver_id)
+        if last is not None and now - last < window:
+            return False
+        _recent_receivers[receiver_id] = now
+        if len(_recent_receivers) > 10000:
+            for key, seen in list(_recent_receivers.items()):
+                if now - seen >= window:
+                    del _recent_receivers[key]
+    return True
+
+
+def record_nearest_distances(receiver_id, donor=None, hospital=None, blood_bank=None):
+    """Queue the receiver's nearest donor/hospital/bank distances for a background bulk insert.
+
+    Each argument is an (id, distance_km) pair or None: donor and hospital
+    ids are User ids, blood_bank is a BloodBank id.
+    """
+    if not (donor or hospital or blood_bank) or not should_record(receiver_id):
+        return
+
+    distance_record_writer.put(DistanceRecord(
+        receiver_id=receiver_id,
+        donor_id=donor and donor[0],
+        hospital_id=hospital and hospital[0],
+        blood_bank_id=blood_bank and blood_bank[0],
+        receiver_to_donor_km=donor and donor[1],
+        receiver_to_hospital_km=hospital and hospital[1],
+        receiver_to_bloodbank_km=blood_bank and blood_bank[1],
+    ))
@@ -0,0 +1,196 @@
+import threading
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from analytics.models import BloodRequestView, RequestViewSketch, RequestViewStatistics
+from analytics.services.statistics_service import statistics_day
+from bloodrequests.models import BloodRequest
+from common.utils.buffered_writer import BufferedWriter
+from common.utils.hyperloglog import HyperLogLog
+
+# (blood_request_id, session_key) of views queued but not yet written, so a
+# repeated view is recognised before it reaches the database.
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def write_request_views(views):
+    """Bulk insert buffered views, then schedule a refresh of the days they fall on."""
+    request_ids = {view.blood_request_id for view in views}
+    existing = set(BloodRequest.objects.filter(id__in=request_ids).values_list('id', flat=True))
+    unique = {}
+    for view in views:
+        # Skip views of requests deleted since they were queued.
+        if view.blood_request_id in existing:
+            unique.setdefault((view.blood_request_id, view.session_key), view)
+    try:
+        # The (blood_request, session_key) unique constraint drops repeat views.
+        BloodRequestView.objects.bulk_create(
+            unique.values(), batch_size=settings.BUFFERED_WRITES_BATCH_SIZE, ignore_conflicts=True,
+        )
+    finally:
+        with _pending_lock:
+            _pending.difference_update((view.blood_request_id, view.session_key) for view in views)
+
+    by_day = {}
+    for view in inserted_views(unique.values()):
+        by_day.setdefault(statistics_day(view.viewed_at), []).append(
+            (view.blood_request_id, viewer_key(view.viewer_id, view.session_key))
+        )
+    for day, day_views in by_day.items():
+        add_to_view_sketches(day, day_views)
+        # The day each view counts towards, not the flush day: a batch
+        # flushed just after midnight belongs to the day before.
+        view_statistics_refresher.put(day)
+
+
+def inserted_views(views):
+    """The views a bulk_create(ignore_conflicts=True) actually stored.
+
+    Rows are not given ids on conflict, so read back the stored rows and
+    keep the views whose viewed_at (set by bulk_create()) matches; a row
+    another process stored first has its own timestamp.
+    """
+    views = list(views)
+    if not views:
+        return []
+    stored = set(
+        BloodRequestView.objects.filter(
+            blood_request_id__in={view.blood_request_id for view in views},
+            session_key__in={view.session_key for view in views},
+        ).values_list('blood_request_id', 'session_key', 'viewed_at')
+    )
+    return [view for view in views if (view.blood_request_id, view.session_key, view.viewed_at) in stored]
+
+
+def refresh_view_statistics(days):
+    for day in sorted(set(days)):
+        RequestViewStatistics.generate_daily_stats(day)
+
+
+request_view_writer = BufferedWriter(
+    'request-view-writer',
+    write_request_views,
+    max_batch_size=settings.BUFFERED_WRITES_BATCH_SIZE,
+    flush_interval=settings.BUFFERED_WRITES_FLUSH_SECONDS,
+    enabled=settings.BUFFERED_WRITES_ENABLED,
+)
+
+# Collects the days that received views; its thread recomputes each of them
+# at most once per REQUEST_VIEW_STATS_INTERVAL_SECONDS instead of per view.
+view_statistics_refresher = BufferedWriter(
+    'view-statistics-refresher',
+    refresh_view_statistics,
+    max_batch_size=10000,
+    flush_interval=settings.REQUEST_VIEW_STATS_INTERVAL_SECONDS,
+    enabled=settings.BUFFERED_WRITES_ENABLED,
+)
+
+
+def record_request_view(blood_request_id, session_key, viewer=None, ip_address=None):
+    """Queue a view of a blood request; returns False if this session already viewed it."""
+    key = (blood_request_id, session_key)
+    with _pending_lock:
+        if key in _pending:
+            return False
+    if BloodRequestView.objects.filter(blood_request_id=blood_request_id, session_key=session_key).exists():
+        return False
+    with _pending_lock:
+        if key in _pending:
+            return False
+        _pending.add(key)
+
+    request_view_writer.put(BloodRequestView(
+        blood_request_id=blood_request_id,
+        session_key=session_key,
+        viewer=viewer,
+        ip_address=ip_address,
+    ))
+    return True
+
+
+def viewer_key(viewer_id, session_key):
+    """What counts as one viewer: a signed-in user, otherwise the session."""
+    return f"user:{viewer_id}" if viewer_id else f"session:{session_key}"
+
+
+def add_to_view_sketches(day, views):
+    """Fold (blood_request_id, viewer key) pairs into the sketch rows of one day.
+
+    Updates the row of each request and the all-requests row under row
+    locks.
+    """
+    groups = {}
+    for request_id, key in views:
+        for target in (request_id, None):
+            group = groups.setdefault(target, [0, set()])
+            group[0] += 1
+            group[1].add(key)
+
+    rows = RequestViewSketch.objects.filter(date=day).filter(
+        Q(blood_request_id__in=[target for target in groups if target is not None]) | Q(blood_request__isnull=True)
+    )
+    with transaction.atomic():
+        existing = set(rows.values_list('blood_request_id', flat=True))
+        RequestViewSketch.objects.bulk_create(
+            [RequestViewSketch(blood_request_id=target, date=day) for target in groups if target not in existing],
+            ignore_conflicts=True,
+        )
+        locked = list(rows.select_for_update())
+        for row in locked:
+            views_count, keys = groups[row.blood_request_id]
+            sketch = HyperLogLog.from_bytes(row.sketch)
+            sketch.update(keys)
+            row.sketch = sketch.to_bytes()
+            row.total_views += views_count
+        RequestViewSketch.objects.bulk_update(locked, ['sketch', 'total_views'])
+
+
+def rebuild_view_sketches(since=None, batch_size=2000):
+    """Recreate the sketch rows from the raw views (all days, or from `since` on)."""
+    views = BloodRequestView.objects.order_by('viewed_at')
+    stale = RequestViewSketch.objects.all()
+    if since is not None:
+        views = views.filter(viewed_at__date__gte=since)
+        stale = stale.filter(date__gte=since)
+    stale.delete()
+
+    day, pending, days = None, [], 0
+    rows = views.values_list('blood_request_id', 'viewer_id', 'session_key', 'viewed_at')
+    for request_id, viewer_id, session_key, viewed_at in rows.iterator(chunk_size=batch_size):
+        view_day = statistics_day(viewed_at)
+        if view_day != day:
+            if pending:
+                add_to_view_sketches(day, pending)
+                days += 1
+            day, pending = view_day, []
+        pending.append((request_id, viewer_key(viewer_id, session_key)))
+    if pending:
+        add_to_view_sketches(day, pending)
+        days += 1
+    return days
+
+
+def view_summary(start, end, blood_request_id=None):
+    """Views and unique viewers per day between start and end (inclusive), plus
+    the unique viewers of the whole range, read from the daily sketches."""
+    rows = RequestViewSketch.objects.filter(date__range=(start, end)).order_by('date')
+    if blood_request_id is None:
+        rows = rows.filter(blood_request__isnull=True)
+    else:
+        rows = rows.filter(blood_request_id=blood_request_id)
+
+    days, combined = [], HyperLogLog()
+    for row in rows:
+        sketch = row.get_sketch()
+        combined.merge(sketch)
+        days.append({
+            'date': row.date.strftime('%Y-%m-%d'),
+            'total_views': row.total_views,
+            'unique_viewers': sketch.count(),
+        })
+    return {
+        'results': days,
+        'total_views': sum(day['total_views'] for day in days),
+        'unique_viewers': combined.count(),
+    }
@@ -1,11 +1,19 @@
 from datetime import date
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from donors.models import DonorProfile
 from bloodrequests.models import BloodRequest
 from donors.models import DonationRecord
 from analytics.models import DonationStatistics
 
 def generate_daily_statistics(target_date=None):
+    """Recompute one day's statistics from scratch.
+
+    The counters are normally kept up to date by adjust_daily_statistics();
+    this full recount is for reconciliation (see reconcile_statistics).
+    """
     if target_date is None:
         target_date = date.today()
 
@@ -54,3 +62,110 @@ def generate_daily_statistics(target_date=None):
     )
 
     return stats
+
+
+def statistics_day(value):
+    """The day a timestamp counts towards, matching `__date` lookups."""
+    if timezone.is_aware(value):
+        return timezone.localdate(value)
+    return value.date()
+
+
+def adjust_daily_statistics(day, donations=0, requests=0, fulfilled=0, new_donors=0,
+                            donations_by_group=None, requests_by_group=None):
+    """Add deltas to one day's DonationStatistics row, creating it if needed.
+
+    Totals are updated with F() expressions (never going below zero); the
+    JSON group counters are read and rewritten under a row lock, so
+    concurrent transitions on the same day don't lose updates.
+    """
+    locked = DonationStatistics.objects.select_for_update().only('donations_by_group', 'requests_by_group')
+    with transaction.atomic():
+        stats = locked.filter(date=day).first()
+        if stats is None:
+            DonationStatistics.objects.get_or_create(date=day)
+            stats = locked.get(date=day)
+        updates = {
+            field: Greatest(F(field) + delta, Value(0))
+            for field, delta in (
+                ('total_donations', donations),
+                ('total_requests', requests),
+                ('fulfilled_requests', fulfilled),
+                ('new_donors', new_donors),
+            )
+            if delta
+        }
+        for field, deltas in (('donations_by_group', donations_by_group), ('requests_by_group', requests_by_group)):
+            if not deltas:
+                continue
+            counts = dict(getattr(stats, field))
+            for group, delta in deltas.items():
+                count = counts.get(group, 0) + delta
+                if count > 0:
+                    counts[group] = count
+                else:
+                    counts.pop(group, None)
+            updates[field] = counts
+        if updates:
+            DonationStatistics.objects.filter(pk=stats.pk).update(**updates)
+
+
+def previous_statistics_values(instance):
+    """STATISTICS_FIELDS of a model instance as last read from or written to the database.
+
+    Call it before the row is overwritten or deleted (pre_save/pre_delete);
+    instances loaded with only()/defer() have the missing fields read back then.
+    """
+    loaded = getattr(instance, '_loaded_values', {})
+    missing = [name for name in instance.STATISTICS_FIELDS if name not in loaded]
+    if instance.pk and missing:
+        loaded.update(type(instance)._base_manager.filter(pk=instance.pk).values(*missing).first() or {})
+        instance._loaded_values = loaded
+    return loaded
+
+
+def current_statistics_values(instance):
+    return {name: getattr(instance, name) for name in instance.STATISTICS_FIELDS}
+
+
+def remember_statistics_values(instance):
+    """Mark the instance's current values as saved, so the next save diffs against them."""
+    instance._loaded_values = current_statistics_values(instance)
+
+
+def donation_statistics_key(status, donation_date, blood_group):
+    """(day, blood group) a donation is counted under, or None if it isn't counted."""
+    if status != "COMPLETED" or donation_date is None:
+        return None
+    return statistics_day(donation_date), blood_group
+
+
+def request_statistics_key(created_at, blood_group, status):
+    """(day, blood group, fulfilled) a blood request is counted under."""
+    if created_at is None:
+        return None
+    return statistics_day(created_at), blood_group, status == "FULFILLED"
+
+
+def record_donation_change(old, new):
+    """Move a donation between statistics keys (None = not counted)."""
+    if old == new:
+        return
+    if old:
+        adjust_daily_statistics(old[0], donations=-1, donations_by_group={old[1]: -1})
+    if new:
+        adjust_daily_statistics(new[0], donations=1, donations_by_group={new[1]: 1})
+
+
+def record_request_change(old, new):
+    """Move a blood request between statistics keys (None = not counted)."""
+    if old == new:
+        return
+    if old and new and old[:2] == new[:2]:
+        # Same day and group; only the fulfilled flag changed.
+        adjust_daily_statistics(new[0], fulfilled=int(new[2]) - int(old[2]))
+        return
+    if old:
+        adjust_daily_statistics(old[0], requests=-1, fulfilled=-int(old[2]), requests_by_group={old[1]: -1})
+    if new:
+        adjust_daily_statistics(new[0], requests=1, fulfilled=int(new[2]), requests_by_group={new[1]: 1})
@@ -1,10 +1,14 @@
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver, Signal
-from analytics.models import ActivityLog
+from analytics.services.activity_log_service import log_activity
 from bloodrequests.models import BloodRequest
 from bloodbanks.models import BloodInventory
 from django.utils import timezone
+from analytics.services.statistics_service import (
+    current_statistics_values, previous_statistics_values, record_request_change,
+    remember_statistics_values, request_statistics_key,
+)
 
 
 request_created_signal = Signal()
@@ -21,7 +25,7 @@ def get_client_ip(request):
 
 @receiver(user_logged_in)
 def log_user_login(sender, request, user, **kwargs):
-    ActivityLog.objects.create(
+    log_activity(
         user=user,
         action='USER_LOGIN',
         description=f"User '{user.username}' logged in successfully.",
@@ -37,7 +41,7 @@ def log_user_login(sender, request, user, **kwargs):
 @receiver(user_logged_out)
 def log_user_logout(sender, request, user, **kwargs):
     if user and user.is_authenticated:
-        ActivityLog.objects.create(
+        log_activity(
             user=user,
             action='USER_LOGOUT',
             description=f"User '{user.username}' logged out.",
@@ -49,7 +53,7 @@ def log_user_logout(sender, request, user, **kwargs):
 
 @receiver(user_login_failed)
 def log_user_login_failed(sender, credentials, request, **kwargs):
-    ActivityLog.objects.create(
+    log_activity(
         user=None,
         action='USER_LOGIN_FAILED',
         description=f"Failed login attempt for username '{credentials.get('username')}'.",
@@ -64,7 +68,7 @@ def log_user_login_failed(sender, credentials, request, **kwargs):
 @receiver(request_created_signal)
 def log_request_created(sender, request, blood_request, **kwargs):
     user = getattr(request, "user", None)
-    ActivityLog.objects.create(
+    log_activity(
         user=user,
         action='REQUEST_CREATED',
         description=f"New blood request created by user '{user.username if user else 'Unknown'}'.",
@@ -91,7 +95,7 @@ def log_inventory_updated(sender, **kwargs):
         ip_address = x_forwarded_for.split(',')[0] if x_forwarded_for else request.META.get('REMOTE_ADDR')
         user_agent = request.META.get('HTTP_USER_AGENT', '')
 
-    ActivityLog.objects.create(
+    log_activity(
         user=inventory.blood_bank.managed_by,
         action='INVENTORY_UPDATED',
         description=f"Inventory of blood bank '{inventory.blood_bank.name}' updated.",
@@ -104,3 +108,23 @@ def log_inventory_updated(sender, **kwargs):
     )
 
 
+def request_key(values):
+    return request_statistics_key(values.get('created_at'), values.get('blood_group'), values.get('status'))
+
+
+@receiver(pre_save, sender=BloodRequest)
+@receiver(pre_delete, sender=BloodRequest)
+def capture_request_values(sender, instance, **kwargs):
+    previous_statistics_values(instance)
+
+
+@receiver(post_save, sender=BloodRequest)
+def update_request_statistics(sender, instance, created, **kwargs):
+    old = None if created else request_key(previous_statistics_values(instance))
+    record_request_change(old, request_key(current_statistics_values(instance)))
+    remember_statistics_values(instance)
+
+
+@receiver(post_delete, sender=BloodRequest)
+def remove_request_statistics(sender, instance, **kwargs):
+    record_request_change(request_key(previous_statistics_values(instance)), None)
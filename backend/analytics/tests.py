@@ -1,3 +1,314 @@
+import gzip
+import io
+import json
+import tempfile
+from datetime import datetime, time, timedelta
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.core.management import call_command
+from django.db import connection, transaction
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import ReceiverProfile, User
+from analytics import partitioning
+from analytics.models import ActivityLog, ActivityLogDailyCount, BloodRequestView, DonationStatistics, RequestViewSketch
+from analytics.services import activity_log_retention, activity_log_service, request_view_service
+from analytics.services.activity_log_retention import month_logs, rotate_month
+from analytics.services.request_view_service import write_request_views
+from analytics.services.statistics_service import generate_daily_statistics
+from bloodbanks.models import BloodBank, BloodInventory
+from bloodrequests.models import BloodRequest
+from donors.models import DonationRecord, DonorProfile
+from locations.models import Location
+
+
+def months_ago(count, day=10):
+    month = partitioning.add_months(partitioning.month_start(timezone.localdate()), -count)
+    return month, timezone.make_aware(datetime.combine(month.replace(day=day), time(12)))
+
+
+def create_log(created_at, action='USER_LOGIN'):
+    return ActivityLog.objects.create(action=action, description='entry', created_at=created_at)
+
+
+def read_archive(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as archive:
+        return [json.loads(line) for line in archive]
+
+
+class ActivityLogRotationTests(TestCase):
+    def setUp(self):
+        self.archive_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.old_month, self.old_day = months_ago(14)
+        _, self.recent_day = months_ago(1)
+
+    def rotate(self):
+        call_command('rotate_activity_logs', keep_months=12, archive_dir=self.archive_dir, stdout=io.StringIO())
+
+    def counts(self):
+        return {(row.date, row.action): row.count for row in ActivityLogDailyCount.objects.all()}
+
+    def test_rolls_up_archives_and_drops_expired_months(self):
+        old = [create_log(self.old_day), create_log(self.old_day), create_log(self.old_day, 'USER_LOGOUT')]
+        recent = create_log(self.recent_day)
+
+        self.rotate()
+
+        self.assertEqual(list(ActivityLog.objects.values_list('id', flat=True)), [recent.id])
+        day = self.old_day.date()
+        self.assertEqual(self.counts(), {(day, 'USER_LOGIN'): 2, (day, 'USER_LOGOUT'): 1})
+        archive = self.archive_dir / f"activity_logs-{self.old_month:%Y-%m}.ndjson.gz"
+        self.assertEqual([row['id'] for row in read_archive(archive)], [log.id for log in old])
+
+    def test_reruns_add_late_entries_without_overwriting(self):
+        create_log(self.old_day)
+        self.rotate()
+        self.rotate()
+        first = self.archive_dir / f"activity_logs-{self.old_month:%Y-%m}.ndjson.gz"
+        first_rows = read_archive(first)
+
+        late = create_log(self.old_day)
+        self.rotate()
+
+        self.assertEqual(self.counts(), {(self.old_day.date(), 'USER_LOGIN'): 2})
+        self.assertEqual(read_archive(first), first_rows)
+        second = self.archive_dir / f"activity_logs-{self.old_month:%Y-%m}.2.ndjson.gz"
+        self.assertEqual([row['id'] for row in read_archive(second)], [late.id])
+        self.assertEqual(len(list(self.archive_dir.iterdir())), 2)
+
+    def test_month_changed_while_archiving_is_kept(self):
+        create_log(self.old_day)
+        archive_month = activity_log_retention.archive_month
+
+        def archive_then_insert(*args, **kwargs):
+            result = archive_month(*args, **kwargs)
+            create_log(self.old_day)
+            return result
+
+        with mock.patch.object(activity_log_retention, 'archive_month', side_effect=archive_then_insert):
+            self.assertIsNone(rotate_month(self.old_month, self.archive_dir))
+        self.assertEqual(month_logs(self.old_month).count(), 2)
+        self.assertFalse(ActivityLogDailyCount.objects.exists())
+        self.assertEqual(list(self.archive_dir.iterdir()), [])
+
+
+class LogActivityTests(TestCase):
+    def setUp(self):
+        writer = mock.patch.object(activity_log_service.activity_log_writer, 'put')
+        self.put = writer.start()
+        self.addCleanup(writer.stop)
+
+    def test_queued_when_the_transaction_commits(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            activity_log_service.log_activity(action='USER_LOGIN', description='Logged in')
+            self.put.assert_not_called()
+        [entry], _ = self.put.call_args
+        self.assertEqual(entry.action, 'USER_LOGIN')
+
+    def test_rolled_back_actions_are_not_logged(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                activity_log_service.log_activity(action='USER_LOGIN', description='Logged in')
+                transaction.set_rollback(True)
+        self.assertEqual(callbacks, [])
+        self.put.assert_not_called()
+
+
+class RequestViewWriterTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='admin', email='admin@example.com', password=None, role='ADMIN')
+        location = Location.objects.get_or_create_for_address(
+            address_line1='Hospital', police_station='Dhanmondi', city='Dhaka', state='Dhaka',
+            postal_code='1205', latitude=23.75, longitude=90.37,
+        )
+        self.request = BloodRequest.objects.create(
+            requester_type='RECEIVER', requested_by=user, patient_name='Patient', patient_age=40,
+            blood_group='A+', units_required=1, reason='Surgery', location=location,
+            required_by_date=timezone.now() + timedelta(days=10),
+        )
+        refresher = mock.patch.object(request_view_service.view_statistics_refresher, 'put')
+        self.refreshed = refresher.start()
+        self.addCleanup(refresher.stop)
+
+    def view(self, session_key):
+        return BloodRequestView(blood_request=self.request, session_key=session_key)
+
+    def sketch(self):
+        return RequestViewSketch.objects.get(blood_request=self.request, date=timezone.localdate())
+
+    def test_views_rejected_as_duplicates_are_not_counted(self):
+        write_request_views([self.view('a')])
+        # 'a' is already stored; the second 'b' repeats the first.
+        write_request_views([self.view('a'), self.view('b'), self.view('b')])
+
+        self.assertEqual(BloodRequestView.objects.count(), 2)
+        sketch = self.sketch()
+        self.assertEqual(sketch.total_views, 2)
+        self.assertEqual(sketch.get_sketch().count(), 2)
+        overall = RequestViewSketch.objects.get(blood_request__isnull=True, date=timezone.localdate())
+        self.assertEqual(overall.total_views, 2)
+
+    def test_refreshes_the_day_views_fall_on(self):
+        before_midnight = timezone.make_aware(datetime.combine(timezone.localdate(), time.min)) - timedelta(seconds=1)
+        with mock.patch('django.utils.timezone.now', return_value=before_midnight):
+            write_request_views([self.view('late')])
+        write_request_views([self.view('early')])
+
+        yesterday = timezone.localdate() - timedelta(days=1)
+        self.assertEqual(self.refreshed.call_args_list, [mock.call(yesterday), mock.call(timezone.localdate())])
+
+
+STATISTICS_FIELDS = (
+    'total_donations', 'total_requests', 'fulfilled_requests', 'new_donors',
+    'donations_by_group', 'requests_by_group',
+)
+
+
+class StatisticsDeltaTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='donor', email='donor@example.com', password=None, role='DONOR')
+        self.location = Location.objects.get_or_create_for_address(
+            address_line1='Hospital', police_station='Dhanmondi', city='Dhaka', state='Dhaka', postal_code='1205',
+            latitude=23.75, longitude=90.37,
+        )
+        self.donor = DonorProfile.objects.create(user=self.user, blood_group='A+', gender='M')
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+
+    def at_noon(self, day):
+        return timezone.make_aware(datetime.combine(day, time(12)))
+
+    def assertMatchesRecount(self, day):
+        stats = DonationStatistics.objects.filter(date=day).values(*STATISTICS_FIELDS).first()
+        recount = generate_daily_statistics(day)
+        self.assertEqual(stats, {field: getattr(recount, field) for field in STATISTICS_FIELDS}, day)
+
+    def test_donation_changes_move_between_days(self):
+        kept = DonationRecord.objects.create(
+            donor=self.donor, donation_date=self.at_noon(self.today), blood_group='A+', status='COMPLETED',
+        )
+        moved = DonationRecord.objects.create(donor=self.donor, donation_date=self.at_noon(self.today), blood_group='O-')
+        moved.status = 'COMPLETED'
+        moved.save()
+        moved.donation_date = self.at_noon(self.yesterday)
+        moved.save()
+        DonationRecord.objects.create(
+            donor=self.donor, donation_date=self.at_noon(self.today), blood_group='B+', status='COMPLETED',
+        ).delete()
+
+        self.assertEqual(DonationStatistics.objects.get(date=self.today).donations_by_group, {'A+': 1})
+        self.assertEqual(DonationStatistics.objects.get(date=self.yesterday).donations_by_group, {'O-': 1})
+        self.assertMatchesRecount(self.today)
+        self.assertMatchesRecount(self.yesterday)
+        kept.delete()
+        self.assertMatchesRecount(self.today)
+
+    def test_request_fulfilment_and_deletion(self):
+        requests = [
+            BloodRequest.objects.create(
+                requester_type='RECEIVER', requested_by=self.user, patient_name='Patient', patient_age=40,
+                blood_group=group, units_required=1, reason='Surgery', location=self.location,
+                required_by_date=timezone.now() + timedelta(days=10),
+            )
+            for group in ('A+', 'A+', 'AB-')
+        ]
+        requests[0].status = 'FULFILLED'
+        requests[0].save()
+        requests[2].delete()
+
+        stats = DonationStatistics.objects.get(date=self.today)
+        self.assertEqual((stats.total_requests, stats.fulfilled_requests), (2, 1))
+        self.assertEqual(stats.requests_by_group, {'A+': 2})
+        self.assertMatchesRecount(self.today)
+
+
+class NearbyCursorTests(TestCase):
+    def setUp(self):
+        self.receiver = User.objects.create_user(
+            username='receiver', email='receiver@example.com', password=None, role='RECEIVER',
+        )
+        ReceiverProfile.objects.create(user=self.receiver, age=30, location=self.place('Home', 0))
+        recorder = mock.patch('analytics.views_nearby.record_nearest_distances')
+        self.recorded = recorder.start()
+        self.addCleanup(recorder.stop)
+
+    def place(self, name, km_north):
+        return Location.objects.get_or_create_for_address(
+            address_line1=name, police_station='Dhanmondi', city='Dhaka', state='Dhaka',
+            postal_code='1205', latitude=round(23.75 + km_north / 111.2, 6), longitude=90.37,
+        )
+
+    def donor(self, name, km_north):
+        user = User.objects.create_user(username=name, email=f'{name}@example.com', password=None, role='DONOR')
+        return DonorProfile.objects.create(user=user, blood_group='A+', gender='F', location=self.place(name, km_north))
+
+    def get(self, **params):
+        client = APIClient()
+        client.force_authenticate(self.receiver)
+        response = client.get('/api/nearby/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_pages_cover_every_entity_once_in_order(self):
+        for i, km in enumerate([1, 2, 2, 4, 6]):
+            self.donor(f'donor{i}', km)
+        # A blood bank at the same distance as two donors is ordered after them.
+        BloodBank.objects.create(name='Bank', location=self.place('donor1', 2), storage_capacity=100)
+        expected = [(entity['type'], entity['id']) for entity in self.get(k=50)['nearby']]
+        self.assertEqual(len(expected), 6)
+
+        seen, cursor = [], None
+        while True:
+            page = self.get(k=2, **({'cursor': cursor} if cursor else {}))
+            seen.extend((entity['type'], entity['id']) for entity in page['nearby'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(seen, expected)
+        self.assertEqual([label for label, _ in expected[1:4]], ['Donor', 'Donor', 'Blood Bank'])
+
+    def test_only_the_first_page_records_distances(self):
+        self.donor('near', 1)
+        self.donor('far', 3)
+        first = self.get(k=1)
+        self.get(k=1, cursor=first['next_cursor'])
+        self.assertEqual(self.recorded.call_count, 1)
+
+    def test_blood_group_keeps_banks_with_stock_once(self):
+        stocked = BloodBank.objects.create(name='Stocked', location=self.place('stocked', 1), storage_capacity=100)
+        empty = BloodBank.objects.create(name='Empty', location=self.place('empty', 2), storage_capacity=100)
+        BloodInventory.objects.create(blood_bank=stocked, blood_group='A+', units_available=4)
+        BloodInventory.objects.create(blood_bank=stocked, blood_group='O-', units_available=2)
+        BloodInventory.objects.create(blood_bank=empty, blood_group='A+', units_available=0)
+        nearby = self.get(types='bloodbank', blood_group='A+')['nearby']
+        self.assertEqual([entity['id'] for entity in nearby], [stocked.id])
+
+    def test_invalid_cursor(self):
+        client = APIClient()
+        client.force_authenticate(self.receiver)
+        self.assertEqual(client.get('/api/nearby/', {'cursor': 'not-a-cursor'}).status_code, 400)
+
+
+@skipUnless(connection.vendor == 'postgresql', "declarative partitioning needs PostgreSQL")
+class ActivityLogPartitionTests(TestCase):
+    def test_migration_partitions_the_table(self):
+        self.assertTrue(partitioning.is_partitioned(connection))
+        this_month = partitioning.month_start(timezone.localdate())
+        self.assertIn(this_month, partitioning.monthly_partitions(connection))
+
+    def test_rotation_drops_the_partition(self):
+        old_month, old_day = months_ago(14)
+        old = create_log(old_day)
+        partitioning.ensure_partitions(connection, months_ahead=0, since=old_month)
+        self.assertIn(old_month, partitioning.monthly_partitions(connection))
+        self.assertTrue(ActivityLog.objects.filter(id=old.id).exists())
 
-# Create your tests here.
+        with tempfile.TemporaryDirectory() as archive_dir:
+            path, entries = rotate_month(old_month, archive_dir)
+            self.assertEqual([row['id'] for row in read_archive(path)], [old.id])
+        self.assertEqual(entries, 1)
+        self.assertNotIn(old_month, partitioning.monthly_partitions(connection))
+        self.assertFalse(ActivityLog.objects.filter(id=old.id).exists())
@@ -11,8 +11,12 @@ from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
 from django.db.models.functions import TruncDate
+from django.utils.dateparse import parse_date
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
+from .services.request_view_service import view_summary
+from common.pagination import EstimatedCountOrCursorPagination
 
 
 class DonationStatisticsListCreateView(generics.ListCreateAPIView):
@@ -26,47 +30,43 @@ class DonationStatisticsListCreateView(generics.ListCreateAPIView):
 class ActivityLogListCreateView(generics.ListCreateAPIView):
     serializer_class = ActivityLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = EstimatedCountOrCursorPagination
 
     def get_queryset(self):
         if not self.request.user.is_superuser and not self.request.user.role == 'ADMIN':
-            if self.request.activity_log == 'ALL':
-                return ActivityLog.objects.all().order_by('-created_at')
-            elif self.request.activity_log == 'USER_USER_LOGOUTS' or self.request.activity_log == 'USER_LOGOUTS':
-                return ActivityLog.objects.filter(user=self.request.user).order_by('-created_at')
-
-            return ActivityLog.objects.filter(user=self.request.user).order_by('-created_at')
-        return ActivityLog.objects.all().order_by('-created_at')
+            return ActivityLog.objects.with_details().filter(user=self.request.user).order_by('-created_at', '-id')
+        return ActivityLog.objects.with_details().order_by('-created_at', '-id')
 
 
 class BloodRequestViewListCreateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        seven_days_ago = timezone.now() - timedelta(days=7)
-        
-        daily_stats = (
-            BloodRequestView.objects
-            .filter(viewed_at__gte=seven_days_ago)
-            .annotate(date=TruncDate('viewed_at'))
-            .values('date')
-            .annotate(
-                total_views=Count('id'),
-                unique_viewers=Count('viewer', distinct=True) + 
-                              Count('session_key', distinct=True, filter=Q(viewer__isnull=True))
-            )
-            .order_by('date')
-        )
-        
-        results = [
-            {
-                'date': stat['date'].strftime('%Y-%m-%d'),
-                'total_views': stat['total_views'],
-                'unique_viewers': stat['unique_viewers']
-            }
-            for stat in daily_stats
-        ]
-        
-        return Response({'results': results})
+        # Read from the daily HyperLogLog sketches, so the cost grows with the
+        # number of days, not views. ?start=/?end= (YYYY-MM-DD) default to the
+        # last 7 days; ?blood_request=<id> narrows to one request.
+        end = self.get_date('end') or timezone.localdate()
+        start = self.get_date('start') or end - timedelta(days=7)
+        if start > end:
+            raise ValidationError({'start': "start must not be after end."})
+
+        blood_request = request.query_params.get('blood_request')
+        if blood_request is not None and not blood_request.isdigit():
+            raise ValidationError({'blood_request': "Must be a blood request id."})
+
+        return Response(view_summary(start, end, int(blood_request) if blood_request else None))
+
+    def get_date(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: "Use the YYYY-MM-DD format."})
+        return parsed
 
 
 class RequestViewStatisticsListCreateView(generics.ListCreateAPIView):
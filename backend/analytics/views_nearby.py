@@ -1,79 +1,163 @@
+import heapq
+from django.db.models import Exists, OuterRef, Q
 from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from donors.models import DonorProfile
 from accounts.models import HospitalProfile
-from bloodbanks.models import BloodBank
-from common.utils.distance import calculate_distance
-from analytics.models import DistanceRecord
+from bloodbanks.models import BloodBank, BloodInventory
+from common.views import NearbySearchMixin
+from locations.models import within_radius
+from analytics.services.distance_record_service import record_nearest_distances
 
-class NearbyEntitiesView(generics.GenericAPIView):
+BLOOD_GROUPS = [group for group, _ in DonorProfile.BLOOD_GROUP_CHOICES]
+
+
+class NearbyEntitiesView(NearbySearchMixin, generics.GenericAPIView):
+    """Nearest donors, hospitals and blood banks around the receiver, one page at a time.
+
+    Query parameters: `k` (page size), `radius_km`, `types` (comma separated
+    donor/hospital/bloodbank), `blood_group` and the `cursor` returned as
+    `next_cursor` by the previous page. `location_approximate` marks entities
+    placed at a gazetteer centroid, whose distance is only a rough one.
+    """
     permission_classes = [permissions.IsAuthenticated]
 
+    # types value -> (label in the response, tie-break rank when distances are equal)
+    ENTITY_TYPES = {
+        'donor': ('Donor', 0),
+        'hospital': ('Hospital', 1),
+        'bloodbank': ('Blood Bank', 2),
+    }
+
+    def get_types(self):
+        value = self.request.query_params.get('types')
+        if not value:
+            return list(self.ENTITY_TYPES)
+        types = [t.strip().lower().replace('_', '').replace(' ', '') for t in value.split(',') if t.strip()]
+        if not types or any(t not in self.ENTITY_TYPES for t in types):
+            raise ValidationError({"types": f"Choose from: {', '.join(self.ENTITY_TYPES)}."})
+        return types
+
+    def get_blood_group(self):
+        value = self.request.query_params.get('blood_group')
+        if not value:
+            return None
+        # An unencoded '+' arrives as a space.
+        value = value.upper().replace(' ', '+')
+        if value not in BLOOD_GROUPS:
+            raise ValidationError({"blood_group": f"Choose from: {', '.join(BLOOD_GROUPS)}."})
+        return value
+
+    def get_entity_queryset(self, entity_type, blood_group):
+        if entity_type == 'donor':
+            queryset = DonorProfile.objects.select_related('user', 'location')
+            if blood_group:
+                queryset = queryset.filter(blood_group=blood_group)
+        elif entity_type == 'hospital':
+            queryset = HospitalProfile.objects.select_related('location')
+        else:
+            queryset = BloodBank.objects.select_related('location')
+            if blood_group:
+                # A semi-join, so a bank is never returned once per inventory row.
+                queryset = queryset.filter(Exists(BloodInventory.objects.filter(
+                    blood_bank=OuterRef('pk'), blood_group=blood_group, units_available__gt=0,
+                )))
+        return queryset
+
+    def after_cursor(self, queryset, rank, cursor):
+        if cursor is None:
+            return queryset
+        distance, last_rank, last_id = cursor
+        after = Q(distance_km__gt=distance)
+        if rank > last_rank:
+            after |= Q(distance_km=distance)
+        elif rank == last_rank:
+            after |= Q(distance_km=distance, pk__gt=last_id)
+        return queryset.filter(after)
+
+    def serialize_entity(self, entity_type, entity):
+        label, _ = self.ENTITY_TYPES[entity_type]
+        if entity_type == 'donor':
+            return {
+                "type": label,
+                "id": entity.id,
+                "name": entity.user.get_full_name(),
+                "blood_group": entity.blood_group,
+                "distance_km": entity.distance_km,
+                "location_approximate": entity.location.coordinates_approximate,
+            }
+        return {
+            "type": label,
+            "id": entity.id,
+            "name": entity.hospital_name if entity_type == 'hospital' else entity.name,
+            "distance_km": entity.distance_km,
+            "location_approximate": entity.location.coordinates_approximate,
+        }
+
     def get(self, request):
         user = request.user
         if not hasattr(user, 'receiver_profile'):
             return Response({"error": "Only receivers can access this endpoint."}, status=400)
 
         receiver_loc = user.receiver_profile.location
+        if not receiver_loc or receiver_loc.latitude is None or receiver_loc.longitude is None:
+            return Response({"error": "Your location has no coordinates yet."}, status=400)
+
         receiver_lat = receiver_loc.latitude
         receiver_lon = receiver_loc.longitude
+        radius_km = self.get_radius_km()
+        k = self.get_limit()
+        types = self.get_types()
+        blood_group = self.get_blood_group()
+        cursor = self.get_cursor()
 
-        # Collect nearby donors
-        donors = [
-            {
-                "type": "Donor",
-                "id": donor.id,
-                "name": donor.user.get_full_name(),
-                "blood_group": donor.blood_group,
-                "distance_km": calculate_distance(receiver_lat, receiver_lon, donor.location.latitude, donor.location.longitude)
-            }
-            for donor in DonorProfile.objects.select_related('user', 'location')
-        ]
-
-        # Collect nearby hospitals
-        hospitals = [
-            {
-                "type": "Hospital",
-                "id": hospital.id,
-                "name": hospital.hospital_name,
-                "distance_km": calculate_distance(receiver_lat, receiver_lon, hospital.location.latitude, hospital.location.longitude)
-            }
-            for hospital in HospitalProfile.objects.select_related('location')
-        ]
-
-        # Collect nearby blood banks
-        banks = [
-            {
-                "type": "Blood Bank",
-                "id": bank.id,
-                "name": bank.name,
-                "distance_km": calculate_distance(receiver_lat, receiver_lon, bank.location.latitude, bank.location.longitude)
-            }
-            for bank in BloodBank.objects.select_related('location')
-        ]
-
-        # Combine all
-        combined = donors + hospitals + banks
-        combined = sorted(combined, key=lambda x: x['distance_km'])
-
-        # Store nearest distances
-        if combined:
-            nearest_donor = next((d for d in combined if d["type"] == "Donor"), None)
-            nearest_hospital = next((h for h in combined if h["type"] == "Hospital"), None)
-            nearest_bank = next((b for b in combined if b["type"] == "Blood Bank"), None)
-
-            DistanceRecord.objects.create(
-                receiver=user,
-                donor=nearest_donor and DonorProfile.objects.get(id=nearest_donor["id"]).user,
-                hospital=nearest_hospital and HospitalProfile.objects.get(id=nearest_hospital["id"]).user,
-                blood_bank=nearest_bank and BloodBank.objects.get(id=nearest_bank["id"]),
-                receiver_to_donor_km=nearest_donor and nearest_donor["distance_km"],
-                receiver_to_hospital_km=nearest_hospital and nearest_hospital["distance_km"],
-                receiver_to_bloodbank_km=nearest_bank and nearest_bank["distance_km"],
+        # Each type is fetched nearest-first by an indexed query. No type can
+        # contribute more than k rows to this page; one extra row tells us
+        # whether another page exists.
+        candidates = []
+        nearest = {}
+        for entity_type in types:
+            _, rank = self.ENTITY_TYPES[entity_type]
+            queryset = within_radius(
+                self.get_entity_queryset(entity_type, blood_group),
+                receiver_lat, receiver_lon, radius_km, prefix='location__',
+            )
+            entities = list(self.after_cursor(queryset, rank, cursor)[:k + 1])
+            if entities:
+                nearest[entity_type] = entities[0]
+            candidates.extend((e.distance_km, rank, e.pk, entity_type, e) for e in entities)
+
+        page = heapq.nsmallest(k, candidates, key=lambda c: c[:3])
+        combined = [self.serialize_entity(entity_type, entity) for *_, entity_type, entity in page]
+
+        next_cursor = None
+        if len(candidates) > k:
+            distance, rank, pk, *_ = page[-1]
+            next_cursor = self.encode_cursor(distance, rank, pk)
+
+        # Store nearest distances (buffered, deduplicated per receiver)
+        if cursor is None and nearest:
+            nearest_donor = nearest.get('donor')
+            nearest_hospital = nearest.get('hospital')
+            nearest_bank = nearest.get('bloodbank')
+
+            record_nearest_distances(
+                user.id,
+                donor=nearest_donor and (nearest_donor.user_id, nearest_donor.distance_km),
+                hospital=nearest_hospital and (nearest_hospital.user_id, nearest_hospital.distance_km),
+                blood_bank=nearest_bank and (nearest_bank.id, nearest_bank.distance_km),
             )
 
         return Response({
             "receiver": user.get_full_name(),
-            "location": {"latitude": receiver_lat, "longitude": receiver_lon},
-            "nearby": combined
+            "location": {
+                "latitude": receiver_lat,
+                "longitude": receiver_lon,
+                "approximate": receiver_loc.coordinates_approximate,
+            },
+            "radius_km": radius_km,
+            "k": k,
+            "nearby": combined,
+            "next_cursor": next_cursor,
         })
@@ -176,3 +176,68 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Nearby search
+# Default and maximum search radius (km) around the receiver's location.
+NEARBY_DEFAULT_RADIUS_KM = env.float("NEARBY_DEFAULT_RADIUS_KM", default=50)
+NEARBY_MAX_RADIUS_KM = env.float("NEARBY_MAX_RADIUS_KM", default=500)
+# Default and maximum number of results per nearby page.
+NEARBY_DEFAULT_K = env.int("NEARBY_DEFAULT_K", default=20)
+NEARBY_MAX_K = env.int("NEARBY_MAX_K", default=100)
+
+# Buffered background writes (distance records, ...)
+# Set BUFFERED_WRITES_ENABLED=False to write synchronously, e.g. in tests.
+BUFFERED_WRITES_ENABLED = env.bool("BUFFERED_WRITES_ENABLED", default=True)
+BUFFERED_WRITES_BATCH_SIZE = env.int("BUFFERED_WRITES_BATCH_SIZE", default=500)
+BUFFERED_WRITES_FLUSH_SECONDS = env.float("BUFFERED_WRITES_FLUSH_SECONDS", default=2.0)
+# A receiver's nearest distances are recorded at most once per window.
+DISTANCE_RECORD_DEDUP_SECONDS = env.int("DISTANCE_RECORD_DEDUP_SECONDS", default=300)
+# Blood request views are buffered the same way; the daily view statistics
+# are recomputed at most once per interval rather than on every view.
+REQUEST_VIEW_STATS_INTERVAL_SECONDS = env.float("REQUEST_VIEW_STATS_INTERVAL_SECONDS", default=30)
+
+# Donor matching
+# Maximum age of the in-memory per-blood-group donor index.
+MATCHING_INDEX_TTL_SECONDS = env.int("MATCHING_INDEX_TTL_SECONDS", default=300)
+
+# Geocoding
+# Locations saved without coordinates are geocoded by a background worker;
+# set GEOCODING_ASYNC=False to geocode inline during save().
+GEOCODING_ASYNC = env.bool("GEOCODING_ASYNC", default=True)
+GEOCODING_DELAY_SECONDS = env.float("GEOCODING_DELAY_SECONDS", default=1.0)
+# Dotted path to a locations.geocoders.BaseGeocoder subclass, e.g.
+# locations.geocoders.NullGeocoder for tests and offline deployments.
+GEOCODER_BACKEND = env("GEOCODER_BACKEND", default="locations.geocoders.NominatimGeocoder")
+GEOCODER_USER_AGENT = env("GEOCODER_USER_AGENT", default="blood_management_system")
+GEOCODER_TIMEOUT_SECONDS = env.int("GEOCODER_TIMEOUT_SECONDS", default=10)
+
+# Geocoder answers are cached per normalized address variant; "not found"
+# answers expire sooner so newly mapped addresses get picked up.
+GEOCODE_CACHE_TTL_DAYS = env.int("GEOCODE_CACHE_TTL_DAYS", default=180)
+GEOCODE_CACHE_NEGATIVE_TTL_DAYS = env.int("GEOCODE_CACHE_NEGATIVE_TTL_DAYS", default=7)
+# Fall back to the bundled Bangladesh gazetteer (police station, district
+# and division centroids) when the geocoder finds nothing or is unreachable.
+GEOCODER_GAZETTEER_FALLBACK = env.bool("GEOCODER_GAZETTEER_FALLBACK", default=True)
+
+# Caching
+# Per-process memory by default; set CACHE_URL (e.g. redis://127.0.0.1:6379/1)
+# so every worker shares cached data such as the inventory snapshot.
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+# The inventory snapshot is patched on every inventory save; the TTL bounds
+# staleness from writes that bypass save() (bulk updates, location edits).
+INVENTORY_SNAPSHOT_TTL_SECONDS = env.int("INVENTORY_SNAPSHOT_TTL_SECONDS", default=3600)
+
+# Activity log retention
+# rotate_activity_logs keeps this many months of raw activity logs (the
+# current month included); older months are rolled up into daily counts,
+# archived as gzipped NDJSON under ACTIVITY_LOG_ARCHIVE_DIR and dropped.
+ACTIVITY_LOG_RETENTION_MONTHS = env.int("ACTIVITY_LOG_RETENTION_MONTHS", default=12)
+ACTIVITY_LOG_ARCHIVE_DIR = env("ACTIVITY_LOG_ARCHIVE_DIR", default=str(BASE_DIR / "archive" / "activity_logs"))
+# Monthly partitions (PostgreSQL only) are created this many months ahead.
+ACTIVITY_LOG_PARTITIONS_AHEAD = env.int("ACTIVITY_LOG_PARTITIONS_AHEAD", default=3)
+
+# Pagination
+# Paginated lists of large tables (activity logs, users) report the query
+# planner's row estimate as `count` once the table, and any filter on it,
+# reaches this many rows, instead of running COUNT(*) (PostgreSQL only).
+ESTIMATED_COUNT_THRESHOLD = env.int("ESTIMATED_COUNT_THRESHOLD", default=100000)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BloodbanksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bloodbanks'
+
+    def ready(self):
+        import bloodbanks.signals
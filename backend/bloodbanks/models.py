@@ -3,6 +3,18 @@ from accounts.models import User
 from locations.models import Location
 
 
+class BloodBankQuerySet(models.QuerySet):
+    def with_details(self):
+        """Load every relation BloodBankSerializer renders, inventory included."""
+        return self.select_related(
+            'location', 'managed_by__created_by', 'verified_by__created_by',
+        ).prefetch_related('inventory')
+
+    def with_inventory_summary(self):
+        """Only what BloodBankSummarySerializer needs: no user rows at all."""
+        return self.select_related('location').prefetch_related('inventory')
+
+
 class BloodBank(models.Model):
     name = models.CharField(max_length=255, blank=True)
     registration_number = models.CharField(max_length=100, unique=True, blank=True, null=True)
@@ -20,6 +32,8 @@ class BloodBank(models.Model):
     license_document = models.FileField(upload_to='blood_bank_licenses/', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BloodBankQuerySet.as_manager()
     
     class Meta:
         db_table = 'blood_banks'
@@ -33,11 +47,57 @@ class BloodBank(models.Model):
         return "No Location"
     
     def get_total_units(self):
+        if 'inventory' in getattr(self, '_prefetched_objects_cache', {}):
+            return sum(item.units_available for item in self.inventory.all())
         return self.inventory.aggregate(
             total=models.Sum('units_available')
         )['total'] or 0
 
 
+class BloodInventoryQuerySet(models.QuerySet):
+    def group_totals(self):
+        """Units available/reserved per blood group, from a single GROUP BY."""
+        return list(
+            self.order_by()
+            .values('blood_group')
+            .annotate(total_available=models.Sum('units_available'), total_reserved=models.Sum('units_reserved'))
+            .order_by('blood_group')
+        )
+
+    def bank_group_matrix(self):
+        """Units available per bank (rows) and blood group (columns) in one query.
+
+        Uses conditional aggregation, so every bank is one row no matter how
+        many groups it stocks; groups a bank doesn't stock come back as 0.
+        """
+        groups = [group for group, _ in BloodInventory.BLOOD_GROUP_CHOICES]
+        columns = {f'group_{i}': group for i, group in enumerate(groups)}
+        rows = (
+            self.order_by()
+            .values('blood_bank_id', 'blood_bank__name', 'blood_bank__location__city')
+            .annotate(
+                total_available=models.Sum('units_available'),
+                total_reserved=models.Sum('units_reserved'),
+                **{
+                    alias: models.Sum('units_available', filter=models.Q(blood_group=group), default=0)
+                    for alias, group in columns.items()
+                },
+            )
+            .order_by('blood_bank_id')
+        )
+        return groups, [
+            {
+                'blood_bank': row['blood_bank_id'],
+                'name': row['blood_bank__name'],
+                'city': row['blood_bank__location__city'],
+                'units': {group: row[alias] for alias, group in columns.items()},
+                'total_available': row['total_available'],
+                'total_reserved': row['total_reserved'],
+            }
+            for row in rows
+        ]
+
+
 class BloodInventory(models.Model):
     BLOOD_GROUP_CHOICES = (
         ('A+', 'A+'),
@@ -57,6 +117,8 @@ class BloodInventory(models.Model):
     minimum_threshold = models.PositiveIntegerField(default=10, help_text="Alert when units fall below this number")
     critical_threshold = models.PositiveIntegerField(default=5, help_text="Critical alert threshold")
     last_updated = models.DateTimeField(auto_now=True)
+
+    objects = BloodInventoryQuerySet.as_manager()
     
     class Meta:
         db_table = 'blood_inventory'
@@ -73,3 +135,13 @@ class BloodInventory(models.Model):
     
     def is_critical_stock(self):
         return self.units_available < self.critical_threshold
+
+    def stock_status(self):
+        if self.is_critical_stock():
+            return "critical"
+        elif self.is_low_stock():
+            return "low"
+        elif self.units_available < 50:
+            return "normal"
+        else:
+            return "full"
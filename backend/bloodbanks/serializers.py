@@ -3,7 +3,7 @@ from bloodbanks.models import BloodBank, BloodInventory
 from locations.models import Location
 from accounts.models import User
 from locations.serializers import LocationSerializer
-from accounts.serializers import UserSerializer
+from accounts.serializers import UserLocationListSerializer, UserSerializer
 from locations.serializers import LocationSerializer
 import os
 
@@ -15,14 +15,7 @@ class BloodInventorySerializer(serializers.ModelSerializer):
         read_only_fields = ['blood_bank'] 
 
     def get_status(self, obj):
-        if obj.units_available < obj.critical_threshold:
-            return "critical"
-        elif obj.units_available < obj.minimum_threshold:
-            return "low"
-        elif obj.units_available < 50:
-            return "normal"
-        else:
-            return "full"
+        return obj.stock_status()
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -41,6 +34,18 @@ class BloodInventorySerializer(serializers.ModelSerializer):
         return inventory
 
 
+class BloodInventorySummarySerializer(serializers.ModelSerializer):
+    status = serializers.CharField(source='stock_status', read_only=True)
+
+    class Meta:
+        model = BloodInventory
+        fields = ['blood_group', 'units_available', 'status']
+
+
+class BloodBankListSerializer(UserLocationListSerializer):
+    user_paths = (('managed_by',), ('verified_by',))
+
+
 class BloodBankSerializer(serializers.ModelSerializer):
     location = LocationSerializer(required=False, allow_null=True)
     managed_by = UserSerializer(read_only=True)
@@ -51,6 +56,7 @@ class BloodBankSerializer(serializers.ModelSerializer):
     class Meta:
         model = BloodBank
         fields = '__all__'
+        list_serializer_class = BloodBankListSerializer
 
     def get_city_country(self, obj):
         return obj.city_country()
@@ -70,7 +76,7 @@ class BloodBankSerializer(serializers.ModelSerializer):
         location_data = validated_data.pop("location", None)
         location = None
         if location_data:
-            location = Location.objects.create(**location_data)
+            location = Location.objects.get_or_create_for_address(**location_data)
 
         bank, created = BloodBank.objects.update_or_create(
             managed_by=user,
@@ -83,12 +89,7 @@ class BloodBankSerializer(serializers.ModelSerializer):
         managed_by_data = self.context['request'].data.get('managed_by')
 
         if location_data:
-            if instance.location:
-                for attr, value in location_data.items():
-                    setattr(instance.location, attr, value)
-                instance.location.save()
-            else:
-                instance.location = Location.objects.create(**location_data)
+            instance.location = Location.objects.replace_address(instance.location, location_data)
 
         if managed_by_data:
             user = instance.managed_by
@@ -101,3 +102,18 @@ class BloodBankSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
         return instance
+
+
+class BloodBankSummarySerializer(serializers.ModelSerializer):
+    """Public listing: contact details and stock levels, no nested users."""
+    location = LocationSerializer(read_only=True)
+    city_country = serializers.CharField(read_only=True)
+    inventory = BloodInventorySummarySerializer(many=True, read_only=True)
+    total_units = serializers.IntegerField(source='get_total_units', read_only=True)
+
+    class Meta:
+        model = BloodBank
+        fields = [
+            'id', 'name', 'location', 'city_country', 'contact_person', 'contact_number',
+            'email', 'operating_hours', 'is_active', 'is_verified', 'inventory', 'total_units',
+        ]
@@ -0,0 +1,183 @@
+"""National blood stock snapshot, kept in the Django cache.
+
+The snapshot holds units per blood group, bank and city plus low/critical
+stock counts. It is built from one query and afterwards patched row by
+row: when an inventory row is saved or deleted, its old contribution
+(remembered in the snapshot) is subtracted and the current one added, so
+readers never touch the inventory table. Writes that bypass save()
+(bulk updates, location edits) are picked up when the snapshot expires
+after INVENTORY_SNAPSHOT_TTL_SECONDS.
+"""
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from bloodbanks.models import BloodInventory
+
+SNAPSHOT_KEY = 'bloodbanks:inventory-snapshot'
+LOCK_KEY = f'{SNAPSHOT_KEY}:lock'
+BLOOD_GROUPS = [group for group, _ in BloodInventory.BLOOD_GROUP_CHOICES]
+
+ROW_FIELDS = (
+    'id', 'blood_bank_id', 'blood_bank__name', 'blood_bank__location__city', 'blood_group',
+    'units_available', 'units_reserved', 'minimum_threshold', 'critical_threshold',
+)
+
+
+class SnapshotLockTimeout(Exception):
+    pass
+
+
+def get_snapshot():
+    """The current snapshot, rebuilding it if it is missing or expired."""
+    snapshot = cache.get(SNAPSHOT_KEY)
+    if snapshot is None:
+        snapshot = rebuild_snapshot()
+    return snapshot
+
+
+def public_snapshot(snapshot):
+    """The snapshot without the per-row bookkeeping used for deltas."""
+    return {key: value for key, value in snapshot.items() if key != 'rows'}
+
+
+def rebuild_snapshot():
+    """Build and cache the snapshot, unless another process cached one meanwhile.
+
+    The build runs under the lock: a write committing during it waits in
+    refresh_rows() and then patches the new snapshot, instead of finding
+    none, doing nothing and leaving the pre-commit build cached.
+    """
+    try:
+        with _locked():
+            snapshot = cache.get(SNAPSHOT_KEY)
+            if snapshot is None:
+                snapshot = build_snapshot()
+                cache.set(SNAPSHOT_KEY, snapshot, settings.INVENTORY_SNAPSHOT_TTL_SECONDS)
+            return snapshot
+    except SnapshotLockTimeout:
+        # A long rebuild elsewhere; answer from the database, uncached.
+        return build_snapshot()
+
+
+def build_snapshot():
+    snapshot = _empty_snapshot()
+    for values in BloodInventory.objects.order_by().values_list(*ROW_FIELDS).iterator(chunk_size=2000):
+        row = _row(values)
+        snapshot['rows'][values[0]] = row
+        _apply(snapshot, row, 1)
+    return snapshot
+
+
+def refresh_rows(inventory_ids):
+    """Patch the cached snapshot with the current state of these inventory rows.
+
+    Deleted rows are dropped. Does nothing if there is no cached snapshot;
+    the next read builds a fresh one anyway.
+    """
+    try:
+        with _locked():
+            snapshot = cache.get(SNAPSHOT_KEY)
+            if snapshot is None:
+                return
+            current = {
+                values[0]: _row(values)
+                for values in BloodInventory.objects.filter(id__in=inventory_ids).values_list(*ROW_FIELDS)
+            }
+            for inventory_id in inventory_ids:
+                old = snapshot['rows'].pop(inventory_id, None)
+                if old is not None:
+                    _apply(snapshot, old, -1)
+                new = current.get(inventory_id)
+                if new is not None:
+                    snapshot['rows'][inventory_id] = new
+                    _apply(snapshot, new, 1)
+            snapshot['updated_at'] = timezone.now().isoformat()
+            cache.set(SNAPSHOT_KEY, snapshot, settings.INVENTORY_SNAPSHOT_TTL_SECONDS)
+    except SnapshotLockTimeout:
+        # Someone else is stuck mid-update; a rebuild is always correct.
+        cache.delete(SNAPSHOT_KEY)
+
+
+def invalidate_snapshot():
+    # Wait for a rebuild in progress, which would otherwise cache data
+    # from before this change right after the delete.
+    try:
+        with _locked():
+            cache.delete(SNAPSHOT_KEY)
+    except SnapshotLockTimeout:
+        cache.delete(SNAPSHOT_KEY)
+
+
+@contextmanager
+def _locked(timeout=2.0):
+    # cache.add() is atomic on every backend, which makes it a usable
+    # cross-process mutex around the read-modify-write below.
+    deadline = time.monotonic() + timeout
+    while not cache.add(LOCK_KEY, 1, timeout=10):
+        if time.monotonic() > deadline:
+            raise SnapshotLockTimeout()
+        time.sleep(0.01)
+    try:
+        yield
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def _row(values):
+    _, bank, name, city, group, available, reserved, minimum, critical = values
+    if available < critical:
+        status = 'critical'
+    elif available < minimum:
+        status = 'low'
+    else:
+        status = None
+    return {
+        'bank': bank, 'name': name, 'city': city or '', 'group': group,
+        'available': available, 'reserved': reserved, 'status': status,
+    }
+
+
+def _totals():
+    return {'available': 0, 'reserved': 0, 'low': 0, 'critical': 0}
+
+
+def _empty_snapshot():
+    now = timezone.now().isoformat()
+    return {
+        'generated_at': now,
+        'updated_at': now,
+        'totals': _totals(),
+        'by_group': {group: _totals() for group in BLOOD_GROUPS},
+        'by_bank': {},
+        'by_city': {},
+        'rows': {},
+    }
+
+
+def _add(totals, row, sign):
+    totals['available'] += sign * row['available']
+    totals['reserved'] += sign * row['reserved']
+    if row['status']:
+        totals[row['status']] += sign
+
+
+def _apply(snapshot, row, sign):
+    """Add (sign=1) or remove (sign=-1) one inventory row's contribution."""
+    _add(snapshot['totals'], row, sign)
+    _add(snapshot['by_group'].setdefault(row['group'], _totals()), row, sign)
+    for key, entries, extra in (
+        (row['bank'], snapshot['by_bank'], {'name': row['name'], 'city': row['city']}),
+        (row['city'], snapshot['by_city'], {}),
+    ):
+        entry = entries.setdefault(
+            key, {**extra, **_totals(), 'groups': dict.fromkeys(BLOOD_GROUPS, 0), 'inventory_rows': 0},
+        )
+        _add(entry, row, sign)
+        entry['groups'][row['group']] += sign * row['available']
+        entry['inventory_rows'] += sign
+        if entry['inventory_rows'] <= 0:
+            del entries[key]
@@ -0,0 +1,20 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bloodbanks.models import BloodBank, BloodInventory
+from bloodbanks.services.inventory_snapshot import invalidate_snapshot, refresh_rows
+
+
+@receiver([post_save, post_delete], sender=BloodInventory)
+def update_inventory_snapshot(sender, instance, **kwargs):
+    inventory_id = instance.pk
+    transaction.on_commit(lambda: refresh_rows([inventory_id]))
+
+
+@receiver([post_save, post_delete], sender=BloodBank)
+def reset_inventory_snapshot(sender, instance, created=False, **kwargs):
+    # A new bank has no stock yet; a renamed, moved or deleted one changes
+    # the per-bank and per-city sections, so rebuild on the next read.
+    if not created:
+        transaction.on_commit(invalidate_snapshot)
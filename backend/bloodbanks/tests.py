@@ -1,3 +1,79 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from bloodbanks.models import BloodBank, BloodInventory
+from bloodbanks.services import inventory_snapshot
+from bloodbanks.services.inventory_snapshot import LOCK_KEY, SNAPSHOT_KEY, build_snapshot, get_snapshot
+from locations.models import Location
+
+
+def make_bank(name, city):
+    location = Location.objects.get_or_create_for_address(
+        address_line1=f'{name} road', police_station='Kotwali', city=city, state=city,
+        postal_code='1000', latitude=23.7, longitude=90.4,
+    )
+    return BloodBank.objects.create(name=name, location=location, storage_capacity=500)
+
+
+class InventorySnapshotTests(TestCase):
+    def setUp(self):
+        cache.delete(SNAPSHOT_KEY)
+        cache.delete(LOCK_KEY)
+        self.dhaka = make_bank('Dhaka Central', 'Dhaka')
+        self.sylhet = make_bank('Sylhet General', 'Sylhet')
+
+    def save(self, inventory):
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.save()
+
+    def assertMatchesRebuild(self, snapshot):
+        fresh = build_snapshot()
+        for key in ('totals', 'by_group', 'by_bank', 'by_city', 'rows'):
+            self.assertEqual(snapshot[key], fresh[key], key)
+
+    def test_patched_snapshot_equals_a_rebuild(self):
+        a_pos = BloodInventory(blood_bank=self.dhaka, blood_group='A+', units_available=20)
+        self.save(a_pos)
+        get_snapshot()
+
+        o_neg = BloodInventory(blood_bank=self.sylhet, blood_group='O-', units_available=3)
+        self.save(o_neg)
+        a_pos.units_available = 8
+        a_pos.units_reserved = 2
+        self.save(a_pos)
+        with self.captureOnCommitCallbacks(execute=True):
+            o_neg.delete()
+
+        snapshot = cache.get(SNAPSHOT_KEY)
+        self.assertEqual(snapshot['totals'], {'available': 8, 'reserved': 2, 'low': 1, 'critical': 0})
+        self.assertNotIn('Sylhet', snapshot['by_city'])
+        self.assertMatchesRebuild(snapshot)
+
+    def test_rebuild_holds_the_lock(self):
+        # refresh_rows() takes the same lock, so a write committing during a
+        # rebuild is applied after it instead of being lost.
+        seen = []
+        original = inventory_snapshot.build_snapshot
+
+        def build():
+            seen.append(cache.get(LOCK_KEY))
+            return original()
+
+        with mock.patch.object(inventory_snapshot, 'build_snapshot', side_effect=build):
+            get_snapshot()
+        self.assertEqual(seen, [1])
+        self.assertIsNone(cache.get(LOCK_KEY))
+
+    def test_rebuild_keeps_a_snapshot_cached_while_waiting(self):
+        cached = build_snapshot()
+        cache.set(SNAPSHOT_KEY, cached)
+        self.assertEqual(inventory_snapshot.rebuild_snapshot(), cached)
+
+    def test_bank_change_invalidates(self):
+        get_snapshot()
+        self.dhaka.name = 'Dhaka Medical'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dhaka.save()
+        self.assertIsNone(cache.get(SNAPSHOT_KEY))
@@ -2,7 +2,8 @@ from django.urls import path
 from .views import (
     BloodBankListCreateView, BloodBankDetailView,
     BloodInventoryListCreateView, BloodInventoryDetailView,
-    CurrentBloodBankView, bloodBankListView, BloodInventoryListView
+    CurrentBloodBankView, bloodBankListView, BloodInventoryListView,
+    InventorySnapshotView
 )
 
 urlpatterns = [
@@ -13,4 +14,5 @@ urlpatterns = [
     path('bloodbanks/current/', CurrentBloodBankView.as_view(), name='current-bloodbank'),
     path('bloodbanks/all/', bloodBankListView.as_view(), name='all-bloodbank-list'),
     path('bloodbanks/inventory/', BloodInventoryListView.as_view(), name='inventory-list'),
+    path('bloodbanks/inventory/snapshot/', InventorySnapshotView.as_view(), name='inventory-snapshot'),
 ]
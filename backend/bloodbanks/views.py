@@ -2,11 +2,12 @@ from django.db.models import Sum, Q, Min
 from rest_framework import generics, permissions
 from rest_framework.response import Response
 from bloodbanks.models import BloodBank, BloodInventory
-from bloodbanks.serializers import BloodBankSerializer, BloodInventorySerializer
+from bloodbanks.serializers import BloodBankSerializer, BloodBankSummarySerializer, BloodInventorySerializer
 from rest_framework.exceptions import NotFound, PermissionDenied
 from analytics.signals import inventory_updated_signal
 from django.utils import timezone
-from analytics.models import ActivityLog
+from analytics.services.activity_log_service import log_activity
+from bloodbanks.services.inventory_snapshot import get_snapshot, public_snapshot
 
 
 
@@ -22,9 +23,9 @@ class BloodBankListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser or user.role == 'ADMIN':
-            return BloodBank.objects.all()
+            return BloodBank.objects.with_details()
         if user.role == 'BLOOD_BANK':
-            return BloodBank.objects.filter(managed_by=user)
+            return BloodBank.objects.with_details().filter(managed_by=user)
         return BloodBank.objects.none()
 
     def get_serializer_context(self):
@@ -34,7 +35,7 @@ class BloodBankListCreateView(generics.ListCreateAPIView):
 
 
 class BloodBankDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = BloodBank.objects.all()
+    queryset = BloodBank.objects.with_details()
     serializer_class = BloodBankSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -62,7 +63,7 @@ class BloodBankDetailView(generics.RetrieveUpdateDestroyAPIView):
         blood_bank = serializer.instance
         blood_bank_user = blood_bank.managed_by
 
-        ActivityLog.objects.create(
+        log_activity(
             user=user,
             action='BLOOD_BANK_VERIFIED' if is_verified else 'BLOOD_BANK_UNVERIFIED',
             description=f"Admin '{user.username}' has {'verified' if is_verified else 'unverified'} blood bank '{blood_bank_user.username}'.",
@@ -100,10 +101,23 @@ class CurrentBloodBankView(generics.RetrieveAPIView):
         return blood_bank
 
 class bloodBankListView(generics.ListAPIView):
-    queryset = BloodBank.objects.all()
+    queryset = BloodBank.objects.with_details()
     serializer_class = BloodBankSerializer
     permission_classes = [permissions.AllowAny]
 
+    def summary_requested(self):
+        # ?summary=true: name, location and per-group stock only.
+        return self.request.query_params.get('summary', '').lower() in ['true', '1', 'yes']
+
+    def get_queryset(self):
+        if self.summary_requested():
+            return BloodBank.objects.with_inventory_summary()
+        return super().get_queryset()
+
+    def get_serializer_class(self):
+        if self.summary_requested():
+            return BloodBankSummarySerializer
+        return super().get_serializer_class()
 
 
     def get_status(self, obj):
@@ -174,25 +188,28 @@ class BloodInventoryListView(generics.ListAPIView):
         queryset = self.get_queryset()
         response = super().list(request, *args, **kwargs)
 
-        total_available = queryset.aggregate(total=Sum('units_available'))['total'] or 0
-        total_reserved = queryset.aggregate(total=Sum('units_reserved'))['total'] or 0
-
-        group_totals = []
-        for group in queryset.values('blood_group').distinct():
-            group_records = queryset.filter(blood_group=group['blood_group'])
-            total_available_group = group_records.aggregate(Sum('units_available'))['units_available__sum'] or 0
-            total_reserved_group = group_records.aggregate(Sum('units_reserved'))['units_reserved__sum'] or 0
+        # One GROUP BY; the overall totals are the sum of the group rows.
+        group_totals = queryset.group_totals()
+        total_available = sum(group['total_available'] or 0 for group in group_totals)
+        total_reserved = sum(group['total_reserved'] or 0 for group in group_totals)
 
-            group_totals.append({
-                'blood_group': group['blood_group'],
-                'total_available': total_available_group,
-                'total_reserved': total_reserved_group,
-            })
-
-        return Response({
+        data = {
             "results": response.data,
             "total_available": total_available,
             "total_reserved": total_reserved,
             "total_units": total_available + total_reserved,
             "group_totals": group_totals,
-        })
\ No newline at end of file
+        }
+        # ?pivot=true adds units per bank x blood group for the whole country.
+        if request.query_params.get('pivot', '').lower() in ['true', '1', 'yes']:
+            blood_groups, rows = queryset.bank_group_matrix()
+            data["pivot"] = {"blood_groups": blood_groups, "rows": rows}
+        return Response(data)
+
+
+class InventorySnapshotView(generics.GenericAPIView):
+    """National stock by blood group, bank and city, served from the cache."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        return Response(public_snapshot(get_snapshot()))
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_hospitalprofile_verified_at_and_more'),
+        ('bloodbanks', '0002_bloodbank_is_verified_bloodbank_license_document_and_more'),
+        ('bloodrequests', '0002_bloodrequest_cancelled_by_bloodrequest_fulfilled_by_and_more'),
+        ('locations', '0004_location_address_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bloodrequest',
+            index=models.Index(fields=['created_at', 'id'], name='blood_reque_created_4dd250_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bloodrequest',
+            index=models.Index(fields=['requested_by', 'created_at'], name='blood_reque_request_8715b5_idx'),
+        ),
+    ]
@@ -7,6 +7,18 @@ from bloodbanks.models import BloodBank
 import uuid
 
 
+class BloodRequestQuerySet(models.QuerySet):
+    def with_details(self):
+        """Load every relation BloodRequestSerializer renders in the same query."""
+        users = ['requested_by', 'approved_by', 'rejected_by', 'cancelled_by', 'fulfilled_by',
+                 'hospital__user', 'hospital__verified_by',
+                 'assigned_blood_bank__managed_by', 'assigned_blood_bank__verified_by']
+        return self.select_related(
+            'location', 'hospital__location', 'assigned_blood_bank__location',
+            *users, *[f'{user}__created_by' for user in users],
+        ).prefetch_related('assigned_blood_bank__inventory')
+
+
 class BloodRequest(models.Model):
     STATUS_CHOICES = (
         ('PENDING', 'Pending'),
@@ -61,17 +73,34 @@ class BloodRequest(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BloodRequestQuerySet.as_manager()
+
+    # Fields DonationStatistics counts requests by.
+    STATISTICS_FIELDS = ('created_at', 'blood_group', 'status')
+
     class Meta:
         db_table = 'blood_requests'
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['status', 'urgency']),
             models.Index(fields=['blood_group', 'status']),
+            # Newest-first listings and their keyset pages.
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['requested_by', 'created_at']),
         ]
 
     def __str__(self):
         return f"{self.blood_group} ({self.get_urgency_display()}) - {self.requester_type}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so signals can tell which daily statistics a save moves.
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.STATISTICS_FIELDS
+        }
+        return instance
+
     def is_overdue(self):
         return timezone.now() > self.required_by_date and self.status == 'PENDING'
 
@@ -92,7 +121,7 @@ class BloodRequest(models.Model):
                 else:
                     if not self.hospital_name:
                         raise ValidationError("Provide either a registered hospital or a hospital name.")
-                    new_location = Location.objects.create(
+                    new_location = Location.objects.get_or_create_for_address(
                         address_line1=f"Unknown address for {self.hospital_name}",
                         city="Unknown",
                         state="Unknown",
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from .models import BloodRequest
-from accounts.serializers import UserSerializer, HospitalProfileSerializer
+from accounts.serializers import UserLocationListSerializer, UserSerializer, HospitalProfileSerializer
 from locations.serializers import LocationSerializer
 from bloodbanks.serializers import BloodBankSerializer
 from accounts.models import HospitalProfile
@@ -8,6 +8,14 @@ from bloodbanks.models import BloodBank
 from locations.models import Location
 
 
+class BloodRequestListSerializer(UserLocationListSerializer):
+    user_paths = (
+        ('requested_by',), ('approved_by',), ('rejected_by',), ('cancelled_by',), ('fulfilled_by',),
+        ('hospital', 'user'), ('hospital', 'verified_by'),
+        ('assigned_blood_bank', 'managed_by'), ('assigned_blood_bank', 'verified_by'),
+    )
+
+
 class BloodRequestSerializer(serializers.ModelSerializer):
     requested_by = UserSerializer(read_only=True)
     approved_by = UserSerializer(read_only=True)
@@ -36,6 +44,7 @@ class BloodRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = BloodRequest
         fields = '__all__'
+        list_serializer_class = BloodRequestListSerializer
 
     def to_internal_value(self, data):
         location_data = data.get('location', None)
@@ -65,14 +74,9 @@ class BloodRequestSerializer(serializers.ModelSerializer):
         location_data = self.context.get('request').data.get('location', None)
 
         if isinstance(location_data, dict):
-            if instance.location:
-                loc_serializer = LocationSerializer(instance.location, data=location_data, partial=True)
-                loc_serializer.is_valid(raise_exception=True)
-                loc_serializer.save()
-            else:
-                loc_serializer = LocationSerializer(data=location_data)
-                loc_serializer.is_valid(raise_exception=True)
-                instance.location = loc_serializer.save()
+            loc_serializer = LocationSerializer(instance.location, data=location_data, partial=bool(instance.location))
+            loc_serializer.is_valid(raise_exception=True)
+            instance.location = Location.objects.replace_address(instance.location, loc_serializer.validated_data)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -1,3 +1,44 @@
+from datetime import timedelta
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from analytics.models import BloodRequestView
+from analytics.services.request_view_service import request_view_writer, view_statistics_refresher
+from bloodrequests.models import BloodRequest
+from locations.models import Location
+
+
+class RecordBloodRequestViewTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='admin', email='admin@example.com', password=None, role='ADMIN')
+        location = Location.objects.get_or_create_for_address(
+            address_line1='Hospital', police_station='Dhanmondi', city='Dhaka', state='Dhaka',
+            postal_code='1205', latitude=23.75, longitude=90.37,
+        )
+        self.request = BloodRequest.objects.create(
+            requester_type='RECEIVER', requested_by=user, patient_name='Patient', patient_age=40,
+            blood_group='A+', units_required=1, reason='Surgery', location=location,
+            required_by_date=timezone.now() + timedelta(days=10),
+        )
+        # Write inline instead of on the writers' threads.
+        for writer in (request_view_writer, view_statistics_refresher):
+            patch = mock.patch.object(writer, 'enabled', False)
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_records_one_view_per_session(self):
+        client = APIClient()
+        url = f'/api/requests/{self.request.pk}/view/'
+
+        response = client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'message': 'View recorded'})
+        self.assertEqual(client.post(url).json(), {'message': 'Already viewed'})
+        self.assertEqual(BloodRequestView.objects.filter(blood_request=self.request).count(), 1)
 
-# Create your tests here.
+    def test_unknown_request(self):
+        self.assertEqual(APIClient().post('/api/requests/0/view/').status_code, 404)
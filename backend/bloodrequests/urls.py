@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import BloodRequestListCreateView, BloodRequestDetailView,RecordBloodRequestView
+from .views import BloodRequestListCreateView, BloodRequestDetailView,RecordBloodRequestView, BloodRequestMatchView
 
 urlpatterns = [
     path('requests/', BloodRequestListCreateView.as_view(), name='blood-request-list-create'),
     path('requests/<int:pk>/', BloodRequestDetailView.as_view(), name='blood-request-detail'),
     path('requests/<int:pk>/view/', RecordBloodRequestView.as_view(), name='record-blood-request-view'),
+    path('requests/<int:pk>/matches/', BloodRequestMatchView.as_view(), name='blood-request-matches'),
 ]
\ No newline at end of file
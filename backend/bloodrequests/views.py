@@ -2,21 +2,29 @@ from analytics.signals import request_created_signal
 from rest_framework import generics, permissions
 from django.db import models
 from .models import BloodRequest
-from analytics.models import ActivityLog, BloodRequestView, RequestViewStatistics
+from analytics.services.activity_log_service import log_activity
+from analytics.services.request_view_service import record_request_view
 from .serializers import BloodRequestSerializer
 from locations.models import Location
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from donors.models import DonationRecord, DonorProfile
+from donors.models import DONATION_INTERVAL_DAYS, DonationRecord, DonorProfile
+from datetime import timedelta
+from donors.services.matching_service import (
+    COMPATIBLE_DONOR_GROUPS, donor_match_index, eligible_by, is_eligible_by, match_donors, request_location,
+)
 from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
+from common.pagination import PageNumberOrCursorPagination
 
 
 class BloodRequestListCreateView(generics.ListCreateAPIView):
-    queryset = BloodRequest.objects.all()
+    queryset = BloodRequest.objects.with_details()
     serializer_class = BloodRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PageNumberOrCursorPagination
 
     def perform_create(self, serializer):
         instance = serializer.save(requested_by=self.request.user)
@@ -28,7 +36,7 @@ class BloodRequestListCreateView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = BloodRequest.objects.all()
+        queryset = BloodRequest.objects.with_details()
 
         location_id = self.request.query_params.get('location_id')
         if location_id:
@@ -53,7 +61,7 @@ class BloodRequestListCreateView(generics.ListCreateAPIView):
 
 
 class BloodRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = BloodRequest.objects.all()
+    queryset = BloodRequest.objects.with_details()
     serializer_class = BloodRequestSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -147,11 +155,15 @@ class BloodRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
                     "notes": "Donation completed"
                 }
             )
+            donation_date = timezone.now().date()
             DonorProfile.objects.filter(id=donor_profile.id).update(
-                last_donation_date=timezone.now().date(),
+                last_donation_date=donation_date,
+                next_eligible_date=donation_date + timedelta(days=DONATION_INTERVAL_DAYS),
                 donation_points=models.F('donation_points') + 1,
                 total_donations=models.F('total_donations') + 1
             )
+            # update() bypasses the DonorProfile signals.
+            donor_match_index.invalidate()
 
         elif status == 'PENDING':
             update_data.update({
@@ -173,7 +185,7 @@ class BloodRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
         instance = serializer.save(**update_data)
 
         if action:
-            ActivityLog.objects.create(
+            log_activity(
                 user=user,
                 action=action,
                 description=description,
@@ -195,7 +207,7 @@ class BloodRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        queryset = BloodRequest.objects.all()
+        queryset = BloodRequest.objects.with_details()
 
         if user.role == 'DONOR':
             queryset = queryset.filter(
@@ -218,34 +230,19 @@ class RecordBloodRequestView(APIView):
     permission_classes = [permissions.AllowAny]
 
     def post(self, request, pk):
-        try:
-            blood_request = BloodRequest.objects.get(pk=pk)
-        except BloodRequest.DoesNotExist:
+        if not BloodRequest.objects.filter(pk=pk).exists():
             return Response({"error": "Request not found"}, status=status.HTTP_404_NOT_FOUND)
 
         user = request.user if request.user.is_authenticated else None
         ip_address = self.get_client_ip(request)
         session_key = self.get_or_create_session_key(request)
 
-        view_obj, created = BloodRequestView.objects.get_or_create(
-            blood_request=blood_request,
-            session_key=session_key,
-            defaults={
-                "viewer": user,
-                "ip_address": ip_address,
-            }
-        )
-
-        if created:
-            try:
-                RequestViewStatistics.generate_daily_stats()
-            except Exception as e:
-                print("Error generating daily stats:", e)
+        # Views are written in batches and the daily statistics refreshed on
+        # an interval (see request_view_service), so there is no row to
+        # return yet.
+        created = record_request_view(pk, session_key, viewer=user, ip_address=ip_address)
 
-        return Response({
-            "message": "View recorded" if created else "Already viewed",
-            "view_id": view_obj.id
-        })
+        return Response({"message": "View recorded" if created else "Already viewed"})
 
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
@@ -257,3 +254,85 @@ class RecordBloodRequestView(APIView):
         if not request.session.session_key:
             request.session.save()
         return request.session.session_key
+
+
+class BloodRequestMatchView(APIView):
+    """Donors ranked for a blood request by compatibility, eligibility, distance and preferred time."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            blood_request = BloodRequest.objects.select_related(
+                'location', 'hospital__location', 'assigned_blood_bank',
+            ).get(pk=pk)
+        except BloodRequest.DoesNotExist:
+            return Response({"error": "Request not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        if not self.can_view_matches(request.user, blood_request):
+            raise PermissionDenied("You are not allowed to view matches for this request.")
+
+        location = request_location(blood_request)
+        if location is None:
+            return Response({"error": "Request location has no coordinates yet."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({"limit": "Must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        matches, stale = self.get_matches(blood_request, limit)
+        if stale:
+            # Invalidated once per request: every process rebuilds on its next match.
+            donor_match_index.invalidate()
+            if len(matches) < limit:
+                matches, _ = self.get_matches(blood_request, limit)
+
+        return Response({
+            "request_id": blood_request.id,
+            "blood_group": blood_request.blood_group,
+            "compatible_groups": COMPATIBLE_DONOR_GROUPS.get(blood_request.blood_group, ()),
+            "location_approximate": location.coordinates_approximate,
+            "matches": matches,
+        })
+
+    def can_view_matches(self, user, blood_request):
+        # The ranked list exposes donors' names and distances, so hospitals and
+        # blood banks only see it for requests they made or are assigned to.
+        if user.is_superuser or user.role == 'ADMIN' or blood_request.requested_by_id == user.id:
+            return True
+        if user.role == 'HOSPITAL':
+            return blood_request.hospital is not None and blood_request.hospital.user_id == user.id
+        if user.role == 'BLOOD_BANK':
+            bank = blood_request.assigned_blood_bank
+            return bank is not None and bank.managed_by_id == user.id
+        return False
+
+    def get_matches(self, blood_request, limit):
+        """Up to `limit` serialized matches, and whether the index returned stale donors."""
+        # Over-fetch: the index may lag behind profile changes made through
+        # update() or in other processes, and such donors are dropped below.
+        ranked = match_donors(blood_request, limit=limit * 2)
+        donors = DonorProfile.objects.select_related('user', 'location').in_bulk([donor_id for donor_id, *_ in ranked])
+        needed_by = eligible_by(blood_request)
+
+        matches = []
+        stale = False
+        for donor_id, distance_km, score, exact_group in ranked:
+            donor = donors.get(donor_id)
+            if donor is None or not (donor.is_available and is_eligible_by(donor, needed_by)):
+                stale = True
+                continue
+            if len(matches) == limit:
+                break
+            matches.append({
+                "donor_id": donor.id,
+                "name": donor.full_name(),
+                "blood_group": donor.blood_group,
+                "exact_group_match": exact_group,
+                "distance_km": distance_km,
+                "location_approximate": donor.location.coordinates_approximate,
+                "willing_to_travel_km": donor.willing_to_travel_km,
+                "preferred_donation_time": donor.preferred_donation_time,
+                "score": score,
+            })
+        return matches, stale
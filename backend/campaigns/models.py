@@ -2,6 +2,17 @@ from django.db import models
 from accounts.models import User
 from locations.models import Location
 
+class BloodDriveCampaignQuerySet(models.QuerySet):
+    def with_details(self):
+        """Load what BloodDriveCampaignSerializer renders, registration counts included."""
+        return self.select_related('organizer__created_by', 'location').prefetch_related(
+            'blood_banks_involved', 'registered_donors'
+        ).annotate(
+            registrations_total=models.Count('campaignregistration'),
+            donations_total=models.Count('campaignregistration', filter=models.Q(campaignregistration__status='DONATED')),
+        )
+
+
 class BloodDriveCampaign(models.Model):
     STATUS_CHOICES = (
         ('PLANNED', 'Planned'),
@@ -24,7 +35,9 @@ class BloodDriveCampaign(models.Model):
     banner_image = models.ImageField(upload_to='campaign_banners/', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    objects = BloodDriveCampaignQuerySet.as_manager()
+
     class Meta:
         db_table = 'blood_drive_campaigns'
         ordering = ['-start_date']
@@ -33,11 +46,17 @@ class BloodDriveCampaign(models.Model):
         return self.campaign_name
 
     def registration_count(self):
+        if hasattr(self, 'registrations_total'):
+            # Annotated by with_details().
+            return self.registrations_total
         return self.registered_donors.count()
 
     def completion_rate(self):
-        total = self.registered_donors.count()
-        donated = self.campaignregistration_set.filter(status='DONATED').count()
+        total = self.registration_count()
+        if hasattr(self, 'donations_total'):
+            donated = self.donations_total
+        else:
+            donated = self.campaignregistration_set.filter(status='DONATED').count()
         return (donated / total * 100) if total else 0
 
     def get_registrations(self):
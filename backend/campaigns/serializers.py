@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from campaigns.models import BloodDriveCampaign, CampaignRegistration
-from accounts.serializers import UserSerializer
+from accounts.serializers import UserLocationListSerializer, UserSerializer
 from donors.serializers import DonorProfileSerializer
 from bloodbanks.serializers import BloodBankSerializer
 from locations.serializers import LocationSerializer
@@ -10,6 +10,10 @@ from rest_framework.exceptions import ValidationError
 import json
 
 
+class BloodDriveCampaignListSerializer(UserLocationListSerializer):
+    user_paths = (('organizer',),)
+
+
 class BloodDriveCampaignSerializer(serializers.ModelSerializer):
     organizer = UserSerializer(read_only=True)
     location = LocationSerializer()
@@ -23,9 +27,10 @@ class BloodDriveCampaignSerializer(serializers.ModelSerializer):
         model = BloodDriveCampaign
         fields = "__all__"
         read_only_fields = ["organizer", "created_at", "updated_at"]
+        list_serializer_class = BloodDriveCampaignListSerializer
     
     def get_registrations(self, obj):
-        return obj.get_registrations().count()
+        return obj.registration_count()
 
     def get_completion_rate(self, obj):
         return round(obj.completion_rate(), 2)
@@ -34,7 +39,7 @@ class BloodDriveCampaignSerializer(serializers.ModelSerializer):
         location_data = validated_data.pop("location")
         blood_banks = validated_data.pop("blood_banks_involved", [])
         banner_image = validated_data.pop("banner_image", None)
-        location = Location.objects.create(**location_data)
+        location = Location.objects.get_or_create_for_address(**location_data)
         campaign = BloodDriveCampaign.objects.create(location=location, **validated_data)
 
         if banner_image:
@@ -51,12 +56,7 @@ class BloodDriveCampaignSerializer(serializers.ModelSerializer):
         blood_banks = validated_data.pop("blood_banks_involved", None)
 
         if location_data:
-            if instance.location:
-                for key, value in location_data.items():
-                    setattr(instance.location, key, value)
-                instance.location.save()
-            else:
-                instance.location = Location.objects.create(**location_data)
+            instance.location = Location.objects.replace_address(instance.location, location_data)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
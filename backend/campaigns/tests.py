@@ -1,3 +1,63 @@
+from datetime import timedelta
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from campaigns.models import BloodDriveCampaign, CampaignRegistration
+from donors.models import DonorProfile
+from locations.models import Location
+
+
+class CampaignListTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password=None, role='ADMIN')
+        self.location = Location.objects.get_or_create_for_address(
+            address_line1='Community hall', police_station='Dhanmondi', city='Dhaka', state='Dhaka',
+            postal_code='1205', latitude=23.75, longitude=90.37,
+        )
+        self.donors = []
+        for i in range(4):
+            user = User.objects.create_user(username=f'donor{i}', email=f'donor{i}@example.com', password=None, role='DONOR')
+            self.donors.append(DonorProfile.objects.create(user=user, blood_group='A+', gender='M'))
+
+    def make_campaign(self, donated=0, registered=0):
+        name = f'organizer{BloodDriveCampaign.objects.count()}'
+        organizer = User.objects.create_user(username=name, email=f'{name}@example.com', password=None, role='HOSPITAL')
+        campaign = BloodDriveCampaign.objects.create(
+            campaign_name='Drive', description='Drive', organizer=organizer, location=self.location,
+            venue_details='Hall', start_date=timezone.now(), end_date=timezone.now() + timedelta(days=1),
+        )
+        for i, donor in enumerate(self.donors[:donated + registered]):
+            CampaignRegistration.objects.create(
+                campaign=campaign, donor=donor, status='DONATED' if i < donated else 'REGISTERED',
+            )
+        return campaign
+
+    def list_campaigns(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/campaigns/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results'], len(queries)
+
+    def test_counts_come_from_the_list_query(self):
+        campaign = self.make_campaign(donated=1, registered=3)
+        empty = self.make_campaign()
+        campaigns, _ = self.list_campaigns()
+        rows = {row['id']: row for row in campaigns}
+        self.assertEqual((rows[campaign.id]['registrations'], rows[campaign.id]['completion_rate']), (4, 25.0))
+        self.assertEqual(sorted(rows[campaign.id]['registered_donors']), [donor.id for donor in self.donors])
+        self.assertEqual((rows[empty.id]['registrations'], rows[empty.id]['completion_rate']), (0, 0))
 
-# Create your tests here.
+    def test_query_count_does_not_grow_with_rows(self):
+        self.make_campaign(donated=1, registered=1)
+        _, few = self.list_campaigns()
+        for _ in range(5):
+            self.make_campaign(donated=2, registered=1)
+        _, many = self.list_campaigns()
+        self.assertEqual(many, few)
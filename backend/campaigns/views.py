@@ -15,8 +15,8 @@ class BloodDriveCampaignListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser or getattr(user, "role", None) == "ADMIN":
-            return BloodDriveCampaign.objects.all().order_by("-start_date")
-        return BloodDriveCampaign.objects.filter(organizer=user).order_by("-start_date")
+            return BloodDriveCampaign.objects.with_details().order_by("-start_date")
+        return BloodDriveCampaign.objects.with_details().filter(organizer=user).order_by("-start_date")
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -39,10 +39,10 @@ class CampaignAuthListView(generics.ListAPIView):
 
     def get_queryset(self):
         if self.request.user.is_superuser or self.request.user.role == "ADMIN":
-            return BloodDriveCampaign.objects.all().order_by("-start_date")
+            return BloodDriveCampaign.objects.with_details().order_by("-start_date")
         if self.request.user.role == 'DONOR':
-            return BloodDriveCampaign.objects.filter(status="ACTIVE").order_by("-start_date")
-        return BloodDriveCampaign.objects.filter(organizer=self.request.user).order_by("-start_date")
+            return BloodDriveCampaign.objects.with_details().filter(status="ACTIVE").order_by("-start_date")
+        return BloodDriveCampaign.objects.with_details().filter(organizer=self.request.user).order_by("-start_date")
 
 class CampaignListView(generics.ListAPIView):
     queryset = BloodDriveCampaign.objects.filter(status="ACTIVE").order_by("-start_date")[:3]
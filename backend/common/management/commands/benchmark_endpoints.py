@@ -0,0 +1,217 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+DEFAULT_BUDGETS = Path(__file__).resolve().parents[2] / 'data' / 'benchmark_budgets.json'
+
+# (name, user role or None for anonymous, path). Paths are formatted with
+# the ids of the seeded objects returned by seed_dataset().
+ENDPOINTS = [
+    ('requests-list', 'admin', '/api/requests/'),
+    ('requests-list-receiver', 'receiver', '/api/requests/'),
+    ('requests-detail', 'admin', '/api/requests/{blood_request}/'),
+    ('requests-matches', 'admin', '/api/requests/{blood_request}/matches/'),
+    ('donors-list', 'admin', '/api/donors/profiles/'),
+    ('donors-list-receiver', 'receiver', '/api/donors/profiles/'),
+    ('donors-detail', 'admin', '/api/donors/profiles/{donor}/'),
+    ('donation-records-list', 'admin', '/api/donors/records/'),
+    ('users-list', 'admin', '/api/users/'),
+    ('hospitals-all', 'admin', '/api/hospitals/all/'),
+    ('bloodbanks-list', 'admin', '/api/bloodbanks/'),
+    ('bloodbanks-all', None, '/api/bloodbanks/all/'),
+    ('bloodbanks-all-summary', None, '/api/bloodbanks/all/?summary=true'),
+    ('bloodbanks-detail', 'admin', '/api/bloodbanks/{bank}/'),
+    ('inventory-list', 'admin', '/api/bloodbanks/inventory/'),
+    ('inventory-pivot', 'admin', '/api/bloodbanks/inventory/?pivot=true'),
+    ('inventory-snapshot', None, '/api/bloodbanks/inventory/snapshot/'),
+    ('campaigns-list', 'admin', '/api/campaigns/'),
+    ('notifications-list', 'receiver', '/api/notifications/'),
+    ('nearby', 'receiver', '/api/nearby/'),
+    ('nearby-donors', 'receiver', '/api/nearby-donors/'),
+    ('analytics-donation-stats', 'admin', '/api/analytics/donation-stats/'),
+    ('analytics-activity-logs', 'admin', '/api/analytics/activity-logs/'),
+    ('analytics-activity-logs-cursor', 'admin', '/api/analytics/activity-logs/?cursor='),
+    ('analytics-request-views', 'admin', '/api/analytics/request-views/'),
+    ('analytics-request-views-one', 'admin', '/api/analytics/request-views/?blood_request={blood_request}'),
+    ('analytics-view-stats', 'admin', '/api/analytics/view-stats/'),
+]
+
+def seed_dataset(scale=1, seed=0):
+    """Seed the benchmark database; returns the users and object ids ENDPOINTS need."""
+    from analytics.models import DonationStatistics, RequestViewStatistics
+    from bloodbanks.models import BloodBank
+    from bloodrequests.models import BloodRequest
+    from common.seeding import DataSeeder
+    from donors.models import DonorProfile
+
+    seeder = DataSeeder(users=200 * scale, seed=seed, prefix='bench')
+    seeder.run()
+    # Daily aggregates are normally written by signals, which bulk seeding skips.
+    today = timezone.localdate()
+    for days in range(7):
+        DonationStatistics.objects.create(date=today - timedelta(days=days), total_donations=days * 3)
+        RequestViewStatistics.objects.create(date=today - timedelta(days=days), total_views=days * 40)
+
+    users = {
+        'admin': seeder.admin,
+        'receiver': BloodRequest.objects.filter(requester_type='RECEIVER').order_by('id').first().requested_by,
+    }
+    ids = {
+        'blood_request': BloodRequest.objects.order_by('id').first().pk,
+        'donor': DonorProfile.objects.order_by('id').first().pk,
+        'bank': BloodBank.objects.order_by('id').first().pk,
+    }
+    return users, ids
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database (see seed_data), call each list/detail endpoint and record "
+        "query count, wall time and response size. Results are written to JSON; the "
+        "command fails when an endpoint exceeds its budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budgets', default=str(DEFAULT_BUDGETS), help="JSON file of per-endpoint budgets.")
+        parser.add_argument('--output', default='benchmark_results.json', help="Where to write the results.")
+        parser.add_argument('--compare', help="Earlier results file to show deltas against.")
+        parser.add_argument('--scale', type=int, default=1, help="Multiplier for the seeded dataset.")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed calls per endpoint (after one warm-up).")
+        parser.add_argument('--only', nargs='*', help="Only run these endpoint names.")
+        parser.add_argument('--update-budgets', action='store_true', help="Store the measured values as the new budgets.")
+
+    def handle(self, *args, **options):
+        endpoints = [e for e in ENDPOINTS if not options['only'] or e[0] in options['only']]
+        if not endpoints:
+            raise CommandError("No endpoints selected.")
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            started = time.monotonic()
+            users, ids = seed_dataset(scale=options['scale'])
+            self.stdout.write(f"Seeded test database in {time.monotonic() - started:.1f}s")
+            results = [self.measure(name, users.get(role), path.format(**ids), options['repeat'])
+                       for name, role, path in endpoints]
+            self.flush_background_writers()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        budgets = self.load_json(options['budgets']) or {}
+        previous = {r['name']: r for r in (self.load_json(options['compare']) or {}).get('results', [])}
+        failures = []
+        for result in results:
+            result['budget'] = budgets.get(result['name'])
+            result['violations'] = self.check_budget(result)
+            if result['violations']:
+                failures.append(result)
+            self.report(result, previous.get(result['name']))
+
+        with open(options['output'], 'w') as f:
+            json.dump({
+                'created_at': timezone.now().isoformat(),
+                'scale': options['scale'],
+                'repeat': options['repeat'],
+                'database': connection.vendor,
+                'results': results,
+            }, f, indent=2)
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if options['update_budgets']:
+            for result in results:
+                budgets[result['name']] = {
+                    'queries': result['queries'],
+                    # Wall time is noisy across machines; leave generous headroom.
+                    'max_ms': max(100, int(result['median_ms'] * 5 / 50 + 1) * 50),
+                }
+            with open(options['budgets'], 'w') as f:
+                json.dump(budgets, f, indent=2, sort_keys=True)
+                f.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"Budgets updated in {options['budgets']}"))
+            return
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} endpoint(s) over budget: "
+                + "; ".join(f"{r['name']} ({', '.join(r['violations'])})" for r in failures)
+            )
+        self.stdout.write(self.style.SUCCESS(f"✅ All {len(results)} endpoints within budget."))
+
+    def measure(self, name, user, path, repeat):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        # Warm-up: fills per-process caches (match index, geocoder, ...).
+        client.get(path)
+
+        timings = []
+        for _ in range(max(repeat, 1)):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = client.get(path)
+                timings.append((time.perf_counter() - started) * 1000)
+
+        return {
+            'name': name,
+            'path': path,
+            'user': user.role if user else None,
+            'status': response.status_code,
+            'queries': len(queries.captured_queries),
+            'median_ms': round(statistics.median(timings), 2),
+            'min_ms': round(min(timings), 2),
+            'max_ms': round(max(timings), 2),
+            'bytes': len(response.content),
+        }
+
+    def check_budget(self, result):
+        violations = []
+        if result['status'] != 200:
+            violations.append(f"status {result['status']}")
+        budget = result['budget']
+        if budget is None:
+            return violations
+        if 'queries' in budget and result['queries'] > budget['queries']:
+            violations.append(f"{result['queries']} queries > {budget['queries']}")
+        if 'max_ms' in budget and result['median_ms'] > budget['max_ms']:
+            violations.append(f"{result['median_ms']}ms > {budget['max_ms']}ms")
+        return violations
+
+    def report(self, result, previous):
+        line = (f"{result['name']:<28} {result['status']} {result['queries']:>4} queries "
+                f"{result['median_ms']:>8.1f} ms {result['bytes']:>8} bytes")
+        if previous:
+            line += (f"  (Δ {result['queries'] - previous['queries']:+d} queries, "
+                     f"{result['median_ms'] - previous['median_ms']:+.1f} ms)")
+        if result['violations']:
+            self.stdout.write(self.style.ERROR(f"{line}  OVER BUDGET: {', '.join(result['violations'])}"))
+        elif result['budget'] is None:
+            self.stdout.write(self.style.WARNING(f"{line}  (no budget)"))
+        else:
+            self.stdout.write(line)
+
+    def flush_background_writers(self):
+        # Write out buffered rows while the test database still exists.
+        from analytics.services.activity_log_service import activity_log_writer
+        from analytics.services.distance_record_service import distance_record_writer
+        from analytics.services.request_view_service import request_view_writer, view_statistics_refresher
+
+        activity_log_writer.flush()
+        distance_record_writer.flush()
+        request_view_writer.flush()
+        view_statistics_refresher.flush()
+
+    def load_json(self, path):
+        if not path or not Path(path).exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
@@ -0,0 +1,192 @@
+import json
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+def table_row_estimate(model, using='default'):
+    """The planner's row estimate for a model's table, or None if there is none.
+
+    PostgreSQL only. Partitioned tables (see analytics.partitioning) are
+    summed over their partitions; tables never analyzed report None.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT sum(reltuples) FROM pg_class
+            WHERE reltuples >= 0 AND (
+                oid = to_regclass(%s)
+                OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(%s))
+            )
+            """,
+            [model._meta.db_table] * 2,
+        )
+        (estimate,) = cursor.fetchone()
+    return None if estimate is None else int(estimate)
+
+
+def queryset_row_estimate(queryset):
+    """Rows the planner expects a (filtered) queryset to return, from EXPLAIN.
+
+    Runs the EXPLAIN itself: QuerySet.explain() re-serializes the plan
+    differently depending on the driver.
+    """
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        (plan,) = cursor.fetchone()
+    return plan_row_estimate(plan)
+
+
+def plan_row_estimate(plan):
+    """"Plan Rows" of the top node of an EXPLAIN (FORMAT JSON) result.
+
+    psycopg decodes the json column into a list holding one object; other
+    drivers hand back the text.
+    """
+    if isinstance(plan, (str, bytes)):
+        plan = json.loads(plan)
+    if isinstance(plan, list):
+        plan = plan[0]
+    return int(plan['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """A Paginator that trusts planner estimates instead of COUNT(*) on big tables.
+
+    The count is estimated when the table holds at least `threshold` rows
+    and either the queryset is unfiltered or the planner expects the filter
+    to match at least `threshold` rows too; selective filters still get an
+    exact (and cheap) count. Pages past the estimate stay reachable, and
+    has_next() comes from fetching one extra row rather than from the count.
+    """
+
+    def __init__(self, *args, threshold=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threshold = settings.ESTIMATED_COUNT_THRESHOLD if threshold is None else threshold
+        self.count_is_estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        estimate = table_row_estimate(queryset.model, queryset.db)
+        if estimate is not None and estimate >= self.threshold:
+            if queryset.query.where:
+                estimate = queryset_row_estimate(queryset)
+            if estimate >= self.threshold:
+                self.count_is_estimated = True
+                return estimate
+        return super().count
+
+    def validate_number(self, number):
+        self.count  # decides count_is_estimated
+        if not self.count_is_estimated:
+            return super().validate_number(number)
+        # No upper bound: the estimate may be below the real count.
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimated:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+        return EstimatedCountPage(rows[:self.per_page], number, self, has_more=len(rows) > self.per_page)
+
+
+class EstimatedCountPage(Page):
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """Keyset pagination, newest first.
+
+    Each page continues from the last row's position (WHERE created_at <
+    ...) instead of an OFFSET, and nothing is counted, so deep pages cost
+    the same as the first one given an index on the ordering.
+    """
+    ordering = ('-created_at', '-id')
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    """Page numbers by default; a `cursor` query parameter switches to keyset pages.
+
+    Existing clients keep `?page=N` and the `count` in the response. Clients
+    scrolling through long histories start with `?cursor=` (empty) and follow
+    the `next` / `previous` links; those responses have no `count`.
+    """
+    cursor_pagination_class = CreatedAtCursorPagination
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_pagination_class.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.cursor_pagination_class()
+            page = self.cursor_paginator.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.cursor_paginator.display_page_controls
+            return page
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
+
+    def get_schema_operation_parameters(self, view):
+        return (
+            super().get_schema_operation_parameters(view)
+            + self.cursor_pagination_class().get_schema_operation_parameters(view)
+        )
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """Page numbers with an estimated `count` on very large tables.
+
+    Responses carry `count_is_estimated`, true when `count` is the planner's
+    estimate rather than an exact COUNT(*) (see EstimatedCountPaginator).
+    """
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data['count_is_estimated'] = self.page.paginator.count_is_estimated
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count_is_estimated'] = {'type': 'boolean', 'example': False}
+        return schema
+
+
+class EstimatedCountOrCursorPagination(PageNumberOrCursorPagination, EstimatedCountPagination):
+    """EstimatedCountPagination, or keyset pages when a `cursor` is given."""
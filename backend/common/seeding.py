@@ -0,0 +1,342 @@
+import csv
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import AdminProfile, HospitalProfile, ReceiverProfile, User
+from analytics.models import ActivityLog, BloodRequestView
+from analytics.services.request_view_service import rebuild_view_sketches
+from bloodbanks.models import BloodBank, BloodInventory
+from bloodrequests.models import BloodRequest
+from campaigns.models import BloodDriveCampaign, CampaignRegistration
+from donors.models import DonationRecord, DonorProfile
+from locations.addresses import address_hash
+from locations.gazetteer import GAZETTEER_PATH
+from locations.models import Location
+from notifications.models import Notification
+
+# Share of generated users per role; the rest are donors.
+ROLE_SHARES = {'RECEIVER': 0.20, 'HOSPITAL': 0.03, 'BLOOD_BANK': 0.02}
+
+# Approximate ABO/Rh distribution in Bangladesh.
+BLOOD_GROUP_WEIGHTS = {'B+': 32, 'O+': 30, 'A+': 25, 'AB+': 8, 'B-': 1.5, 'O-': 1.5, 'A-': 1.2, 'AB-': 0.8}
+
+ACTIVITY_ACTIONS = ['USER_LOGIN', 'USER_LOGOUT', 'REQUEST_CREATED', 'REQUEST_UPDATED', 'INVENTORY_UPDATED']
+
+
+def load_places():
+    """(police_station, city, state, latitude, longitude) for every gazetteer thana and district town."""
+    with open(GAZETTEER_PATH, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    divisions = {row['name']: row['parent'] for row in rows if row['kind'] == 'district'}
+    places = []
+    for row in rows:
+        point = (float(row['latitude']), float(row['longitude']))
+        if row['kind'] == 'thana':
+            places.append((row['name'], row['parent'], divisions.get(row['parent'], row['parent']), *point))
+        elif row['kind'] == 'district':
+            places.append((f"{row['name']} Sadar", row['name'], row['parent'], *point))
+    return places
+
+
+class DataSeeder:
+    """Bulk-generates a realistic dataset for load testing and benchmarks.
+
+    Everything is written with batched bulk_create(), which skips save()
+    and signals, so derived columns (address_hash, next_eligible_date)
+    are filled in here. Locations get coordinates up
+    front and are spread over Bangladesh's police stations and district
+    towns, so nothing is ever geocoded.
+    """
+
+    def __init__(self, users=1000, batch_size=5000, seed=0, prefix='seed', password=None, log=None):
+        self.total_users = users
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.prefix = prefix
+        self.password = make_password(password)
+        self.log = log or (lambda message: None)
+        self.now = timezone.now()
+        self.places = load_places()
+        self.counts = {}
+
+        self.admin = None
+        self.donors = []            # (profile id, blood group)
+        self.receiver_users = []
+        self.hospitals = []         # (profile id, user id, location id)
+        self.banks = []             # (bank id, manager user id, location id)
+        self.requests = []
+        self.location_index = 0
+
+    def run(self):
+        started = time.monotonic()
+        self.create_admin()
+        shares = {role: max(1, int(self.total_users * share)) for role, share in ROLE_SHARES.items()}
+        self.create_profiles('HOSPITAL', shares['HOSPITAL'], self.build_hospitals)
+        self.create_profiles('BLOOD_BANK', shares['BLOOD_BANK'], self.build_banks)
+        self.create_profiles('RECEIVER', shares['RECEIVER'], self.build_receivers)
+        donors = max(1, self.total_users - 1 - sum(shares.values()))
+        self.create_profiles('DONOR', donors, self.build_donors)
+        self.create_inventory()
+        self.create_requests()
+        self.create_donations()
+        self.create_campaigns()
+        self.create_activity()
+        self.create_views()
+        self.create_notifications()
+
+        elapsed = time.monotonic() - started
+        rows = sum(self.counts.values())
+        self.log(f"Created {rows} rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s)")
+        return self.counts
+
+    # -- helpers ---------------------------------------------------------
+
+    def bulk_create(self, model, objects):
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        label = model._meta.label
+        self.counts[label] = self.counts.get(label, 0) + len(objects)
+        return objects
+
+    def batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield start, min(self.batch_size, total - start)
+
+    def timed(self, label, total, build):
+        started = time.monotonic()
+        for start, size in self.batches(total):
+            with transaction.atomic():
+                build(start, size)
+        elapsed = time.monotonic() - started
+        self.log(f"  {label}: {total} in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f}/s)")
+
+    def blood_group(self):
+        return self.rng.choices(list(BLOOD_GROUP_WEIGHTS), weights=list(BLOOD_GROUP_WEIGHTS.values()))[0]
+
+    def past(self, days):
+        return self.now - timedelta(days=self.rng.uniform(0, days))
+
+    def build_locations(self, count):
+        locations = []
+        for _ in range(count):
+            self.location_index += 1
+            police_station, city, state, lat, lon = self.rng.choice(self.places)
+            location = Location(
+                address_line1=f"House {self.location_index}, {self.prefix.title()} Road {self.location_index % 97 + 1}",
+                police_station=police_station, city=city, state=state,
+                postal_code=str(1000 + self.rng.randint(0, 8999)), country='Bangladesh',
+                latitude=round(lat + self.rng.uniform(-0.03, 0.03), 6),
+                longitude=round(lon + self.rng.uniform(-0.03, 0.03), 6),
+            )
+            location.address_hash = address_hash(location)
+            locations.append(location)
+        return self.bulk_create(Location, locations)
+
+    def build_users(self, role, start, size):
+        slug = role.lower().replace('_', '')
+        return self.bulk_create(User, [
+            User(
+                username=f"{self.prefix}-{slug}-{start + i}", email=f"{self.prefix}-{slug}-{start + i}@example.com",
+                first_name=slug.title(), last_name=str(start + i), role=role, password=self.password,
+                phone_number=f"+8801{self.rng.randint(300000000, 999999999)}", email_verified=True,
+            )
+            for i in range(size)
+        ])
+
+    # -- users and profiles ----------------------------------------------
+
+    def create_admin(self):
+        self.admin = User.objects.create(
+            username=f"{self.prefix}-admin", email=f"{self.prefix}-admin@example.com", role='ADMIN',
+            is_staff=True, is_superuser=True, password=self.password,
+        )
+        AdminProfile.objects.create(user=self.admin, age=40, location=self.build_locations(1)[0])
+
+    def create_profiles(self, role, total, build):
+        def build_batch(start, size):
+            users = self.build_users(role, start, size)
+            locations = self.build_locations(size)
+            build(start, users, locations)
+        self.timed(f"{role.lower()} users + profiles + locations", total, build_batch)
+
+    def build_hospitals(self, start, users, locations):
+        profiles = self.bulk_create(HospitalProfile, [
+            HospitalProfile(
+                user=user, hospital_name=f"{location.city} Hospital {start + i}",
+                registration_number=f"{self.prefix}-H-{start + i}",
+                hospital_type=self.rng.choice(['GOVERNMENT', 'PRIVATE']), location=location,
+                emergency_contact=user.phone_number, bed_capacity=self.rng.randint(20, 800),
+                is_verified=self.rng.random() < 0.7,
+            )
+            for i, (user, location) in enumerate(zip(users, locations))
+        ])
+        self.hospitals.extend((p.id, p.user_id, p.location_id) for p in profiles)
+
+    def build_banks(self, start, users, locations):
+        banks = self.bulk_create(BloodBank, [
+            BloodBank(
+                name=f"{location.city} Blood Bank {start + i}", registration_number=f"{self.prefix}-B-{start + i}",
+                location=location, contact_person=user.get_full_name(), contact_number=user.phone_number,
+                email=user.email, storage_capacity=self.rng.randint(200, 2000), managed_by=user,
+                is_verified=self.rng.random() < 0.8,
+            )
+            for i, (user, location) in enumerate(zip(users, locations))
+        ])
+        self.banks.extend((b.id, b.managed_by_id, b.location_id) for b in banks)
+
+    def build_receivers(self, start, users, locations):
+        self.bulk_create(ReceiverProfile, [
+            ReceiverProfile(
+                user=user, age=self.rng.randint(1, 90), blood_group=self.blood_group(), location=location,
+                contact_number=user.phone_number,
+            )
+            for user, location in zip(users, locations)
+        ])
+        self.receiver_users.extend(user.id for user in users)
+
+    def build_donors(self, start, users, locations):
+        profiles = []
+        for user, location in zip(users, locations):
+            profile = DonorProfile(
+                user=user, blood_group=self.blood_group(), gender=self.rng.choice('MMF'),
+                date_of_birth=(self.now - timedelta(days=self.rng.randint(18 * 365, 60 * 365))).date(),
+                weight=self.rng.randint(48, 95), location=location,
+                is_available=self.rng.random() < 0.8,
+                last_donation_date=self.past(400).date() if self.rng.random() < 0.6 else None,
+                willing_to_travel_km=self.rng.choice([5, 10, 20, 50]),
+                preferred_donation_time=self.rng.choice(['ANYTIME', 'MORNING', 'AFTERNOON', 'EVENING']),
+            )
+            profile.next_eligible_date = profile.compute_next_eligible_date()
+            profiles.append(profile)
+        self.bulk_create(DonorProfile, profiles)
+        self.donors.extend((p.id, p.blood_group) for p in profiles)
+
+    # -- everything else --------------------------------------------------
+
+    def create_inventory(self):
+        def build(start, size):
+            self.bulk_create(BloodInventory, [
+                BloodInventory(blood_bank_id=bank_id, blood_group=group, units_available=self.rng.randint(0, 80),
+                               units_reserved=self.rng.randint(0, 5))
+                for bank_id, *_ in self.banks[start:start + size]
+                for group in BLOOD_GROUP_WEIGHTS
+            ])
+        self.timed("inventory rows (8 per bank)", len(self.banks), build)
+
+    def create_requests(self):
+        total = len(self.receiver_users) * 2 + len(self.hospitals) * 5
+
+        def build(start, size):
+            requests = []
+            for _ in range(size):
+                hospital_id, hospital_user_id, location_id = self.rng.choice(self.hospitals)
+                from_receiver = self.rng.random() < 0.7
+                status = self.rng.choices(['PENDING', 'APPROVED', 'FULFILLED', 'CANCELLED', 'REJECTED'],
+                                          weights=[35, 20, 35, 7, 3])[0]
+                bank_id, bank_user_id, _ = self.rng.choice(self.banks)
+                requests.append(BloodRequest(
+                    requester_type='RECEIVER' if from_receiver else 'HOSPITAL',
+                    requested_by_id=self.rng.choice(self.receiver_users) if from_receiver else hospital_user_id,
+                    patient_name=f"Patient {self.rng.randint(1, 10 ** 6)}", patient_age=self.rng.randint(1, 90),
+                    blood_group=self.blood_group(), units_required=self.rng.randint(1, 4),
+                    reason=self.rng.choice(["Surgery", "Accident", "Thalassemia", "Delivery", "Dengue"]),
+                    urgency=self.rng.choices(['ROUTINE', 'URGENT', 'EMERGENCY'], weights=[60, 30, 10])[0],
+                    required_by_date=self.now + timedelta(days=self.rng.uniform(-180, 14)),
+                    hospital_id=hospital_id, location_id=location_id, status=status,
+                    approved_by_id=bank_user_id if status in ('APPROVED', 'FULFILLED') else None,
+                    fulfilled_by_id=bank_user_id if status == 'FULFILLED' else None,
+                    assigned_blood_bank_id=bank_id if status in ('APPROVED', 'FULFILLED') else None,
+                ))
+            self.bulk_create(BloodRequest, requests)
+            self.requests.extend(r.id for r in requests)
+        self.timed("blood requests", total, build)
+
+    def create_donations(self):
+        total = len(self.donors) // 2
+
+        def build(start, size):
+            records = []
+            for _ in range(size):
+                donor_id, group = self.rng.choice(self.donors)
+                bank_id, bank_user_id, _ = self.rng.choice(self.banks)
+                records.append(DonationRecord(
+                    donor_id=donor_id, blood_bank_id=bank_id, donation_date=self.past(365), blood_group=group,
+                    status=self.rng.choices(['COMPLETED', 'SCHEDULED', 'CANCELLED', 'REJECTED'], weights=[85, 8, 5, 2])[0],
+                    related_request_id=self.rng.choice(self.requests) if self.rng.random() < 0.5 else None,
+                    collected_by_id=bank_user_id, hemoglobin_level=round(self.rng.uniform(12, 17), 1),
+                ))
+            self.bulk_create(DonationRecord, records)
+        self.timed("donation records", total, build)
+
+    def create_campaigns(self):
+        Involved = BloodDriveCampaign.blood_banks_involved.through
+
+        def build(start, size):
+            campaigns = []
+            for bank_id, bank_user_id, location_id in self.banks[start:start + size]:
+                start_date = self.now + timedelta(days=self.rng.uniform(-120, 60))
+                campaigns.append(BloodDriveCampaign(
+                    campaign_name=f"Blood Drive {bank_id}", description="Voluntary blood donation camp",
+                    organizer_id=bank_user_id, location_id=location_id, venue_details="Community hall",
+                    start_date=start_date, end_date=start_date + timedelta(days=1),
+                    target_donors=self.rng.choice([50, 100, 200]),
+                    status='COMPLETED' if start_date < self.now else 'PLANNED',
+                ))
+            self.bulk_create(BloodDriveCampaign, campaigns)
+            self.bulk_create(Involved, [
+                Involved(blooddrivecampaign_id=campaign.id, bloodbank_id=campaign_bank[0])
+                for campaign, campaign_bank in zip(campaigns, self.banks[start:start + size])
+            ])
+            self.bulk_create(CampaignRegistration, [
+                CampaignRegistration(campaign=campaign, donor_id=donor_id,
+                                     status=self.rng.choice(['REGISTERED', 'ATTENDED', 'DONATED']))
+                for campaign in campaigns
+                for donor_id, _ in self.rng.sample(self.donors, min(20, len(self.donors)))
+            ])
+        self.timed("campaigns (+ registrations)", len(self.banks), build)
+
+    def create_activity(self):
+        user_ids = [self.admin.id, *self.receiver_users, *(h[1] for h in self.hospitals), *(b[1] for b in self.banks)]
+
+        def build(start, size):
+            logs = []
+            for _ in range(size):
+                action = self.rng.choice(ACTIVITY_ACTIONS)
+                logs.append(ActivityLog(
+                    user_id=self.rng.choice(user_ids), action=action,
+                    description=f"Seeded {action.lower().replace('_', ' ')}",
+                    ip_address=f"10.{self.rng.randint(0, 255)}.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}",
+                    user_agent="seed_data", metadata={"seeded": True},
+                ))
+            self.bulk_create(ActivityLog, logs)
+        self.timed("activity logs", self.total_users * 2, build)
+
+    def create_views(self):
+        def build(start, size):
+            self.bulk_create(BloodRequestView, [
+                BloodRequestView(
+                    blood_request_id=self.rng.choice(self.requests),
+                    viewer_id=self.rng.choice(self.receiver_users) if self.rng.random() < 0.4 else None,
+                    session_key=f"{self.prefix}-{start + i}",
+                )
+                for i in range(size)
+            ])
+        self.timed("request views", len(self.requests) * 5, build)
+        # bulk_create() skips the view writer, so fold today's views into the sketches here.
+        rebuild_view_sketches(since=timezone.localdate())
+
+    def create_notifications(self):
+        def build(start, size):
+            self.bulk_create(Notification, [
+                Notification(
+                    recipient_id=self.rng.choice(self.receiver_users), notification_type='BLOOD_NEEDED',
+                    title="Blood needed nearby", message="A patient near you needs blood.",
+                    related_request_id=self.rng.choice(self.requests), is_read=self.rng.random() < 0.5,
+                )
+                for _ in range(size)
+            ])
+        self.timed("notifications", self.total_users // 2, build)
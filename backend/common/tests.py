@@ -1,3 +1,159 @@
+import math
+from unittest import mock, skipUnless
+
+import numpy as np
+from django.core.paginator import EmptyPage
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from analytics.models import ActivityLog
+from common import pagination
+from common.pagination import EstimatedCountPaginator, plan_row_estimate
+from common.utils.distance import calculate_distance, haversine_km
+from common.utils.hyperloglog import HyperLogLog
+
+
+def create_logs(count, action='USER_LOGIN'):
+    ActivityLog.objects.bulk_create(
+        ActivityLog(action=action, description=f"entry {i}") for i in range(count)
+    )
+
+
+class HaversineTests(TestCase):
+    def test_matches_the_scalar_distance_in_order(self):
+        points = [(23.8103, 90.4125), (22.3569, 91.7832), (24.8949, 91.8687), (23.7, 90.4)]
+        distances = haversine_km(23.7, 90.4, [p[0] for p in points], [p[1] for p in points])
+        for (lat, lon), distance in zip(points, distances):
+            self.assertAlmostEqual(round(float(distance), 2), calculate_distance(23.7, 90.4, lat, lon), places=2)
+        self.assertEqual(distances[-1], 0)
+
+    def test_missing_coordinates_are_nan(self):
+        distances = haversine_km(23.7, 90.4, [None, 23.8], np.array([90.4, 90.4]))
+        self.assertTrue(math.isnan(distances[0]))
+        self.assertFalse(math.isnan(distances[1]))
+
+    def test_origin_without_coordinates_is_out_of_range(self):
+        distances = haversine_km(None, 90.4, [23.8, None], [90.4, 90.4])
+        self.assertEqual(distances.tolist(), [math.inf, math.inf])
+        self.assertFalse((distances <= 50).any())
+
+
+class HyperLogLogTests(TestCase):
+    def test_small_counts_are_exact(self):
+        sketch = HyperLogLog()
+        sketch.update(f"session:{i}" for i in range(100))
+        sketch.update(f"session:{i}" for i in range(50))
+        self.assertEqual(sketch.count(), 100)
+
+    def test_large_count_within_error(self):
+        sketch = HyperLogLog()
+        sketch.update(range(50000))
+        # Three standard errors of 1.6%.
+        self.assertLess(abs(sketch.count() - 50000) / 50000, 0.05)
+
+    def test_merge_counts_the_union(self):
+        monday, tuesday = HyperLogLog(), HyperLogLog()
+        monday.update(range(0, 3000))
+        tuesday.update(range(2000, 5000))
+        union = HyperLogLog()
+        union.update(range(5000))
+        self.assertEqual(HyperLogLog.merged([monday, tuesday]).registers, union.registers)
+
+    def test_bytes_round_trip(self):
+        sketch = HyperLogLog(precision=10)
+        sketch.update(['user:1', 'session:abc'])
+        restored = HyperLogLog.from_bytes(sketch.to_bytes())
+        self.assertEqual(restored.precision, 10)
+        self.assertEqual(restored.registers, sketch.registers)
+        self.assertEqual(HyperLogLog.from_bytes(b'').count(), 0)
+
+    def test_different_precisions_do_not_merge(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+
+
+class PlanRowEstimateTests(TestCase):
+    plan = {'Plan': {'Node Type': 'Seq Scan', 'Plan Rows': 1234}}
+
+    def test_decoded_json_column(self):
+        # What psycopg returns for EXPLAIN (FORMAT JSON).
+        self.assertEqual(plan_row_estimate([self.plan]), 1234)
+
+    def test_json_text(self):
+        self.assertEqual(plan_row_estimate('[{"Plan": {"Plan Rows": 1234.0}}]'), 1234)
+
+    def test_single_plan_object(self):
+        self.assertEqual(plan_row_estimate(self.plan), 1234)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        create_logs(45)
+        self.queryset = ActivityLog.objects.order_by('-created_at', '-id')
+
+    def paginator(self, queryset, table_rows, filtered_rows=None):
+        patches = [mock.patch.object(pagination, 'table_row_estimate', return_value=table_rows)]
+        if filtered_rows is not None:
+            patches.append(mock.patch.object(pagination, 'queryset_row_estimate', return_value=filtered_rows))
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        return EstimatedCountPaginator(queryset, 10, threshold=30)
+
+    def test_exact_count_without_estimate(self):
+        paginator = self.paginator(self.queryset, None)
+        self.assertEqual(paginator.count, 45)
+        self.assertFalse(paginator.count_is_estimated)
+
+    def test_exact_count_below_threshold(self):
+        paginator = self.paginator(self.queryset, 20)
+        self.assertEqual(paginator.count, 45)
+        self.assertFalse(paginator.count_is_estimated)
+
+    def test_unfiltered_queryset_uses_table_estimate(self):
+        paginator = self.paginator(self.queryset, 40)
+        self.assertEqual(paginator.count, 40)
+        self.assertTrue(paginator.count_is_estimated)
+
+    def test_selective_filter_counts_exactly(self):
+        paginator = self.paginator(self.queryset.filter(action='USER_LOGIN'), 40, filtered_rows=5)
+        self.assertEqual(paginator.count, 45)
+        self.assertFalse(paginator.count_is_estimated)
+
+    def test_broad_filter_uses_explain_estimate(self):
+        paginator = self.paginator(self.queryset.filter(action='USER_LOGIN'), 40, filtered_rows=35)
+        self.assertEqual(paginator.count, 35)
+        self.assertTrue(paginator.count_is_estimated)
+
+    def test_pages_past_estimate_stay_reachable(self):
+        paginator = self.paginator(self.queryset, 30)
+        self.assertEqual(paginator.num_pages, 3)
+        page = paginator.page(4)
+        self.assertEqual(len(page), 10)
+        self.assertTrue(page.has_next())
+        last = paginator.page(5)
+        self.assertEqual(len(last), 5)
+        self.assertFalse(last.has_next())
+        with self.assertRaises(EmptyPage):
+            paginator.page(6)
+
+
+@skipUnless(connection.vendor == 'postgresql', "planner estimates need PostgreSQL")
+class PostgresRowEstimateTests(TestCase):
+    def test_estimates_from_the_planner(self):
+        create_logs(50)
+        create_logs(50, action='USER_LOGOUT')
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE activity_logs")
+        self.assertGreater(pagination.table_row_estimate(ActivityLog), 0)
+        estimate = pagination.queryset_row_estimate(ActivityLog.objects.filter(action='USER_LOGIN'))
+        self.assertIsInstance(estimate, int)
+        self.assertGreater(estimate, 0)
+
+    def test_filtered_paginator(self):
+        create_logs(50)
+        paginator = EstimatedCountPaginator(
+            ActivityLog.objects.filter(action='USER_LOGIN').order_by('-created_at'), 10, threshold=1,
+        )
+        self.assertGreater(paginator.count, 0)
+        self.assertEqual(len(paginator.page(1)), 10)
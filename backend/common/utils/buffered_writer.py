@@ -0,0 +1,79 @@
+import atexit
+import logging
+import threading
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedWriter:
+    """Collect items in memory and hand them to `flush_callback` in batches.
+
+    A daemon thread flushes whenever `max_batch_size` items are waiting or
+    `flush_interval` seconds have passed, and a final flush runs at
+    interpreter shutdown. The thread starts on first use so forked worker
+    processes each get their own. With `enabled=False` every item is
+    flushed inline, which keeps tests and management commands synchronous.
+    """
+
+    def __init__(self, name, flush_callback, max_batch_size=500, flush_interval=2.0, enabled=True):
+        self.name = name
+        self.flush_callback = flush_callback
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+
+        self._items = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def put(self, item):
+        if not self.enabled:
+            self._write([item])
+            return
+
+        with self._lock:
+            self._items.append(item)
+            full = len(self._items) >= self.max_batch_size
+        self._ensure_started()
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write everything buffered so far; safe to call from any thread."""
+        with self._flush_lock:
+            with self._lock:
+                items, self._items = self._items, []
+            if items:
+                self._write(items)
+
+    def pending(self):
+        with self._lock:
+            return len(self._items)
+
+    def _write(self, items):
+        try:
+            self.flush_callback(items)
+        except Exception:
+            logger.exception("%s: failed to flush %d buffered items", self.name, len(items))
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            # The flusher owns its own DB connection; don't let it go stale.
+            close_old_connections()
@@ -1,11 +1,15 @@
 import math
+import numpy as np
+
+# Earth radius in kilometers
+EARTH_RADIUS_KM = 6371
+
 
 def calculate_distance(lat1, lon1, lat2, lon2):
     if None in [lat1, lon1, lat2, lon2]:
         return None 
     
-    # Earth radius in kilometers
-    R = 6371  
+    R = EARTH_RADIUS_KM
 
     lat1_rad, lon1_rad = math.radians(float(lat1)), math.radians(float(lon1))
     lat2_rad, lon2_rad = math.radians(float(lat2)), math.radians(float(lon2))
@@ -16,4 +20,33 @@ def calculate_distance(lat1, lon1, lat2, lon2):
     a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
     c = 2 * math.asin(math.sqrt(a))
     distance = R * c
-    return round(distance, 2)
\ No newline at end of file
+    return round(distance, 2)
+
+
+def _to_radians(values):
+    if isinstance(values, np.ndarray):
+        return np.radians(values.astype(np.float64, copy=False))
+    return np.radians(np.array(
+        [np.nan if value is None else float(value) for value in values],
+        dtype=np.float64,
+    ))
+
+
+def haversine_km(lat, lon, latitudes, longitudes):
+    """Unrounded distances (km) from one origin to many points as a NumPy array.
+
+    Points without coordinates come back as NaN. An origin without
+    coordinates is infinitely far from every point.
+    """
+    lats_rad = _to_radians(latitudes)
+    lons_rad = _to_radians(longitudes)
+    if lat is None or lon is None:
+        return np.full(lats_rad.shape, np.inf)
+    lat_rad, lon_rad = math.radians(float(lat)), math.radians(float(lon))
+
+    a = (
+        np.sin((lats_rad - lat_rad) / 2) ** 2
+        + math.cos(lat_rad) * np.cos(lats_rad) * np.sin((lons_rad - lon_rad) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
@@ -0,0 +1,15 @@
+import math
+
+# Mean length of one degree of latitude in kilometers.
+KM_PER_DEGREE = 111.32
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Return (min_lat, max_lat, min_lon, max_lon) enclosing a radius around a coordinate."""
+    lat, lon = float(latitude), float(longitude)
+    dlat = radius_km / KM_PER_DEGREE
+    # Degrees of longitude get shorter towards the poles, so widen the span.
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    dlon = radius_km / (KM_PER_DEGREE * cos_lat)
+    return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
@@ -1,3 +1,49 @@
-from django.shortcuts import render
+import base64
+import binascii
+import json
 
-# Create your views here.
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+
+class NearbySearchMixin:
+    """Shared query parameter handling for the nearby-search endpoints."""
+
+    def get_radius_km(self):
+        value = self.request.query_params.get('radius_km')
+        if value in (None, ''):
+            return settings.NEARBY_DEFAULT_RADIUS_KM
+        try:
+            radius_km = float(value)
+        except (TypeError, ValueError):
+            raise ValidationError({"radius_km": "Must be a number."})
+        if radius_km <= 0:
+            raise ValidationError({"radius_km": "Must be greater than zero."})
+        return min(radius_km, settings.NEARBY_MAX_RADIUS_KM)
+
+    def get_limit(self):
+        value = self.request.query_params.get('k')
+        if value in (None, ''):
+            return settings.NEARBY_DEFAULT_K
+        try:
+            limit = int(value)
+        except (TypeError, ValueError):
+            raise ValidationError({"k": "Must be an integer."})
+        if limit <= 0:
+            raise ValidationError({"k": "Must be greater than zero."})
+        return min(limit, settings.NEARBY_MAX_K)
+
+    def get_cursor(self):
+        """Decode the `cursor` parameter into the last position the client has seen."""
+        value = self.request.query_params.get('cursor')
+        if not value:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(value.encode()).decode())
+            return float(position['d']), int(position['r']), int(position['id'])
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+            raise ValidationError({"cursor": "Invalid cursor."})
+
+    def encode_cursor(self, distance_km, rank, pk):
+        position = json.dumps({'d': distance_km, 'r': rank, 'id': pk}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(position.encode()).decode()
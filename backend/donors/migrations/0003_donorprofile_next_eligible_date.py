@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:22
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+DONATION_INTERVAL_DAYS = 90
+
+
+def backfill_next_eligible_date(apps, schema_editor):
+    DonorProfile = apps.get_model('donors', 'DonorProfile')
+    profiles = DonorProfile.objects.only('id', 'last_donation_date', 'created_at')
+
+    batch = []
+    for profile in profiles.iterator(chunk_size=2000):
+        if profile.last_donation_date:
+            profile.next_eligible_date = profile.last_donation_date + timedelta(days=DONATION_INTERVAL_DAYS)
+        else:
+            profile.next_eligible_date = profile.created_at.date()
+        batch.append(profile)
+        if len(batch) >= 2000:
+            DonorProfile.objects.bulk_update(batch, ['next_eligible_date'])
+            batch = []
+    if batch:
+        DonorProfile.objects.bulk_update(batch, ['next_eligible_date'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donors', '0002_alter_donationrecord_blood_bank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donorprofile',
+            name='next_eligible_date',
+            field=models.DateField(blank=True, editable=False, help_text='First date the donor may donate again, kept in sync with last_donation_date', null=True),
+        ),
+        migrations.RunPython(backfill_next_eligible_date, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='donorprofile',
+            name='donor_profi_blood_g_7934ab_idx',
+        ),
+        migrations.AddIndex(
+            model_name='donorprofile',
+            index=models.Index(fields=['blood_group', 'is_available', 'next_eligible_date'], name='donor_profi_blood_g_b82555_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bloodbanks', '0002_bloodbank_is_verified_bloodbank_license_document_and_more'),
+        ('bloodrequests', '0003_bloodrequest_blood_reque_created_4dd250_idx_and_more'),
+        ('donors', '0003_donorprofile_next_eligible_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donationrecord',
+            index=models.Index(fields=['donation_date', 'id'], name='donation_re_donatio_51aeb7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donationrecord',
+            index=models.Index(fields=['blood_bank', 'donation_date'], name='donation_re_blood_b_593271_idx'),
+        ),
+    ]
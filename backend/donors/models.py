@@ -1,11 +1,30 @@
 from django.db import models
 from django.core.validators import MinValueValidator
+from datetime import timedelta
 from decimal import Decimal
 from django.utils import timezone
 from accounts.models import User
 from locations.models import Location
 import uuid
 
+# Minimum number of days between two whole-blood donations.
+DONATION_INTERVAL_DAYS = 90
+
+
+class DonorProfileQuerySet(models.QuerySet):
+    def with_details(self):
+        """Load every relation DonorProfileSerializer renders in the same query."""
+        return self.select_related('user__created_by', 'location', 'verified_by__created_by')
+
+
+class DonationRecordQuerySet(models.QuerySet):
+    def with_details(self):
+        """Load every relation DonationRecordSerializer renders in the same query."""
+        return self.select_related(
+            'donor__user__created_by', 'donor__location', 'donor__verified_by__created_by',
+            'collected_by__created_by',
+        )
+
 class DonorProfile(models.Model):
     BLOOD_GROUP_CHOICES = (
         ('A+', 'A+'),
@@ -36,6 +55,10 @@ class DonorProfile(models.Model):
         blank=True, null=True
     )
     last_donation_date = models.DateField(null=True, blank=True)
+    next_eligible_date = models.DateField(
+        null=True, blank=True, editable=False,
+        help_text="First date the donor may donate again, kept in sync with last_donation_date"
+    )
     medical_conditions = models.TextField(
         blank=True,
         help_text="Any medical conditions that might affect donation"
@@ -62,11 +85,13 @@ class DonorProfile(models.Model):
     verified_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='verified_donors')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    objects = DonorProfileQuerySet.as_manager()
+
     class Meta:
         db_table = 'donor_profiles'
         indexes = [
-            models.Index(fields=['blood_group', 'is_available']),
+            models.Index(fields=['blood_group', 'is_available', 'next_eligible_date']),
             models.Index(fields=['location', 'blood_group']),
         ]
     
@@ -76,19 +101,27 @@ class DonorProfile(models.Model):
     def full_name(self):
         return f"{self.user.first_name} {self.user.last_name}"
     
+    def compute_next_eligible_date(self):
+        if self.last_donation_date:
+            return self.last_donation_date + timedelta(days=DONATION_INTERVAL_DAYS)
+        # Never donated: eligible since the profile was created.
+        return self.created_at.date() if self.created_at else timezone.now().date()
+
     def can_donate(self):
-        if not self.last_donation_date:
-            return True
-        days_since_last_donation = (timezone.now().date() - self.last_donation_date).days
-        return days_since_last_donation >= 90
+        return self.days_until_eligible() == 0
     
     def days_until_eligible(self):
-        if not self.last_donation_date:
-            return 0
-        days_since = (timezone.now().date() - self.last_donation_date).days
-        remaining = 90 - days_since
+        next_eligible_date = self.next_eligible_date or self.compute_next_eligible_date()
+        remaining = (next_eligible_date - timezone.now().date()).days
         return max(0, remaining)
 
+    def save(self, *args, **kwargs):
+        self.next_eligible_date = self.compute_next_eligible_date()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'last_donation_date' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'next_eligible_date'}
+        super().save(*args, **kwargs)
+
 
 class DonationRecord(models.Model):
     STATUS_CHOICES = (
@@ -113,14 +146,31 @@ class DonationRecord(models.Model):
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    # Fields DonationStatistics counts donations by.
+    STATISTICS_FIELDS = ('status', 'donation_date', 'blood_group')
+
+    objects = DonationRecordQuerySet.as_manager()
+
     class Meta:
         db_table = 'donation_records'
         ordering = ['-donation_date']
         indexes = [
             models.Index(fields=['donor', 'donation_date']),
             models.Index(fields=['status', 'donation_date']),
+            # Newest-first listings and their keyset pages.
+            models.Index(fields=['donation_date', 'id']),
+            models.Index(fields=['blood_bank', 'donation_date']),
         ]
     
     def __str__(self):
-        return f"Donation {self.donation_id} - {self.donor.user.get_full_name()}"
\ No newline at end of file
+        return f"Donation {self.donation_id} - {self.donor.user.get_full_name()}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so signals can tell which daily statistics a save moves.
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.STATISTICS_FIELDS
+        }
+        return instance
\ No newline at end of file
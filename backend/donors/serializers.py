@@ -1,11 +1,15 @@
 from rest_framework import serializers
 from donors.models import DonorProfile, DonationRecord
-from accounts.serializers import UserSerializer
+from accounts.serializers import UserLocationListSerializer, UserSerializer
 from locations.serializers import LocationSerializer
 from accounts.models import User
 from locations.models import Location
 
 
+class DonorProfileListSerializer(UserLocationListSerializer):
+    user_paths = (('user',), ('verified_by',))
+
+
 class DonorProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     location = LocationSerializer(required=False, allow_null=True)
@@ -20,6 +24,7 @@ class DonorProfileSerializer(serializers.ModelSerializer):
         model = DonorProfile
         fields = '__all__'
         read_only_fields = ['user', 'is_verified', 'verified_at', 'verified_by']
+        list_serializer_class = DonorProfileListSerializer
 
     def get_can_donate(self, obj):
         return obj.is_available and obj.can_donate()
@@ -55,16 +60,13 @@ class DonorProfileSerializer(serializers.ModelSerializer):
         location_data = validated_data.pop('location', None)
 
         if location_data:
-            if instance.location:
-                location_serializer = LocationSerializer(
-                    instance.location, data=location_data, partial=True
-                )
-                location_serializer.is_valid(raise_exception=True)
-                location_serializer.save()
-            else:
-                location_serializer = LocationSerializer(data=location_data)
-                location_serializer.is_valid(raise_exception=True)
-                instance.location = location_serializer.save()
+            location_serializer = LocationSerializer(
+                instance.location, data=location_data, partial=bool(instance.location)
+            )
+            location_serializer.is_valid(raise_exception=True)
+            instance.location = Location.objects.replace_address(
+                instance.location, location_serializer.validated_data
+            )
         
         request = self.context.get('request')
         user_data = request.data.get('user') if request else None
@@ -81,6 +83,10 @@ class DonorProfileSerializer(serializers.ModelSerializer):
         return instance
 
 
+class DonationRecordListSerializer(UserLocationListSerializer):
+    user_paths = (('donor', 'user'), ('donor', 'verified_by'), ('collected_by',))
+
+
 class DonationRecordSerializer(serializers.ModelSerializer):
     donor = DonorProfileSerializer(read_only=True)
     collected_by = UserSerializer(read_only=True)
@@ -88,6 +94,7 @@ class DonationRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = DonationRecord
         fields = '__all__'
+        list_serializer_class = DonationRecordListSerializer
 
     def create(self, validated_data):
         user = self.context['request'].user
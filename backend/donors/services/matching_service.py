@@ -0,0 +1,207 @@
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from common.utils.distance import haversine_km
+from donors.models import DonorProfile
+
+# Donor groups whose red cells each recipient group can receive.
+COMPATIBLE_DONOR_GROUPS = {
+    'O-': ('O-',),
+    'O+': ('O+', 'O-'),
+    'A-': ('A-', 'O-'),
+    'A+': ('A+', 'A-', 'O+', 'O-'),
+    'B-': ('B-', 'O-'),
+    'B+': ('B+', 'B-', 'O+', 'O-'),
+    'AB-': ('AB-', 'A-', 'B-', 'O-'),
+    'AB+': ('AB+', 'AB-', 'A+', 'A-', 'B+', 'B-', 'O+', 'O-'),
+}
+
+# preferred_donation_time values, encoded as small ints in the index.
+TIME_SLOTS = ('ANYTIME', 'MORNING', 'AFTERNOON', 'EVENING')
+
+# Score weights (out of 100): closeness relative to how far the donor is
+# willing to travel, keeping exact-group donors first so universal donors
+# stay free for requests that need them, and matching the preferred slot.
+DISTANCE_WEIGHT = 60
+EXACT_GROUP_WEIGHT = 25
+TIME_SLOT_WEIGHT = 15
+
+
+def time_slot_for(moment):
+    """Return the preferred_donation_time slot a datetime falls into, or None."""
+    hour = timezone.localtime(moment).hour if timezone.is_aware(moment) else moment.hour
+    if 8 <= hour < 12:
+        return 'MORNING'
+    if 12 <= hour < 17:
+        return 'AFTERNOON'
+    if 17 <= hour < 20:
+        return 'EVENING'
+    return None
+
+
+class DonorMatchIndex:
+    """Per-blood-group NumPy arrays of available donors with coordinates.
+
+    Built with one query and kept in memory until a donor profile or
+    location is saved or deleted, or the index is older than
+    MATCHING_INDEX_TTL_SECONDS, so a match only touches the arrays of
+    compatible groups. Invalidation bumps a version in the Django cache,
+    so with a shared cache (CACHE_URL) every process rebuilds, not just
+    the one that saved.
+    """
+    VERSION_KEY = 'donors:match-index-version'
+
+    def __init__(self):
+        self._groups = None
+        self._version = None
+        self._built_at = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._groups = None
+        try:
+            cache.incr(self.VERSION_KEY)
+        except ValueError:
+            cache.add(self.VERSION_KEY, 1, timeout=None)
+
+    def is_stale(self, version):
+        return (
+            self._groups is None
+            or self._version != version
+            or time.monotonic() - self._built_at > settings.MATCHING_INDEX_TTL_SECONDS
+        )
+
+    def groups(self):
+        version = cache.get(self.VERSION_KEY, 0)
+        if self.is_stale(version):
+            with self._lock:
+                if self.is_stale(version):
+                    self._groups = self.build()
+                    self._version = version
+                    self._built_at = time.monotonic()
+        return self._groups
+
+    def build(self):
+        rows = DonorProfile.objects.filter(
+            is_available=True,
+            location__latitude__isnull=False,
+            location__longitude__isnull=False,
+        ).exclude(blood_group='').values_list(
+            'id', 'blood_group', 'location__latitude', 'location__longitude',
+            'willing_to_travel_km', 'preferred_donation_time', 'next_eligible_date',
+        )
+
+        columns = {}
+        for donor_id, group, lat, lon, travel_km, slot, next_eligible in rows.iterator(chunk_size=5000):
+            eligible_from = next_eligible.toordinal() if next_eligible else 0
+            columns.setdefault(group, []).append((
+                donor_id, float(lat), float(lon), travel_km,
+                TIME_SLOTS.index(slot) if slot in TIME_SLOTS else 0, eligible_from,
+            ))
+
+        groups = {}
+        for group, values in columns.items():
+            ids, lats, lons, travel, slots, eligible = zip(*values)
+            groups[group] = {
+                'ids': np.array(ids, dtype=np.int64),
+                'lat': np.array(lats, dtype=np.float64),
+                'lon': np.array(lons, dtype=np.float64),
+                'travel_km': np.array(travel, dtype=np.float64),
+                'slot': np.array(slots, dtype=np.int8),
+                'eligible_from': np.array(eligible, dtype=np.int64),
+            }
+        return groups
+
+
+donor_match_index = DonorMatchIndex()
+
+
+def request_location(blood_request):
+    """The Location a request is matched from: its own, else its hospital's."""
+    for location in (blood_request.location, blood_request.hospital and blood_request.hospital.location):
+        if location and location.latitude is not None and location.longitude is not None:
+            return location
+    return None
+
+
+def request_coordinates(blood_request):
+    location = request_location(blood_request)
+    return None if location is None else (location.latitude, location.longitude)
+
+
+def eligible_by(blood_request):
+    """The day a donor must be eligible by to serve a request: its required date, or today."""
+    return max(timezone.localdate(), timezone.localdate(blood_request.required_by_date))
+
+
+def is_eligible_by(donor, day):
+    """Whether a DonorProfile can donate on `day`; the rule the index applies."""
+    return donor.next_eligible_date is None or donor.next_eligible_date <= day
+
+
+def match_donors(blood_request, limit=20):
+    """Rank donors for a BloodRequest.
+
+    Candidates must be ABO/Rh compatible, available, eligible by the
+    request's required date and within their willing_to_travel_km of the
+    request's location. Returns (donor_id, distance_km, score, exact_group)
+    tuples, best first.
+    """
+    coordinates = request_coordinates(blood_request)
+    if coordinates is None:
+        return []
+    lat, lon = coordinates
+
+    needed_by = eligible_by(blood_request)
+    needed_slot = time_slot_for(blood_request.required_by_date)
+    groups = donor_match_index.groups()
+
+    matches = []
+    for group in COMPATIBLE_DONOR_GROUPS.get(blood_request.blood_group, ()):
+        arrays = groups.get(group)
+        if arrays is None:
+            continue
+
+        distances = haversine_km(lat, lon, arrays['lat'], arrays['lon'])
+        mask = (arrays['eligible_from'] <= needed_by.toordinal()) & (distances <= arrays['travel_km'])
+        if not mask.any():
+            continue
+
+        travel_km = np.maximum(arrays['travel_km'][mask], 1)
+        closeness = 1 - np.minimum(distances[mask] / travel_km, 1)
+        scores = DISTANCE_WEIGHT * closeness
+        exact = group == blood_request.blood_group
+        if exact:
+            scores += EXACT_GROUP_WEIGHT
+        slots = arrays['slot'][mask]
+        slot_match = slots == 0
+        if needed_slot:
+            slot_match |= slots == TIME_SLOTS.index(needed_slot)
+        scores = scores + TIME_SLOT_WEIGHT * slot_match
+
+        matches.append((arrays['ids'][mask], distances[mask], scores, exact))
+
+    if not matches:
+        return []
+
+    ids = np.concatenate([m[0] for m in matches])
+    distances = np.concatenate([m[1] for m in matches])
+    scores = np.concatenate([m[2] for m in matches])
+    exact = np.concatenate([np.full(len(m[0]), m[3]) for m in matches])
+
+    # Partial selection keeps the ranking O(n) for large candidate sets.
+    if len(scores) > limit:
+        top = np.argpartition(-scores, limit - 1)[:limit]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.lexsort((distances[top], -scores[top]))]
+
+    return [
+        (int(ids[i]), round(float(distances[i]), 2), round(float(scores[i]), 2), bool(exact[i]))
+        for i in top
+    ]
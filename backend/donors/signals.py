@@ -1,16 +1,51 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from donors.models import DonationRecord
-from analytics.services.statistics_service import generate_daily_statistics
+from donors.models import DonationRecord, DonorProfile
+from locations.models import Location
+from donors.services.matching_service import donor_match_index
+from analytics.services.statistics_service import (
+    adjust_daily_statistics, current_statistics_values, donation_statistics_key,
+    previous_statistics_values, record_donation_change, remember_statistics_values, statistics_day,
+)
+
+
+def donation_key(values):
+    return donation_statistics_key(values.get('status'), values.get('donation_date'), values.get('blood_group'))
 
 
 @receiver(pre_save, sender=DonationRecord)
+@receiver(pre_delete, sender=DonationRecord)
 def check_status_change(sender, instance, **kwargs):
-    if not instance.pk:
-        return 
+    # Capture the previous values before the row is overwritten.
+    previous_statistics_values(instance)
+
+
+@receiver(post_save, sender=DonationRecord)
+def update_donation_statistics(sender, instance, created, **kwargs):
+    old = None if created else donation_key(previous_statistics_values(instance))
+    record_donation_change(old, donation_key(current_statistics_values(instance)))
+    remember_statistics_values(instance)
+
+
+@receiver(post_delete, sender=DonationRecord)
+def remove_donation_statistics(sender, instance, **kwargs):
+    record_donation_change(donation_key(previous_statistics_values(instance)), None)
+
+
+@receiver(post_save, sender=DonorProfile)
+def count_new_donor(sender, instance, created, **kwargs):
+    if created:
+        adjust_daily_statistics(statistics_day(instance.created_at), new_donors=1)
+
+
+@receiver(post_delete, sender=DonorProfile)
+def uncount_donor(sender, instance, **kwargs):
+    adjust_daily_statistics(statistics_day(instance.created_at), new_donors=-1)
 
-    old = DonationRecord.objects.get(pk=instance.pk)
 
-    if old.status != instance.status and instance.status == "COMPLETED":
-        day = instance.donation_date.date()
-        generate_daily_statistics(day)
\ No newline at end of file
+@receiver(post_save, sender=DonorProfile)
+@receiver(post_delete, sender=DonorProfile)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_match_index(sender, instance, **kwargs):
+    donor_match_index.invalidate()
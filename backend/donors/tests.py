@@ -1,3 +1,148 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import HospitalProfile, User
+from bloodbanks.models import BloodBank
+from bloodrequests.models import BloodRequest
+from donors.models import DONATION_INTERVAL_DAYS, DonationRecord, DonorProfile
+from donors.services.matching_service import donor_match_index, match_donors
+from locations.models import Location
+
+
+def make_location(name, latitude, longitude):
+    return Location.objects.get_or_create_for_address(
+        address_line1=name, police_station='Dhanmondi', city='Dhaka', state='Dhaka',
+        postal_code='1205', latitude=latitude, longitude=longitude,
+    )
+
+
+class DonorMatchingTests(TestCase):
+    def setUp(self):
+        donor_match_index.invalidate()
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password=None, role='ADMIN')
+        self.hospital_site = make_location('Hospital', 23.7500, 90.3700)
+        self.request = BloodRequest.objects.create(
+            requester_type='RECEIVER', requested_by=self.admin, patient_name='Patient', patient_age=40,
+            blood_group='A+', units_required=1, reason='Surgery', location=self.hospital_site,
+            required_by_date=timezone.now() + timedelta(days=10),
+        )
+
+    def make_donor(self, name, blood_group='A+', km_north=1.0, last_donation_days_ago=None, **fields):
+        user = User.objects.create_user(username=name, email=f'{name}@example.com', password=None, role='DONOR')
+        last_donation = None
+        if last_donation_days_ago is not None:
+            last_donation = timezone.localdate() - timedelta(days=last_donation_days_ago)
+        return DonorProfile.objects.create(
+            user=user, blood_group=blood_group, gender='M', last_donation_date=last_donation,
+            location=make_location(f'{name} home', 23.7500 + km_north / 111.2, 90.3700), **fields,
+        )
+
+    def match_ids(self, limit=20):
+        return [donor_id for donor_id, *_ in match_donors(self.request, limit=limit)]
+
+    def get_matches(self, user, limit=20):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(f'/api/requests/{self.request.pk}/matches/', {'limit': limit})
+
+    def view_matches(self, limit=20):
+        response = self.get_matches(self.admin, limit)
+        self.assertEqual(response.status_code, 200)
+        return [match['donor_id'] for match in response.json()['matches']]
+
+    def test_ranks_compatible_donors_within_travel_range(self):
+        near = self.make_donor('near', km_north=1)
+        universal = self.make_donor('universal', blood_group='O-', km_north=1)
+        far = self.make_donor('far', km_north=3)
+        self.make_donor('incompatible', blood_group='B+', km_north=1)
+        self.make_donor('too_far', km_north=30)
+        self.make_donor('unavailable', is_available=False)
+        self.assertEqual(self.match_ids(), [near.id, far.id, universal.id])
+
+    def test_donor_eligible_by_the_required_date_is_kept(self):
+        # Eligible in 5 days, the request is needed in 10.
+        soon = self.make_donor('soon', last_donation_days_ago=DONATION_INTERVAL_DAYS - 5)
+        self.make_donor('later', last_donation_days_ago=DONATION_INTERVAL_DAYS - 20)
+        self.assertEqual(self.match_ids(), [soon.id])
+        self.assertEqual(self.view_matches(), [soon.id])
+
+    def test_view_fills_limit_when_the_index_is_stale(self):
+        donors = [self.make_donor(f'donor{i}', km_north=1 + i / 10) for i in range(4)]
+        self.match_ids()  # builds the index
+        # Bypasses the signals, like the donation-complete flow's update().
+        DonorProfile.objects.filter(id=donors[0].id).update(is_available=False)
+        self.assertEqual(self.view_matches(limit=2), [donors[1].id, donors[2].id])
+
+    def test_view_requeries_when_most_of_the_index_is_stale(self):
+        donors = [self.make_donor(f'donor{i}', km_north=1 + i / 10) for i in range(5)]
+        self.match_ids()
+        # Three of the four donors over-fetched for limit=2 are stale.
+        DonorProfile.objects.filter(id__in=[donor.id for donor in donors[:3]]).update(is_available=False)
+        with mock.patch.object(donor_match_index, 'invalidate', wraps=donor_match_index.invalidate) as invalidate:
+            self.assertEqual(self.view_matches(limit=2), [donors[3].id, donors[4].id])
+        invalidate.assert_called_once_with()
+
+    def test_hospitals_and_blood_banks_see_only_their_requests(self):
+        def user(name, role):
+            return User.objects.create_user(username=name, email=f'{name}@example.com', password=None, role=role)
+
+        hospital, other_hospital = user('hospital', 'HOSPITAL'), user('other_hospital', 'HOSPITAL')
+        bank, other_bank = user('bank', 'BLOOD_BANK'), user('other_bank', 'BLOOD_BANK')
+        self.request.hospital = HospitalProfile.objects.create(user=hospital, registration_number='H-1')
+        self.request.assigned_blood_bank = BloodBank.objects.create(
+            name='Bank', location=self.hospital_site, storage_capacity=100, managed_by=bank,
+        )
+        self.request.save()
+
+        self.assertEqual(self.get_matches(hospital).status_code, 200)
+        self.assertEqual(self.get_matches(bank).status_code, 200)
+        self.assertEqual(self.get_matches(other_hospital).status_code, 403)
+        self.assertEqual(self.get_matches(other_bank).status_code, 403)
+
+    def test_location_change_invalidates_the_index(self):
+        donor = self.make_donor('mover', km_north=30)
+        self.assertEqual(self.match_ids(), [])
+        location = donor.location
+        location.latitude = 23.7510
+        location.save()
+        self.assertEqual(self.match_ids(), [donor.id])
+
+
+class DonorListQueryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password=None, role='ADMIN')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def add_donors(self, count):
+        start = DonorProfile.objects.count()
+        for i in range(start, start + count):
+            user = User.objects.create_user(
+                username=f'donor{i}', email=f'donor{i}@example.com', password=None, role='DONOR', created_by=self.admin,
+            )
+            donor = DonorProfile.objects.create(
+                user=user, blood_group='O+', gender='F', location=make_location(f'donor{i} home', 23.75, 90.37),
+                is_verified=True, verified_by=self.admin,
+            )
+            DonationRecord.objects.create(
+                donor=donor, donation_date=timezone.now(), blood_group='O+', collected_by=self.admin,
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
 
-# Create your tests here.
+    def test_query_counts_do_not_grow_with_rows(self):
+        self.add_donors(2)
+        few = [self.count_queries(url) for url in ('/api/donors/profiles/', '/api/donors/records/')]
+        self.add_donors(6)
+        many = [self.count_queries(url) for url in ('/api/donors/profiles/', '/api/donors/records/')]
+        self.assertEqual(many, few)
@@ -2,10 +2,9 @@ from rest_framework import generics, permissions
 from donors.models import DonorProfile, DonationRecord
 from donors.serializers import DonorProfileSerializer, DonationRecordSerializer
 from rest_framework.exceptions import NotFound, PermissionDenied
-from django.db.models import Q
-from datetime import timedelta
 from django.utils import timezone
-from analytics.models import ActivityLog
+from analytics.services.activity_log_service import log_activity
+from common.pagination import CreatedAtCursorPagination, PageNumberOrCursorPagination
 
 class DonorProfileListCreateView(generics.ListCreateAPIView):
     serializer_class = DonorProfileSerializer
@@ -14,15 +13,14 @@ class DonorProfileListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         user = self.request.user
         today = timezone.now().date()
-        ninety_days_ago = today - timedelta(days=90)
 
         if user.role in ["RECEIVER", "HOSPITAL"]:
-            return DonorProfile.objects.filter(
-                Q(last_donation_date__lte=ninety_days_ago) | Q(last_donation_date__isnull=True),
-                is_available=True
+            return DonorProfile.objects.with_details().filter(
+                is_available=True,
+                next_eligible_date__lte=today,
             ).order_by('-id')
         if user.is_superuser or user.role == 'ADMIN':
-            return DonorProfile.objects.all().order_by('-id')
+            return DonorProfile.objects.with_details().order_by('-id')
         return DonorProfile.objects.filter(user=user, user__role='DONOR')
 
     def perform_create(self, serializer):
@@ -60,7 +58,7 @@ class DonorProfileDetailView(generics.RetrieveUpdateDestroyAPIView):
         donor = serializer.instance
         donor_user = donor.user
 
-        ActivityLog.objects.create(
+        log_activity(
             user=user,
             action='DONOR_VERIFIED' if is_verified else 'DONOR_UNVERIFIED',
             description=f"Admin '{user.username}' has {'verified' if is_verified else 'unverified'} donor '{donor_user.username}'.",
@@ -102,22 +100,31 @@ class CurrentDonorProfileView(generics.RetrieveUpdateAPIView):
         return donor_profile
 
 
+class DonationRecordCursorPagination(CreatedAtCursorPagination):
+    ordering = ('-donation_date', '-id')
+
+
+class DonationRecordPagination(PageNumberOrCursorPagination):
+    cursor_pagination_class = DonationRecordCursorPagination
+
+
 class DonationRecordListCreateView(generics.ListCreateAPIView):
     queryset = DonationRecord.objects.all()
     serializer_class = DonationRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DonationRecordPagination
 
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser or user.role == 'ADMIN':
-            return DonationRecord.objects.all().order_by('-id')
+            return DonationRecord.objects.with_details().order_by('-id')
         elif user.role == 'BLOOD_BANK':
             try:
                 blood_bank = user.bloodbank
             except Exception:
                 return DonationRecord.objects.none()
 
-            return DonationRecord.objects.filter(
+            return DonationRecord.objects.with_details().filter(
                 blood_bank=blood_bank
             ).order_by('-id')
         return DonationRecord.objects.none()
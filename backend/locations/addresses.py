@@ -0,0 +1,70 @@
+import hashlib
+import re
+
+from django.db import models
+
+# Fields that make up an address; two locations agreeing on all of them
+# (after normalization) are the same place.
+ADDRESS_FIELDS = ('address_line1', 'police_station', 'city', 'state', 'postal_code', 'country')
+
+
+def normalize_address(address):
+    """Canonical form of an address string: lower case, single spaces, no empty parts."""
+    parts = (re.sub(r'\s+', ' ', part).strip().lower() for part in str(address or '').split(','))
+    return ', '.join(part for part in parts if part)
+
+
+def address_hash(location):
+    """SHA-256 of the normalized address fields of a Location (or any object with them)."""
+    key = '|'.join(normalize_address(getattr(location, field)) for field in ADDRESS_FIELDS)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def location_relations(location_model):
+    """(model, field name) for every foreign key that points at location_model."""
+    return [
+        (rel.related_model, rel.field.name)
+        for rel in location_model._meta.related_objects
+        if isinstance(rel.field, models.ForeignKey)
+    ]
+
+
+def compact_locations(location_model, dry_run=False, batch_size=2000):
+    """Merge locations with the same normalized address and store their hashes.
+
+    In each group of duplicates the oldest row with coordinates (or just the
+    oldest row) is kept, every foreign key is repointed to it and the rest
+    are deleted. Takes the model class so data migrations can pass their
+    historical model. Returns (duplicate groups, rows removed).
+    """
+    groups = {}
+    stale = []
+    rows = location_model._base_manager.order_by('id').only('id', 'latitude', 'longitude', 'address_hash', *ADDRESS_FIELDS)
+    for location in rows.iterator(chunk_size=batch_size):
+        digest = address_hash(location)
+        groups.setdefault(digest, []).append(location)
+        if location.address_hash != digest:
+            location.address_hash = digest
+            stale.append(location)
+
+    relations = location_relations(location_model)
+    duplicate_groups = removed = 0
+    removed_ids = set()
+    for locations in groups.values():
+        if len(locations) < 2:
+            continue
+        keep = next((l for l in locations if l.latitude is not None and l.longitude is not None), locations[0])
+        duplicate_ids = [l.id for l in locations if l.id != keep.id]
+        duplicate_groups += 1
+        removed += len(duplicate_ids)
+        removed_ids.update(duplicate_ids)
+        if dry_run:
+            continue
+        for model, field_name in relations:
+            model._base_manager.filter(**{f'{field_name}__in': duplicate_ids}).update(**{field_name: keep.id})
+        location_model._base_manager.filter(id__in=duplicate_ids).delete()
+
+    if not dry_run:
+        stale = [location for location in stale if location.id not in removed_ids]
+        location_model._base_manager.bulk_update(stale, ['address_hash'], batch_size=batch_size)
+    return duplicate_groups, removed
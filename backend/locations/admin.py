@@ -1,5 +1,11 @@
 from django.contrib import admin
-from .models import Location
+from .models import GeocodeCache, Location
 
 # Register your models here.
-admin.site.register(Location)
\ No newline at end of file
+admin.site.register(Location)
+
+
+@admin.register(GeocodeCache)
+class GeocodeCacheAdmin(admin.ModelAdmin):
+    list_display = ('query', 'latitude', 'longitude', 'hits', 'misses', 'updated_at')
+    search_fields = ('query',)
\ No newline at end of file
@@ -0,0 +1,94 @@
+import csv
+import re
+from functools import lru_cache
+from pathlib import Path
+
+GAZETTEER_PATH = Path(__file__).resolve().parent / 'data' / 'bd_gazetteer.csv'
+
+# Words people add around place names ("Mirpur Thana", "Dhaka City", ...).
+NOISE_WORDS = {'city', 'district', 'division', 'zila', 'zilla', 'thana', 'upazila', 'ps', 'metro', 'model', 'sadar'}
+
+BANGLADESH_NAMES = {'', 'bangladesh', 'bd'}
+
+
+def normalize_place(name):
+    """Lookup key for a place name: lower case letters and digits, without noise words."""
+    words = re.sub(r"[^a-z0-9 ]", ' ', (name or '').lower().replace("'", '')).split()
+    kept = [word for word in words if word not in NOISE_WORDS]
+    # "Dhaka Sadar" -> "dhaka", but a bare "Sadar" stays unmatched.
+    return ' '.join(kept)
+
+
+class Gazetteer:
+    """Approximate centroids of Bangladesh divisions, districts and police stations.
+
+    Everything lives in plain dicts of normalized name -> (latitude, longitude),
+    so a lookup is a handful of hash probes. Police station names repeat
+    across districts (every district town has a "Kotwali"), so they are
+    keyed by (thana, district) and only names that occur once can be
+    matched on their own.
+    """
+
+    def __init__(self, rows):
+        self.divisions = {}
+        self.districts = {}
+        self.thanas = {}
+        self.unique_thanas = {}
+        # Alternative spellings ("Chittagong") -> the name parents use ("chattogram").
+        self.canonical = {}
+
+        thana_counts = {}
+        for kind, name, parent, latitude, longitude, aliases in rows:
+            point = (float(latitude), float(longitude))
+            names = [normalize_place(n) for n in [name, *aliases.split('|')] if n]
+            if kind != 'thana':
+                self.canonical.update((key, names[0]) for key in names[1:])
+            for key in names:
+                if kind == 'division':
+                    self.divisions[key] = point
+                elif kind == 'district':
+                    self.districts[key] = point
+                else:
+                    self.thanas[(key, normalize_place(parent))] = point
+                    thana_counts.setdefault(key, []).append(point)
+
+        self.unique_thanas = {key: points[0] for key, points in thana_counts.items() if len(points) == 1}
+
+    @classmethod
+    def from_csv(cls, path=GAZETTEER_PATH):
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader)
+            return cls([row for row in reader if row])
+
+    def lookup(self, *names):
+        """Return (latitude, longitude) for the most specific match, or None.
+
+        `names` go from most to least specific, e.g.
+        (police_station, city, state).
+        """
+        keys = [normalize_place(name) for name in names]
+        keys = [self.canonical.get(key, key) for key in keys if key]
+
+        for thana, district in zip(keys, keys[1:]):
+            point = self.thanas.get((thana, district))
+            if point:
+                return point
+        for key in keys:
+            point = self.unique_thanas.get(key) or self.districts.get(key) or self.divisions.get(key)
+            if point:
+                return point
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_gazetteer():
+    """The bundled gazetteer, loaded once per process."""
+    return Gazetteer.from_csv()
+
+
+def lookup_location(police_station, city, state='', country=''):
+    """Approximate coordinates for a Bangladesh address, or None."""
+    if normalize_place(country) not in BANGLADESH_NAMES:
+        return None
+    return get_gazetteer().lookup(police_station, city, state)
@@ -0,0 +1,63 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class BaseGeocoder:
+    """Turns one free-form address string into coordinates.
+
+    Backends return a (latitude, longitude) tuple, or None when the address
+    is unknown. Network and service errors are raised to the caller.
+    Backends whose results are only rough centroids set `approximate`.
+    """
+    approximate = False
+
+    def geocode(self, query):
+        raise NotImplementedError
+
+
+class NominatimGeocoder(BaseGeocoder):
+    def __init__(self):
+        from geopy.geocoders import Nominatim
+
+        self.client = Nominatim(
+            user_agent=settings.GEOCODER_USER_AGENT,
+            timeout=settings.GEOCODER_TIMEOUT_SECONDS,
+        )
+
+    def geocode(self, query):
+        location = self.client.geocode(query)
+        if location:
+            return location.latitude, location.longitude
+        return None
+
+
+class NullGeocoder(BaseGeocoder):
+    """Never finds anything; for tests and deployments without network access."""
+
+    def geocode(self, query):
+        return None
+
+
+class GazetteerGeocoder(BaseGeocoder):
+    """Offline lookup in the bundled Bangladesh gazetteer.
+
+    Resolves police stations, districts and divisions to approximate
+    centroids only; street-level parts of the query are ignored.
+    """
+    approximate = True
+
+    def geocode(self, query):
+        from locations.gazetteer import BANGLADESH_NAMES, get_gazetteer, normalize_place
+
+        parts = [part for part in query.split(',') if part.strip()]
+        if len(parts) > 1 and normalize_place(parts[-1]) not in BANGLADESH_NAMES:
+            return None
+        return get_gazetteer().lookup(*parts)
+
+
+@lru_cache(maxsize=None)
+def get_geocoder():
+    """Return the backend configured by GEOCODER_BACKEND (one instance per process)."""
+    return import_string(settings.GEOCODER_BACKEND)()
@@ -0,0 +1,83 @@
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+logger = logging.getLogger(__name__)
+
+
+def geocode_location(location_id):
+    """Geocode one saved Location and store its coordinates, if it still has none.
+
+    Returns the number of requests sent to the geocoder (0 when the
+    location was already done or the cache answered).
+    """
+    from locations.models import Location
+
+    location = Location.objects.filter(pk=location_id).first()
+    if location is None or (location.latitude is not None and location.longitude is not None):
+        return 0
+
+    if not location.geocode_address():
+        logger.warning(f"⚠️ No coordinates found for: {location.get_full_address()}")
+        return location._network_lookups
+
+    # update() rather than save(): only fill in coordinates nobody set meanwhile.
+    Location.objects.filter(pk=location_id, latitude__isnull=True).update(
+        latitude=location.latitude,
+        longitude=location.longitude,
+        coordinates_approximate=location.coordinates_approximate,
+    )
+    return location._network_lookups
+
+
+class GeocodingQueue:
+    """In-process queue of Location ids geocoded by a single background worker.
+
+    Jobs that reach the geocoder are spaced by GEOCODING_DELAY_SECONDS to
+    respect the provider's rate limit; cache hits are not delayed. Jobs still queued when the process exits are lost; the
+    locations keep null coordinates and are picked up by the next
+    batch geocoding run.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def enqueue(self, location_id):
+        with self._lock:
+            if location_id in self._pending:
+                return
+            self._pending.add(location_id)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='geocoding-worker', daemon=True)
+                self._thread.start()
+        self._queue.put(location_id)
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self):
+        while True:
+            location_id = self._queue.get()
+            network_lookups = 1
+            try:
+                network_lookups = geocode_location(location_id)
+            except Exception as e:
+                logger.error(f"💥 Failed to geocode location {location_id}: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(location_id)
+                close_old_connections()
+            if network_lookups:
+                time.sleep(settings.GEOCODING_DELAY_SECONDS)
+
+
+geocoding_queue = GeocodingQueue()
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from locations.addresses import compact_locations, location_relations
+from locations.models import Location
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge locations that share a normalized address: foreign keys are "
+        "repointed to one surviving row and the duplicates are deleted. Also "
+        "refreshes stored address hashes, e.g. after the normalization rules change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be merged.")
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        total = Location.objects.count()
+        relations = ', '.join(f"{model._meta.label}.{field}" for model, field in location_relations(Location))
+        self.stdout.write(f"Scanning {total} locations (referenced by {relations})...")
+
+        with transaction.atomic():
+            groups, removed = compact_locations(Location, dry_run=dry_run, batch_size=options['batch_size'])
+
+        if dry_run:
+            self.stdout.write(f"Would merge {groups} duplicate addresses, removing {removed} of {total} rows.")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Merged {groups} duplicate addresses, removed {removed} of {total} rows."
+            ))
@@ -0,0 +1,147 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import Q
+
+from common.utils.rate_limit import TokenBucket
+from locations.geocoders import BaseGeocoder, get_geocoder
+from locations.models import Location
+
+
+class RateLimitedGeocoder(BaseGeocoder):
+    """Wraps a backend so every request first takes a token from a shared bucket."""
+
+    def __init__(self, geocoder, bucket):
+        self.geocoder = geocoder
+        self.bucket = bucket
+        self.approximate = geocoder.approximate
+
+    def geocode(self, query):
+        self.bucket.acquire()
+        return self.geocoder.geocode(query)
+
+
+class Command(BaseCommand):
+    help = (
+        "Geocode locations that have no coordinates or only approximate (gazetteer) "
+        "ones, using a thread pool behind a shared rate limit. Progress is checkpointed so an interrupted run resumes "
+        "where it stopped, and locations that could not be geocoded are skipped on "
+        "later runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help="Concurrent geocoding threads.")
+        parser.add_argument(
+            '--rate', type=float,
+            help="Maximum geocoder requests per second across all workers; cache hits are free. "
+                 "Defaults to 1 / GEOCODING_DELAY_SECONDS, 0 means unlimited.",
+        )
+        parser.add_argument('--batch-size', type=int, default=200, help="Locations per bulk_update/checkpoint.")
+        parser.add_argument('--limit', type=int, help="Stop after this many locations.")
+        parser.add_argument(
+            '--checkpoint', default='geocode_locations.checkpoint.json',
+            help="JSON file holding the last processed id and the ids that failed.",
+        )
+        parser.add_argument(
+            '--restart', action='store_true',
+            help="Start again from the lowest id, e.g. to retry locations left with approximate coordinates.",
+        )
+        parser.add_argument('--retry-failed', action='store_true', help="Forget the failure list and retry those locations.")
+
+    def handle(self, *args, **options):
+        checkpoint_path = options['checkpoint']
+        checkpoint = self.load_checkpoint(checkpoint_path)
+        if options['restart'] or options['retry_failed']:
+            checkpoint['last_id'] = 0
+        if options['retry_failed']:
+            checkpoint['failed'] = []
+        failed = set(checkpoint['failed'])
+
+        rate = options['rate']
+        if rate is None:
+            delay = settings.GEOCODING_DELAY_SECONDS
+            rate = 1 / delay if delay > 0 else 0
+        geocoder = get_geocoder()
+        if rate > 0:
+            geocoder = RateLimitedGeocoder(geocoder, TokenBucket(rate))
+        batch_size = options['batch_size']
+        limit = options['limit']
+
+        pending = Location.objects.filter(Q(latitude__isnull=True) | Q(coordinates_approximate=True)).order_by('id')
+        self.stdout.write(
+            f"Geocoding up to {pending.filter(id__gt=checkpoint['last_id']).count()} locations "
+            f"(resuming after id {checkpoint['last_id']}, skipping {len(failed)} known failures)..."
+        )
+
+        started = time.monotonic()
+        processed = geocoded = lookups = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            while limit is None or processed < limit:
+                size = batch_size if limit is None else min(batch_size, limit - processed)
+                batch = list(pending.filter(id__gt=checkpoint['last_id'])[:size])
+                if not batch:
+                    break
+
+                locations = [location for location in batch if location.id not in failed]
+                results = list(pool.map(lambda location: self.geocode(location, geocoder), locations))
+
+                done = [location for location, ok, _ in results if ok]
+                Location.objects.bulk_update(done, ['latitude', 'longitude', 'coordinates_approximate'])
+                failed.update(location.id for location, ok, _ in results if not ok)
+
+                processed += len(locations)
+                geocoded += len(done)
+                lookups += sum(n for *_, n in results)
+                checkpoint['last_id'] = batch[-1].id
+                checkpoint['failed'] = sorted(failed)
+                self.save_checkpoint(checkpoint_path, checkpoint)
+
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{processed} processed, {geocoded} geocoded, {processed - geocoded} failed, "
+                    f"{lookups} geocoder requests | {processed / elapsed:.1f} locations/s, "
+                    f"{lookups / elapsed:.2f} requests/s | last id {checkpoint['last_id']}"
+                )
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Done: {geocoded}/{processed} locations geocoded in {elapsed:.1f}s "
+            f"({processed / elapsed if elapsed else 0:.1f} locations/s). "
+            f"{len(failed)} ids in the failure list."
+        ))
+
+    def geocode(self, location, geocoder):
+        """Runs on a worker thread; returns (location, geocoded, geocoder requests made).
+
+        Locations that already have approximate coordinates only count as
+        geocoded once the geocoder finds precise ones.
+        """
+        retrying = location.coordinates_approximate
+        try:
+            ok = location.geocode_address(
+                geocoder=geocoder, approximate=settings.GEOCODER_GAZETTEER_FALLBACK and not retrying,
+            ) and not (retrying and location.coordinates_approximate)
+            return location, ok, location._network_lookups
+        except Exception as e:
+            self.stderr.write(f"💥 Failed to geocode location {location.id}: {e}")
+            return location, False, 0
+        finally:
+            close_old_connections()
+
+    def load_checkpoint(self, path):
+        if not os.path.exists(path):
+            return {'last_id': 0, 'failed': []}
+        with open(path) as f:
+            return json.load(f)
+
+    def save_checkpoint(self, path, checkpoint):
+        # Write-then-rename so a crash never leaves a truncated checkpoint.
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0003_geocodecache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='address_hash',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:02
+
+import hashlib
+import re
+
+from django.db import migrations, models
+
+# A frozen copy of locations.addresses as of this migration, so later
+# changes to the live module cannot change what it does.
+ADDRESS_FIELDS = ('address_line1', 'police_station', 'city', 'state', 'postal_code', 'country')
+
+
+def normalize_address(address):
+    parts = (re.sub(r'\s+', ' ', part).strip().lower() for part in str(address or '').split(','))
+    return ', '.join(part for part in parts if part)
+
+
+def address_hash(location):
+    key = '|'.join(normalize_address(getattr(location, field)) for field in ADDRESS_FIELDS)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def merge_duplicate_locations(apps, schema_editor, batch_size=2000):
+    """Store every location's address hash and merge locations with the same one.
+
+    The oldest row with coordinates (or just the oldest row) of each group
+    is kept, foreign keys are repointed to it and the rest are deleted.
+    """
+    Location = apps.get_model('locations', 'Location')
+    groups = {}
+    rows = Location._base_manager.order_by('id').only('id', 'latitude', 'longitude', *ADDRESS_FIELDS)
+    for location in rows.iterator(chunk_size=batch_size):
+        location.address_hash = address_hash(location)
+        groups.setdefault(location.address_hash, []).append(location)
+
+    relations = [
+        (rel.related_model, rel.field.name)
+        for rel in Location._meta.related_objects
+        if isinstance(rel.field, models.ForeignKey)
+    ]
+    kept = []
+    for locations in groups.values():
+        keep = next((l for l in locations if l.latitude is not None and l.longitude is not None), locations[0])
+        kept.append(keep)
+        duplicate_ids = [l.id for l in locations if l.id != keep.id]
+        if not duplicate_ids:
+            continue
+        for model, field_name in relations:
+            model._base_manager.filter(**{f'{field_name}__in': duplicate_ids}).update(**{field_name: keep.id})
+        Location._base_manager.filter(id__in=duplicate_ids).delete()
+    Location._base_manager.bulk_update(kept, ['address_hash'], batch_size=batch_size)
+
+
+class Migration(migrations.Migration):
+
+    # Every app with a foreign key to Location, so the merge can repoint them.
+    dependencies = [
+        ('locations', '0004_location_address_hash'),
+        ('accounts', '0003_hospitalprofile_verified_at_and_more'),
+        ('bloodbanks', '0002_bloodbank_is_verified_bloodbank_license_document_and_more'),
+        ('bloodrequests', '0002_bloodrequest_cancelled_by_bloodrequest_fulfilled_by_and_more'),
+        ('campaigns', '0001_initial'),
+        ('donors', '0003_donorprofile_next_eligible_date'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # A separate migration (and transaction) from the merge, whose deletes
+    # leave deferred foreign key checks pending until it commits.
+    dependencies = [
+        ('locations', '0005_merge_duplicate_locations'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='location',
+            name='address_hash',
+            field=models.CharField(editable=False, help_text='SHA-256 of the normalized address; one row per address', max_length=64, unique=True),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:17
+
+from django.db import migrations, models
+
+# Frozen copy of the (latitude, longitude) centroids in data/bd_gazetteer.csv
+# when this migration was written.
+GAZETTEER_CENTROIDS = (
+    ('21.4272', '92.0058'), ('22.0953', '90.1121'), ('22.1953', '92.2184'), ('22.2350', '91.7950'),
+    ('22.2900', '91.7850'), ('22.2900', '91.8600'), ('22.3100', '91.8000'), ('22.3250', '91.8050'),
+    ('22.3300', '91.7750'), ('22.3300', '91.8400'), ('22.3350', '91.8350'), ('22.3450', '91.8550'),
+    ('22.3550', '91.8400'), ('22.3569', '91.7832'), ('22.3596', '90.3299'), ('22.3600', '91.8100'),
+    ('22.3650', '91.7900'), ('22.3650', '91.8300'), ('22.3750', '91.7650'), ('22.3750', '91.8550'),
+    ('22.3900', '91.8200'), ('22.5000', '91.8100'), ('22.5841', '89.9720'), ('22.6200', '91.6600'),
+    ('22.6406', '90.1987'), ('22.6516', '89.7859'), ('22.6533', '92.1789'), ('22.6859', '90.6482'),
+    ('22.7010', '90.3535'), ('22.7010', '90.3700'), ('22.7185', '89.0705'), ('22.8150', '89.5450'),
+    ('22.8456', '89.5403'), ('22.8500', '89.5400'), ('22.8696', '91.0995'), ('22.8800', '89.5150'),
+    ('22.9425', '90.8412'), ('23.0050', '89.8266'), ('23.0159', '91.3976'), ('23.1193', '91.9847'),
+    ('23.1641', '90.1897'), ('23.1664', '89.2081'), ('23.1725', '89.5127'), ('23.2333', '90.6713'),
+    ('23.2423', '90.4348'), ('23.4600', '91.1800'), ('23.4607', '91.1809'), ('23.4873', '89.4199'),
+    ('23.5422', '90.5305'), ('23.5450', '89.1726'), ('23.5900', '90.1300'), ('23.6071', '89.8429'),
+    ('23.6238', '90.5000'), ('23.6400', '90.4900'), ('23.6402', '88.8418'), ('23.6667', '90.1500'),
+    ('23.6900', '90.4400'), ('23.6950', '90.3450'), ('23.6950', '90.4350'), ('23.6950', '90.5150'),
+    ('23.7050', '90.4250'), ('23.7090', '90.4100'), ('23.7100', '90.4200'), ('23.7100', '90.4350'),
+    ('23.7160', '90.4010'), ('23.7170', '90.3930'), ('23.7190', '90.3880'), ('23.7200', '90.3700'),
+    ('23.7200', '90.4200'), ('23.7200', '90.4900'), ('23.7320', '90.3650'), ('23.7330', '90.3850'),
+    ('23.7330', '90.4170'), ('23.7330', '90.4300'), ('23.7350', '90.4300'), ('23.7360', '90.4120'),
+    ('23.7380', '90.3960'), ('23.7390', '90.3950'), ('23.7465', '90.3760'), ('23.7480', '90.3830'),
+    ('23.7500', '90.4250'), ('23.7550', '90.4050'), ('23.7574', '89.6445'), ('23.7600', '90.3920'),
+    ('23.7600', '90.4200'), ('23.7622', '88.6318'), ('23.7660', '90.3580'), ('23.7700', '90.4000'),
+    ('23.7748', '90.3580'), ('23.7750', '90.3750'), ('23.7806', '90.4265'), ('23.7900', '90.3500'),
+    ('23.7900', '90.3850'), ('23.7900', '90.5200'), ('23.7925', '90.4078'), ('23.7937', '90.4066'),
+    ('23.8000', '90.4300'), ('23.8050', '90.3550'), ('23.8103', '90.4125'), ('23.8150', '90.3900'),
+    ('23.8200', '90.3550'), ('23.8223', '90.3654'), ('23.8223', '90.4070'), ('23.8280', '90.3640'),
+    ('23.8300', '90.4200'), ('23.8500', '90.4000'), ('23.8583', '90.2667'), ('23.8590', '90.4330'),
+    ('23.8617', '90.0003'), ('23.8759', '90.3795'), ('23.8800', '90.3800'), ('23.8800', '90.4350'),
+    ('23.8980', '90.4050'), ('23.8990', '90.3000'), ('23.9013', '89.1204'), ('23.9100', '90.2150'),
+    ('23.9322', '90.7154'), ('23.9571', '91.1119'), ('23.9999', '90.4203'), ('24.0064', '89.2372'),
+    ('24.0700', '90.2250'), ('24.2000', '90.4800'), ('24.2513', '89.9167'), ('24.3650', '88.6350'),
+    ('24.3700', '88.6000'), ('24.3745', '88.6042'), ('24.3745', '91.4155'), ('24.3750', '88.5800'),
+    ('24.4206', '89.0003'), ('24.4449', '90.7766'), ('24.4534', '89.7007'), ('24.4829', '91.7774'),
+    ('24.5965', '88.2776'), ('24.7471', '90.4203'), ('24.7500', '90.4100'), ('24.7936', '88.9318'),
+    ('24.8465', '89.3773'), ('24.8703', '90.7279'), ('24.8949', '91.8687'), ('24.8950', '91.8700'),
+    ('24.9100', '91.9000'), ('24.9375', '89.9372'), ('25.0205', '90.0153'), ('25.0658', '91.3950'),
+    ('25.0968', '89.0227'), ('25.3288', '89.5281'), ('25.6217', '88.6354'), ('25.7439', '89.2752'),
+    ('25.7450', '89.2500'), ('25.8054', '89.6362'), ('25.9310', '88.8560'), ('25.9923', '89.2847'),
+    ('26.0337', '88.4617'), ('26.3411', '88.5542'),
+)
+
+
+def flag_gazetteer_coordinates(apps, schema_editor):
+    # Rows geocoded before this migration by the gazetteer fallback sit
+    # exactly on one of its centroids; geocoder results practically never do.
+    Location = apps.get_model('locations', 'Location')
+    for latitude, longitude in GAZETTEER_CENTROIDS:
+        Location.objects.filter(latitude=latitude, longitude=longitude).update(coordinates_approximate=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0006_alter_location_address_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='coordinates_approximate',
+            field=models.BooleanField(default=False, editable=False, help_text='The coordinates are a gazetteer centroid of the police station or district'),
+        ),
+        migrations.RunPython(flag_gazetteer_coordinates, migrations.RunPython.noop),
+    ]
@@ -1,11 +1,156 @@
-from django.db import models
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cast, Cos, Least, Power, Radians, Round, Sin, Sqrt
+from django.utils import timezone
+from common.utils.distance import EARTH_RADIUS_KM
+from common.utils.grid import bounding_box
+from locations.addresses import ADDRESS_FIELDS, address_hash, normalize_address
+from locations.gazetteer import lookup_location
+from locations.geocoders import get_geocoder
+from locations.geocoding import geocoding_queue
+from datetime import timedelta
+import math
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def distance_expression(latitude, longitude, prefix=''):
+    """SQL great-circle distance (km, 2 decimals) from a point to `<prefix>latitude/longitude`."""
+    lat_rad = math.radians(float(latitude))
+    lon_rad = math.radians(float(longitude))
+    row_lat = Radians(Cast(F(f'{prefix}latitude'), FloatField()))
+    row_lon = Radians(Cast(F(f'{prefix}longitude'), FloatField()))
+
+    a = (
+        Power(Sin((row_lat - Value(lat_rad)) / 2), 2)
+        + Value(math.cos(lat_rad)) * Cos(row_lat) * Power(Sin((row_lon - Value(lon_rad)) / 2), 2)
+    )
+    # Clamp against float error before asin().
+    distance = Value(2 * EARTH_RADIUS_KM) * ASin(Least(Sqrt(a), Value(1.0)))
+    return Round(distance, 2, output_field=FloatField())
+
+
+def within_radius(queryset, latitude, longitude, radius_km, prefix=''):
+    """Restrict a queryset to rows within radius_km, annotated and ordered by `distance_km`.
+
+    The bounding box lets the database use the (latitude, longitude) index
+    before the exact distance is computed; `prefix` points at the location
+    relation, e.g. 'location__' for profiles.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+    return (
+        queryset
+        .filter(**{
+            f'{prefix}latitude__range': (min_lat, max_lat),
+            f'{prefix}longitude__range': (min_lon, max_lon),
+        })
+        .annotate(distance_km=distance_expression(latitude, longitude, prefix))
+        .filter(distance_km__lte=radius_km)
+        .order_by('distance_km', 'pk')
+    )
+
+
+class GeocodeCache(models.Model):
+    """Geocoder answers keyed by normalized address variant.
+
+    A row without coordinates records that the geocoder found nothing, so
+    unknown addresses are not looked up again until the entry expires.
+    """
+    query = models.CharField(max_length=512, unique=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    hits = models.PositiveIntegerField(default=0, help_text="Lookups answered from the cache")
+    misses = models.PositiveIntegerField(default=0, help_text="Lookups sent to the geocoder")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'geocode_cache'
+
+    def __str__(self):
+        return self.query
+
+    def has_coordinates(self):
+        return self.latitude is not None and self.longitude is not None
+
+    def is_expired(self):
+        if self.has_coordinates():
+            ttl = timedelta(days=settings.GEOCODE_CACHE_TTL_DAYS)
+        else:
+            ttl = timedelta(days=settings.GEOCODE_CACHE_NEGATIVE_TTL_DAYS)
+        return self.updated_at < timezone.now() - ttl
+
+    @classmethod
+    def lookup(cls, query):
+        """Return the fresh entry for a normalized query (counting a hit), or None."""
+        entry = cls.objects.filter(query=query).first()
+        if entry is None or entry.is_expired():
+            return None
+        cls.objects.filter(pk=entry.pk).update(hits=F('hits') + 1)
+        return entry
+
+    @classmethod
+    def store(cls, query, coordinates):
+        """Record the geocoder's answer (None when nothing was found) and count a miss."""
+        latitude, longitude = coordinates or (None, None)
+        entry, created = cls.objects.get_or_create(
+            query=query,
+            defaults={'latitude': latitude, 'longitude': longitude, 'misses': 1},
+        )
+        if not created:
+            # update() so concurrent workers don't lose each other's counts;
+            # updated_at is set explicitly because update() skips auto_now.
+            cls.objects.filter(pk=entry.pk).update(
+                latitude=latitude,
+                longitude=longitude,
+                misses=F('misses') + 1,
+                updated_at=timezone.now(),
+            )
+        return entry
+
+
+class LocationQuerySet(models.QuerySet):
+    def within_radius(self, latitude, longitude, radius_km):
+        return within_radius(self, latitude, longitude, radius_km)
+
+    def get_or_create_for_address(self, **fields):
+        """Return the Location with this address, creating it if it's new.
+
+        Locations are shared by every profile, bank, campaign and request
+        at the same address. Coordinates passed for an address that has
+        none yet, or only approximate ones, are kept.
+        """
+        location = self.model(**fields)
+        location.address_hash = address_hash(location)
+        existing = self.filter(address_hash=location.address_hash).first()
+        if existing is None:
+            try:
+                with transaction.atomic():
+                    location.save()
+                return location
+            except IntegrityError:
+                # Someone else created the same address meanwhile.
+                existing = self.get(address_hash=location.address_hash)
+
+        if location.has_coordinates() and (not existing.has_coordinates() or existing.coordinates_approximate):
+            existing.latitude, existing.longitude = location.latitude, location.longitude
+            existing.coordinates_approximate = False
+            existing.save(update_fields=['latitude', 'longitude'])
+        return existing
+
+    def replace_address(self, location, changes):
+        """The Location to point at once `changes` are applied to `location`.
+
+        Shared rows are never edited in place: the merged address is looked
+        up (or created) instead, so other owners keep their address.
+        """
+        fields = {field: getattr(location, field) for field in ADDRESS_FIELDS} if location else {}
+        return self.get_or_create_for_address(**{**fields, **changes})
+
+
 class Location(models.Model):
     address_line1 = models.CharField(max_length=255)
     police_station = models.CharField(max_length=255)
@@ -21,8 +166,18 @@ class Location(models.Model):
         max_digits=9, decimal_places=6, null=True, blank=True,
         help_text="Longitude coordinate"
     )
+    coordinates_approximate = models.BooleanField(
+        default=False, editable=False,
+        help_text="The coordinates are a gazetteer centroid of the police station or district"
+    )
+    address_hash = models.CharField(
+        max_length=64, unique=True, editable=False,
+        help_text="SHA-256 of the normalized address; one row per address"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = LocationQuerySet.as_manager()
     
     class Meta:
         db_table = 'locations'
@@ -45,37 +200,92 @@ class Location(models.Model):
         ]
         return ", ".join([p for p in parts if p])
 
-    def geocode_address(self, attempt=1, max_attempts=3):
-        geolocator = Nominatim(user_agent="blood_management_system", timeout=10)
+    def geocode_address(self, attempt=1, max_attempts=3, geocoder=None, approximate=None):
+        """Fill in latitude and longitude from the address; returns True on success.
+
+        When the geocoder finds nothing, falls back to the gazetteer
+        centroid (if `approximate`, default GEOCODER_GAZETTEER_FALLBACK).
+        Centroids, from the fallback or an approximate geocoder, set
+        coordinates_approximate.
+        """
+        geocoder = geocoder or get_geocoder()
+        if approximate is None:
+            approximate = settings.GEOCODER_GAZETTEER_FALLBACK
         address_variants = [
             f"{self.address_line1}, {self.police_station}, {self.city}, {self.country}",
             f"{self.police_station}, {self.city}, {self.country}",
             f"{self.city}, {self.country}",
         ]
+        # Number of requests actually sent to the geocoder, so batch callers
+        # only pause for rate limiting when the cache could not answer.
+        self._network_lookups = 0
+        seen = set()
         for full_address in address_variants:
-            try:
-                location = geolocator.geocode(full_address)
-                if location:
-                    self.latitude = location.latitude
-                    self.longitude = location.longitude
-                    print(f"✅ Geocoded using: {full_address}")
+            query = normalize_address(full_address)
+            if not query or query in seen:
+                continue
+            seen.add(query)
+
+            cached = GeocodeCache.lookup(query)
+            if cached is not None:
+                if cached.has_coordinates():
+                    self.latitude, self.longitude = cached.latitude, cached.longitude
+                    self.coordinates_approximate = False
+                    logger.debug(f"✅ Geocoded from cache: {full_address}")
                     return True
+                continue
+
+            try:
+                self._network_lookups += 1
+                coordinates = geocoder.geocode(full_address)
             except Exception as e:
+                # Errors are not cached; the next attempt asks the geocoder again.
                 print(f"⚠️ Geocoding failed for {full_address}: {e}")
                 continue
+            if not geocoder.approximate:
+                # Rough results are not cached, so a precise backend configured
+                # later still gets asked.
+                GeocodeCache.store(query, coordinates)
+            if coordinates:
+                self.latitude, self.longitude = coordinates
+                self.coordinates_approximate = geocoder.approximate
+                print(f"✅ Geocoded using: {full_address}")
+                return True
+
+        if approximate:
+            coordinates = lookup_location(self.police_station, self.city, self.state, self.country)
+            if coordinates:
+                self.latitude, self.longitude = coordinates
+                self.coordinates_approximate = True
+                logger.info(f"✅ Approximated from gazetteer: {self.police_station}, {self.city}")
+                return True
         print(f"❌ Could not geocode any variant for: {self.get_full_address()}")
         return False
 
+    def has_coordinates(self):
+        return self.latitude is not None and self.longitude is not None
+
     def save(self, *args, **kwargs):
-        if not self.latitude or not self.longitude:
+        if not self.has_coordinates() and not settings.GEOCODING_ASYNC:
             try:
                 success = self.geocode_address()
                 if not success:
                     logger.warning(f"⚠️ No coordinates found for: {self.get_full_address()}")
             except Exception as e:
                 logger.error(f"💥 Failed to geocode during save: {e}")
+        self.address_hash = address_hash(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'coordinates_approximate'}
+        if update_fields is not None and set(ADDRESS_FIELDS) & set(update_fields):
+            kwargs['update_fields'] = set(kwargs['update_fields']) | {'address_hash'}
         super().save(*args, **kwargs)
 
+        if not self.has_coordinates() and settings.GEOCODING_ASYNC:
+            # Geocode in the background once the row is visible to the worker.
+            location_id = self.pk
+            transaction.on_commit(lambda: geocoding_queue.enqueue(location_id))
+
     @classmethod
     def geocode_all_missing(cls, delay_seconds=1):
         locations = cls.objects.filter(latitude__isnull=True, longitude__isnull=True)
@@ -89,6 +299,7 @@ class Location(models.Model):
                 logger.info(f"[{i}/{total}] ✅ Geocoded {loc.get_full_address()}")
             else:
                 logger.warning(f"[{i}/{total}] ⚠️ Skipped {loc.get_full_address()}")
-            time.sleep(delay_seconds)
+            if loc._network_lookups:
+                time.sleep(delay_seconds)
 
         logger.info("✅ Batch geocoding complete.")
\ No newline at end of file
@@ -1,7 +1,40 @@
+from django.db import transaction
 from rest_framework import serializers
+from locations.addresses import address_hash, location_relations
 from locations.models import Location
 
 class LocationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Location
         fields = '__all__'
+
+    def create(self, validated_data):
+        # One row per address: reuse the existing location if there is one.
+        return Location.objects.get_or_create_for_address(**validated_data)
+
+    def update(self, instance, validated_data):
+        # Edits the shared row, i.e. the address of every owner. Profiles,
+        # banks and requests change their own address through
+        # Location.objects.replace_address() instead.
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        if {'latitude', 'longitude'} & set(validated_data):
+            instance.coordinates_approximate = False
+        existing = Location.objects.filter(address_hash=address_hash(instance)).exclude(pk=instance.pk).first()
+        if existing is None:
+            instance.save()
+            return instance
+
+        # The new address already has a row: move every owner there.
+        with transaction.atomic():
+            for model, field_name in location_relations(Location):
+                model._default_manager.filter(**{field_name: instance}).update(**{field_name: existing})
+            if instance.has_coordinates() and (
+                not existing.has_coordinates()
+                or existing.coordinates_approximate and not instance.coordinates_approximate
+            ):
+                existing.latitude, existing.longitude = instance.latitude, instance.longitude
+                existing.coordinates_approximate = instance.coordinates_approximate
+                existing.save(update_fields=['latitude', 'longitude'])
+            instance.delete()
+        return existing
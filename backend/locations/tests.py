@@ -1,3 +1,153 @@
-from django.test import TestCase
+import io
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import ReceiverProfile, User
+from locations.gazetteer import lookup_location
+from locations.geocoders import BaseGeocoder, GazetteerGeocoder, NullGeocoder
+from locations.models import GeocodeCache, Location
+
+
+def make_location(address_line1, **fields):
+    return Location.objects.get_or_create_for_address(
+        address_line1=address_line1, police_station='Dhanmondi', city='Dhaka',
+        state='Dhaka', postal_code='1205', **fields,
+    )
+
+
+class LocationDetailUpdateTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password=None, role='ADMIN')
+        self.receiver = User.objects.create_user(username='receiver', email='receiver@example.com', password=None, role='RECEIVER')
+        self.location = make_location('12 Road 5')
+        self.other = make_location('7 Lake Road', latitude=23.74, longitude=90.37)
+        self.profile = ReceiverProfile.objects.create(user=self.receiver, age=30, location=self.location)
+        self.client = APIClient()
+
+    def patch(self, user, location, data):
+        self.client.force_authenticate(user)
+        return self.client.patch(f'/api/locations/{location.pk}/', data, format='json')
+
+    def test_only_admins_edit_shared_locations(self):
+        response = self.patch(self.receiver, self.location, {'address_line1': 'Elsewhere'})
+        self.assertEqual(response.status_code, 403)
+        self.location.refresh_from_db()
+        self.assertEqual(self.location.address_line1, '12 Road 5')
+
+        self.client.force_authenticate(self.receiver)
+        self.assertEqual(self.client.delete(f'/api/locations/{self.location.pk}/').status_code, 403)
+
+    def test_admin_edits_in_place(self):
+        response = self.patch(self.admin, self.location, {'address_line1': '14 Road 5'})
+        self.assertEqual(response.status_code, 200)
+        self.location.refresh_from_db()
+        self.assertEqual(self.location.address_line1, '14 Road 5')
+
+    def test_moving_onto_an_existing_address_merges_the_rows(self):
+        response = self.patch(self.admin, self.location, {'address_line1': ' 7  lake road'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], self.other.pk)
+        self.assertFalse(Location.objects.filter(pk=self.location.pk).exists())
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.location_id, self.other.pk)
+
+
+class FixedGeocoder(BaseGeocoder):
+    def __init__(self, coordinates):
+        self.coordinates = coordinates
+
+    def geocode(self, query):
+        return self.coordinates
+
+
+class InlineExecutor:
+    def __init__(self, max_workers):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def map(self, fn, items):
+        return map(fn, items)
+
+
+class GazetteerLookupTests(TestCase):
+    def test_police_station_within_its_district(self):
+        self.assertEqual(lookup_location('Kotwali', 'Sylhet'), (24.8950, 91.8700))
+        self.assertEqual(lookup_location('Kotwali', 'Chittagong City'), (22.3350, 91.8350))
+
+    def test_unique_police_station_alone(self):
+        self.assertEqual(lookup_location('Dhanmandi Thana', ''), (23.7465, 90.3760))
+
+    def test_repeated_police_station_falls_back_to_the_district(self):
+        self.assertEqual(lookup_location('Kotwali', 'Bogra'), (24.8465, 89.3773))
+
+    def test_unknown_or_foreign_places(self):
+        self.assertIsNone(lookup_location('Nowhere', 'Atlantis'))
+        self.assertIsNone(lookup_location('Dhanmondi', 'Dhaka', country='India'))
+
+
+@override_settings(GEOCODER_GAZETTEER_FALLBACK=True)
+class ApproximateCoordinatesTests(TestCase):
+    def location(self, **fields):
+        return Location(
+            address_line1='House 3', police_station='Dhanmondi', city='Dhaka', state='Dhaka',
+            postal_code='1205', **fields,
+        )
+
+    def test_gazetteer_fallback_is_flagged(self):
+        location = self.location()
+        self.assertTrue(location.geocode_address(geocoder=NullGeocoder()))
+        self.assertEqual((location.latitude, location.longitude), (23.7465, 90.3760))
+        self.assertTrue(location.coordinates_approximate)
+
+    def test_approximate_geocoder_is_flagged_and_not_cached(self):
+        location = self.location()
+        self.assertTrue(location.geocode_address(geocoder=GazetteerGeocoder(), approximate=False))
+        self.assertTrue(location.coordinates_approximate)
+        self.assertFalse(GeocodeCache.objects.exists())
+
+    def test_precise_coordinates_replace_approximate_ones(self):
+        location = self.location(latitude=Decimal('23.7465'), longitude=Decimal('90.3760'), coordinates_approximate=True)
+        location.save()
+        same = Location.objects.get_or_create_for_address(
+            address_line1='House 3', police_station='Dhanmondi', city='Dhaka', state='Dhaka',
+            postal_code='1205', latitude=Decimal('23.745100'), longitude=Decimal('90.374200'),
+        )
+        self.assertEqual(same.pk, location.pk)
+        location.refresh_from_db()
+        self.assertEqual(location.latitude, Decimal('23.745100'))
+        self.assertFalse(location.coordinates_approximate)
+
+    def geocode_command(self, geocoder):
+        checkpoint = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'checkpoint.json'
+        command = 'locations.management.commands.geocode_locations'
+        # Worker threads would use their own connections, outside the test transaction.
+        with mock.patch(f'{command}.get_geocoder', return_value=geocoder), \
+                mock.patch(f'{command}.ThreadPoolExecutor', InlineExecutor), \
+                mock.patch(f'{command}.close_old_connections'):
+            call_command('geocode_locations', rate=0, checkpoint=str(checkpoint), stdout=io.StringIO())
+
+    def test_command_retries_approximate_locations(self):
+        location = self.location(latitude=Decimal('23.7465'), longitude=Decimal('90.3760'), coordinates_approximate=True)
+        location.save()
+
+        self.geocode_command(NullGeocoder())
+        location.refresh_from_db()
+        self.assertEqual(location.latitude, Decimal('23.746500'))
+        self.assertTrue(location.coordinates_approximate)
+
+        GeocodeCache.objects.all().delete()  # let the misses expire
+        self.geocode_command(FixedGeocoder((23.7451, 90.3742)))
+        location.refresh_from_db()
+        self.assertEqual(location.latitude, Decimal('23.745100'))
+        self.assertFalse(location.coordinates_approximate)
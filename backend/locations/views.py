@@ -1,4 +1,6 @@
 from rest_framework import generics, permissions
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from locations.addresses import location_relations
 from locations.models import Location
 from locations.serializers import LocationSerializer
 
@@ -11,4 +13,24 @@ class LocationListCreateView(generics.ListCreateAPIView):
 class LocationDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Location.objects.all()
     serializer_class = LocationSerializer
-    permission_classes = [permissions.IsAuthenticated]
\ No newline at end of file
+    permission_classes = [permissions.IsAuthenticated]
+
+    def check_can_edit(self):
+        # A location is shared by everyone at the address, so only admins may
+        # change it in place; owners update their own address instead.
+        user = self.request.user
+        if not (user.is_superuser or user.role == 'ADMIN'):
+            raise PermissionDenied("Only admins can edit a shared location.")
+
+    def perform_update(self, serializer):
+        self.check_can_edit()
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        self.check_can_edit()
+        # Locations are shared by address; deleting one still in use would
+        # clear or cascade into every owner.
+        for model, field_name in location_relations(Location):
+            if model._default_manager.filter(**{field_name: instance}).exists():
+                raise ValidationError("This location is still in use.")
+        instance.delete()
\ No newline at end of file
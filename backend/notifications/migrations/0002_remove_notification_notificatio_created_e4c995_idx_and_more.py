@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bloodrequests', '0003_bloodrequest_blood_reque_created_4dd250_idx_and_more'),
+        ('donors', '0004_donationrecord_donation_re_donatio_51aeb7_idx_and_more'),
+        ('notifications', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notificatio_created_e4c995_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['created_at', 'id'], name='notificatio_created_c6e228_idx'),
+        ),
+    ]
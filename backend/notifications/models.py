@@ -1,6 +1,12 @@
 from django.db import models
 from accounts.models import User
 
+class NotificationQuerySet(models.QuerySet):
+    def with_details(self):
+        """Load the recipient NotificationSerializer renders in the same query."""
+        return self.select_related('recipient__created_by')
+
+
 class Notification(models.Model):
     NOTIFICATION_TYPE_CHOICES = (
         ('DONATION_APPROVED', 'Donation Approved'),
@@ -24,13 +30,15 @@ class Notification(models.Model):
     email_sent = models.BooleanField(default=False)
     email_sent_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    
+
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         db_table = 'notifications'
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['recipient', 'is_read']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['created_at', 'id']),
         ]
     
     def __str__(self):
@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from notifications.models import Notification
-from accounts.serializers import UserSerializer
+from accounts.serializers import UserLocationListSerializer, UserSerializer
+
+
+class NotificationListSerializer(UserLocationListSerializer):
+    user_paths = (('recipient',),)
 
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -9,6 +13,7 @@ class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = '__all__'
+        list_serializer_class = NotificationListSerializer
 
     def create(self, validated_data):
         user_data = validated_data.pop('recipient')
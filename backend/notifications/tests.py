@@ -1,3 +1,36 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+from notifications.models import Notification
+
+
+class NotificationListQueryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password=None, role='ADMIN')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def add_notifications(self, count):
+        start = User.objects.count()
+        for i in range(start, start + count):
+            recipient = User.objects.create_user(
+                username=f'donor{i}', email=f'donor{i}@example.com', password=None, role='DONOR', created_by=self.admin,
+            )
+            Notification.objects.create(recipient=recipient, notification_type='GENERAL', title='Hello', message='Hi')
+
+    def list_notifications(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/notifications/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results'], len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.add_notifications(2)
+        _, few = self.list_notifications()
+        self.add_notifications(6)
+        notifications, many = self.list_notifications()
+        self.assertEqual(many, few)
+        self.assertEqual(len(notifications), 8)
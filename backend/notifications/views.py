@@ -1,11 +1,13 @@
 from rest_framework import generics
 from notifications.models import Notification
 from notifications.serializers import NotificationSerializer
+from common.pagination import PageNumberOrCursorPagination
 
 
 class NotificationListCreateView(generics.ListCreateAPIView):
-    queryset = Notification.objects.all()
+    queryset = Notification.objects.with_details()
     serializer_class = NotificationSerializer
+    pagination_class = PageNumberOrCursorPagination
 
 class NotificationDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Notification.objects.all()